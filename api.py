@@ -2,17 +2,24 @@
 FastAPI application for events and deals
 Provides REST endpoints to access scraped data
 """
-from fastapi import FastAPI, Depends, HTTPException, Query, BackgroundTasks
+from fastapi import FastAPI, Depends, HTTPException, Query, BackgroundTasks, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from pydantic import BaseModel
-from datetime import datetime
-import json
+from datetime import date as date_type, datetime
+from sqlalchemy import and_, or_
+import os
 
 from database import get_db, Event, Deal, init_db
-from scraper_manager import ScraperManager
+from scraper_manager import ScraperManager, cancel_all_scrapes
+from scraper_base import browser_tracker
 from scheduler import start_scheduler, stop_scheduler, get_scheduler_status
+from search import apply_search, finish_snippet
+from pagination import InvalidCursor, after_cursor, encode_cursor, order_by_keyset
+from response_cache import ResponseCache, etag_matches, to_json
+from static_file import accepted_encodings, serve_file
+import stats
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -28,6 +35,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
 # Pydantic models for API responses
@@ -36,6 +44,8 @@ class EventResponse(BaseModel):
     title: str
     description: Optional[str]
     date: Optional[str]
+    start_date: Optional[date_type] = None
+    end_date: Optional[date_type] = None
     location: Optional[str]
     category: Optional[str]
     price: Optional[str]
@@ -44,6 +54,9 @@ class EventResponse(BaseModel):
     images: Optional[List[str]]
     contact: Optional[str]
     created_at: datetime
+    # Only set for search results
+    rank: Optional[float] = None
+    snippet: Optional[str] = None
     
     class Config:
         from_attributes = True
@@ -61,10 +74,117 @@ class DealResponse(BaseModel):
     category: Optional[str]
     valid_until: Optional[str]
     created_at: datetime
+    # Only set for search results
+    rank: Optional[float] = None
+    snippet: Optional[str] = None
     
     class Config:
         from_attributes = True
 
+# Fields computed by search rather than selected (rank, snippet)
+SEARCH_FIELDS = ('rank', 'snippet')
+# Always selected for keyset pagination, even when not requested
+EVENT_KEY_FIELDS = ('id', 'created_at', 'start_date')
+DEAL_KEY_FIELDS = ('id', 'created_at')
+
+FIELDS_DESCRIPTION = ("Comma-separated response fields to return (default: all), e.g. id,title,date,images. "
+                      "Objects then contain only those keys, so fields the schema marks required "
+                      "(title, source, created_at, ...) are absent unless requested")
+# The response schema describes full objects; fields= responses are a subset of it
+SPARSE_RESPONSES = {200: {"description": "Matching items; with fields= each object has only the requested keys"}}
+
+response_cache = ResponseCache()
+
+def parse_fields(fields, response_model):
+    """?fields= -> field names in response model order; 400 for unknown names"""
+    requested = {name.strip() for name in (fields or "").split(",") if name.strip()}
+    if not requested:
+        return tuple(response_model.model_fields)
+    
+    unknown = requested - set(response_model.model_fields)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    return tuple(name for name in response_model.model_fields if name in requested)
+
+def select_columns(model, names, key_fields=()):
+    """Columns to select for the requested fields plus the pagination keys"""
+    selected = [name for name in names if name not in SEARCH_FIELDS]
+    selected += [name for name in key_fields if name not in selected]
+    return [getattr(model, name) for name in selected]
+
+def row_dict(row, names, term=None):
+    """Selected row -> response dict with just the requested fields"""
+    item = row._mapping
+    result = {}
+    for name in names:
+        if name in SEARCH_FIELDS and not term:
+            result[name] = None
+        elif name == "snippet":
+            result[name] = finish_snippet(item["snippet"], term)
+        else:
+            result[name] = item[name]
+    return result
+
+def rows_json(rows, names, term=None):
+    """
+    Column rows straight to JSON bytes; the selected columns mirror the
+    response model, so no per-row Pydantic validation is needed
+    """
+    return to_json([row_dict(row, names, term) for row in rows])
+
+def cached_response(request: Request, db: Session, key, build):
+    """
+    Serve a GET from the response cache, with an ETag and 304 support
+    
+    build(headers) runs on a miss and returns the JSON body as bytes; it may
+    add response headers, which are cached along with the body.
+    """
+    generation = stats.current_generation(db)
+    entry = response_cache.get(key, generation)
+    if entry is None:
+        headers = {}
+        entry = response_cache.put(key, generation, build(headers), headers)
+    
+    # Large bodies are gzipped once when cached; each encoding gets its own ETag
+    body, etag = entry.body, entry.etag
+    headers = {"Cache-Control": "no-cache", "Vary": "Accept-Encoding", **entry.headers}
+    if entry.gzipped is not None and "gzip" in accepted_encodings(request.headers.get("accept-encoding")):
+        body, etag = entry.gzipped, entry.etag[:-1] + '-gzip"'
+        headers["Content-Encoding"] = "gzip"
+    headers["ETag"] = etag
+    
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        headers.pop("Content-Encoding", None)
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+def paginate(query, model, sort, cursor, skip, limit, headers):
+    """
+    Apply keyset pagination (or skip/limit for relevance order) and set
+    X-Next-Cursor when there may be more rows
+    
+    skip counts from the start of the results, so it can't be combined with
+    a cursor (which already says where the page starts)
+    """
+    if cursor and skip:
+        raise HTTPException(status_code=400, detail="skip can't be combined with cursor")
+    if sort is None:
+        if cursor:
+            raise HTTPException(status_code=400, detail="cursor is not supported when sorting by relevance")
+        return query.offset(skip).limit(limit).all()
+    
+    query = order_by_keyset(query, model, sort)
+    if cursor:
+        try:
+            query = after_cursor(query, model, sort, cursor)
+        except InvalidCursor as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    
+    rows = query.offset(skip).limit(limit).all()
+    if len(rows) == limit:
+        headers["X-Next-Cursor"] = encode_cursor(sort, rows[-1])
+    return rows
+
 class ScraperStatus(BaseModel):
     status: str
     message: str
@@ -96,6 +216,11 @@ async def startup_event():
         traceback.print_exc()
         # Don't exit - continue with degraded functionality
     
+    try:
+        browser_tracker.reap_orphans()
+    except Exception as e:
+        print(f"⚠ Browser reaping warning: {e}")
+    
     try:
         start_scheduler()
         print("✓ Background scheduler started")
@@ -113,6 +238,13 @@ async def startup_event():
 async def shutdown_event():
     stop_scheduler()
     print("✓ Scheduler stopped")
+    
+    cancelled = cancel_all_scrapes('shutdown')
+    if cancelled:
+        print(f"✓ Cancelled {cancelled} running scrape(s)")
+    
+    # Unblock scrapers stuck in a page load and leave no browsers behind
+    browser_tracker.kill_all()
 
 # Root endpoint
 @app.get("/")
@@ -125,6 +257,7 @@ async def root():
             "deals": "/deals",
             "combined_events": "/combined-events",
             "scrape": "/scrape",
+            "cancel_scrape": "/scrape/cancel",
             "stats": "/stats",
             "scheduler": "/scheduler/status"
         }
@@ -137,105 +270,146 @@ async def ping():
     return {"status": "ok"}
 
 # Events endpoints
-@app.get("/events", response_model=List[EventResponse])
+@app.get("/events", response_model=List[EventResponse], responses=SPARSE_RESPONSES)
 async def get_events(
+    request: Request,
+    cursor: Optional[str] = Query(None, description="next_cursor token: the X-Next-Cursor header of the "
+                                                     "previous page (not combinable with skip)"),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=200),
     source: Optional[str] = None,
     category: Optional[str] = None,
     search: Optional[str] = None,
+    date_from: Optional[date_type] = Query(None, description="Events still running on or after this day"),
+    date_to: Optional[date_type] = Query(None, description="Events starting on or before this day"),
+    sort: Optional[str] = Query(None, pattern="^(newest|start_date|-start_date|relevance)$",
+                                description="newest (scrape time), start_date (soonest first), -start_date "
+                                            "or relevance (default when searching); undated events "
+                                            "come last in both start_date orders"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     db: Session = Depends(get_db)
 ):
-    """Get all events with optional filtering"""
-    query = db.query(Event)
-    
-    if source:
-        query = query.filter(Event.source == source)
+    """
+    Get all events with optional filtering
     
-    if category:
-        query = query.filter(Event.category == category)
+    Paging: when more rows may follow, the response carries the next_cursor
+    token in its X-Next-Cursor header; pass it back as ?cursor= for the next
+    page. skip still works (not together with cursor) but gets slower on deep pages.
+    """
+    names = parse_fields(fields, EventResponse)
     
-    if search:
-        query = query.filter(
-            Event.title.contains(search) | 
-            Event.description.contains(search)
-        )
+    def build(headers):
+        query = db.query(*select_columns(Event, names, EVENT_KEY_FIELDS))
+        
+        if source:
+            query = query.filter(Event.source == source)
+        
+        if category:
+            query = query.filter(Event.category == category)
+        
+        rank = None
+        if search:
+            query, rank = apply_search(query, Event, search, snippet="snippet" in names)
+        
+        # Overlap with [date_from, date_to]; each branch is a range scan on one date index
+        if date_from:
+            query = query.filter(or_(
+                Event.end_date >= date_from,
+                and_(Event.end_date.is_(None), Event.start_date >= date_from)
+            ))
+        
+        if date_to:
+            query = query.filter(Event.start_date <= date_to)
+        
+        # Keyset order, or None for relevance (offset paging); start_date orders put undated events last
+        order = sort
+        if rank is not None and sort in (None, "relevance"):
+            query = query.order_by(rank.desc(), Event.id.desc())
+            order = None
+        elif sort not in ("start_date", "-start_date"):
+            order = "newest"
+        
+        return rows_json(paginate(query, Event, order, cursor, skip, limit, headers), names, search)
     
-    events = query.order_by(Event.created_at.desc()).offset(skip).limit(limit).all()
-    return events
+    key = ("events", cursor, skip, limit, source, category, search, date_from, date_to, sort, names)
+    return cached_response(request, db, key, build)
 
 @app.get("/events/{event_id}", response_model=EventResponse)
-async def get_event(event_id: int, db: Session = Depends(get_db)):
+async def get_event(event_id: int, request: Request, db: Session = Depends(get_db)):
     """Get a specific event by ID"""
-    event = db.query(Event).filter(Event.id == event_id).first()
-    if not event:
-        raise HTTPException(status_code=404, detail="Event not found")
-    return event
+    def build(headers):
+        names = tuple(EventResponse.model_fields)
+        event = db.query(*select_columns(Event, names)).filter(Event.id == event_id).first()
+        if not event:
+            raise HTTPException(status_code=404, detail="Event not found")
+        return to_json(row_dict(event, names))
+    
+    return cached_response(request, db, ("event", event_id), build)
 
 # Deals endpoints
-@app.get("/deals", response_model=List[DealResponse])
+@app.get("/deals", response_model=List[DealResponse], responses=SPARSE_RESPONSES)
 async def get_deals(
+    request: Request,
+    cursor: Optional[str] = Query(None, description="next_cursor token: the X-Next-Cursor header of the "
+                                                     "previous page (not combinable with skip)"),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=200),
     source: Optional[str] = None,
     category: Optional[str] = None,
     search: Optional[str] = None,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     db: Session = Depends(get_db)
 ):
-    """Get all deals with optional filtering"""
-    query = db.query(Deal)
-    
-    if source:
-        query = query.filter(Deal.source == source)
+    """
+    Get all deals with optional filtering
     
-    if category:
-        query = query.filter(Deal.category == category)
+    Paging: when more rows may follow, the response carries the next_cursor
+    token in its X-Next-Cursor header; pass it back as ?cursor= for the next
+    page (not while searching, and not together with skip).
+    """
+    names = parse_fields(fields, DealResponse)
     
-    if search:
-        query = query.filter(
-            Deal.title.contains(search) | 
-            Deal.description.contains(search)
-        )
+    def build(headers):
+        query = db.query(*select_columns(Deal, names, DEAL_KEY_FIELDS))
+        
+        if source:
+            query = query.filter(Deal.source == source)
+        
+        if category:
+            query = query.filter(Deal.category == category)
+        
+        rank = None
+        if search:
+            query, rank = apply_search(query, Deal, search, snippet="snippet" in names)
+        
+        order = "newest"
+        if rank is not None:
+            query = query.order_by(rank.desc(), Deal.id.desc())
+            order = None
+        
+        return rows_json(paginate(query, Deal, order, cursor, skip, limit, headers), names, search)
     
-    deals = query.order_by(Deal.created_at.desc()).offset(skip).limit(limit).all()
-    return deals
+    key = ("deals", cursor, skip, limit, source, category, search, names)
+    return cached_response(request, db, key, build)
 
 @app.get("/deals/{deal_id}", response_model=DealResponse)
-async def get_deal(deal_id: int, db: Session = Depends(get_db)):
+async def get_deal(deal_id: int, request: Request, db: Session = Depends(get_db)):
     """Get a specific deal by ID"""
-    deal = db.query(Deal).filter(Deal.id == deal_id).first()
-    if not deal:
-        raise HTTPException(status_code=404, detail="Deal not found")
-    return deal
+    def build(headers):
+        names = tuple(DealResponse.model_fields)
+        deal = db.query(*select_columns(Deal, names)).filter(Deal.id == deal_id).first()
+        if not deal:
+            raise HTTPException(status_code=404, detail="Deal not found")
+        return to_json(row_dict(deal, names))
+    
+    return cached_response(request, db, ("deal", deal_id), build)
 
 # Statistics endpoint
 @app.get("/stats")
-async def get_stats(db: Session = Depends(get_db)):
-    """Get statistics about events and deals"""
-    total_events = db.query(Event).count()
-    total_deals = db.query(Deal).count()
-    
-    # Events by source
-    events_by_source = {}
-    sources = db.query(Event.source).distinct().all()
-    for (source,) in sources:
-        count = db.query(Event).filter(Event.source == source).count()
-        events_by_source[source] = count
-    
-    # Events by category
-    events_by_category = {}
-    categories = db.query(Event.category).distinct().all()
-    for (category,) in categories:
-        if category:
-            count = db.query(Event).filter(Event.category == category).count()
-            events_by_category[category] = count
-    
-    return {
-        "total_events": total_events,
-        "total_deals": total_deals,
-        "events_by_source": events_by_source,
-        "events_by_category": events_by_category
-    }
+async def get_stats(request: Request, db: Session = Depends(get_db)):
+    """Get statistics about events and deals (precomputed after each scrape run)"""
+    return cached_response(request, db, ("stats",),
+                           lambda headers: to_json(stats.get_stats(db)))
 
 # Scraper endpoints
 @app.post("/scrape", response_model=ScraperStatus)
@@ -249,7 +423,7 @@ async def run_scrapers(
     Trigger scrapers to run (runs in background)
     """
     def scrape_task():
-        manager = ScraperManager(db)
+        manager = ScraperManager(db, render_lane='interactive')
         results = manager.run_all_scrapers(headless=headless, max_events_per_source=max_events)
         print(f"Background scraping completed: {results}")
     
@@ -271,7 +445,7 @@ async def run_scrapers_sync(
     Warning: This may take several minutes
     """
     try:
-        manager = ScraperManager(db)
+        manager = ScraperManager(db, render_lane='interactive')
         results = manager.run_all_scrapers(headless=headless, max_events_per_source=max_events)
         
         return ScraperStatus(
@@ -282,6 +456,18 @@ async def run_scrapers_sync(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Scraping failed: {str(e)}")
 
+@app.post("/scrape/cancel", response_model=ScraperStatus)
+async def cancel_scrapers():
+    """
+    Cancel running scrapes (they stop after the current page)
+    """
+    cancelled = cancel_all_scrapes('cancelled via API')
+    
+    return ScraperStatus(
+        status="cancelled" if cancelled else "idle",
+        message=f"Cancelled {cancelled} running scrape(s)"
+    )
+
 # Scheduler status endpoint
 @app.get("/scheduler/status")
 async def scheduler_status():
@@ -290,20 +476,19 @@ async def scheduler_status():
 
 # Combined JSON endpoint
 @app.get("/combined-events")
-async def get_combined_events():
-    """Get the latest combined events JSON file"""
-    import os
+async def get_combined_events(request: Request):
+    """
+    Get the latest combined events JSON file
+    Streamed as written (gzip/brotli copies when accepted), with ETag, Last-Modified and Range support
+    """
     filepath = os.path.join('scraped_data', 'combined_events.json')
     
-    if not os.path.exists(filepath):
-        raise HTTPException(status_code=404, detail="Combined events file not found. Run scrapers first.")
-    
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            events = json.load(f)
-        return events
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error reading combined events: {str(e)}")
+        return serve_file(request, filepath, media_type="application/json")
+    except HTTPException as e:
+        if e.status_code == 404:
+            raise HTTPException(status_code=404, detail="Combined events file not found. Run scrapers first.")
+        raise
 
 # Health check
 @app.get("/health")
@@ -323,7 +508,8 @@ async def detailed_health_check():
         return {
             "status": "healthy",
             "timestamp": datetime.utcnow().isoformat(),
-            "scheduler": scheduler_info
+            "scheduler": scheduler_info,
+            "response_cache": response_cache.status()
         }
     except Exception as e:
         return {
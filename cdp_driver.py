@@ -0,0 +1,518 @@
+"""
+Chrome DevTools Protocol driver backend
+Talks to Chrome directly over a websocket instead of going through
+chromedriver's HTTP wire protocol, while exposing the subset of the
+Selenium WebDriver API the scrapers use (get, find_element(s), element
+.text / get_attribute / click, execute_script, title, page_source ...)
+"""
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+import urllib.request
+from abc import ABC, abstractmethod
+from collections import defaultdict
+
+from selenium.common.exceptions import (
+    JavascriptException,
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+    WebDriverException,
+)
+from selenium.webdriver.common.by import By
+
+try:
+    import websocket
+    WEBSOCKET_AVAILABLE = True
+except ImportError:
+    WEBSOCKET_AVAILABLE = False
+
+# Page-side helpers: elements returned to Python become {__ref, doc} handles
+# into window.__sr; handles from an older document are reported as stale.
+SCRIPT_WRAPPER = """(() => {
+  const w = window;
+  if (!w.__srDoc) { w.__srDoc = Math.random().toString(36).slice(2); w.__sr = []; }
+  const wrap = (v) => {
+    if (v instanceof Element) { w.__sr.push(v); return {__ref: w.__sr.length - 1, doc: w.__srDoc}; }
+    if (Array.isArray(v) || v instanceof NodeList || v instanceof HTMLCollection) return Array.from(v, wrap);
+    if (v && typeof v === 'object' && v.constructor === Object) {
+      const out = {};
+      for (const k of Object.keys(v)) out[k] = wrap(v[k]);
+      return out;
+    }
+    return v === undefined ? null : v;
+  };
+  const unwrap = (v) => {
+    if (v && typeof v === 'object' && '__ref' in v) {
+      if (v.doc !== w.__srDoc) throw new Error('stale element reference');
+      return w.__sr[v.__ref];
+    }
+    return Array.isArray(v) ? v.map(unwrap) : v;
+  };
+  const args = %s.map(unwrap);
+  return Promise.resolve((function() { %s }).apply(null, args)).then(wrap);
+})()"""
+
+FIND_SCRIPT = """
+const [by, value, root] = arguments;
+const scope = root || document;
+if (by === 'xpath') {
+  const doc = scope.ownerDocument || scope;
+  const snap = doc.evaluate(value, scope, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+  const out = [];
+  for (let i = 0; i < snap.snapshotLength; i++) {
+    const node = snap.snapshotItem(i);
+    if (node instanceof Element) out.push(node);
+  }
+  return out;
+}
+return Array.from(scope.querySelectorAll(value));
+"""
+
+ELEMENT_TEXT_SCRIPT = """
+const el = arguments[0];
+if (!el.getClientRects().length) return '';
+return (el.innerText || '').trim();
+"""
+
+ELEMENT_ATTRIBUTE_SCRIPT = """
+const [el, name] = arguments;
+const prop = el[name];
+if (name in el && prop !== null && typeof prop !== 'object' && typeof prop !== 'function') {
+  return typeof prop === 'boolean' ? (prop ? 'true' : null) : String(prop);
+}
+return el.getAttribute(name);
+"""
+
+ELEMENT_DISPLAYED_SCRIPT = """
+const el = arguments[0];
+if (!el.getClientRects().length) return false;
+const style = getComputedStyle(el);
+return style.visibility !== 'hidden' && style.display !== 'none' && style.opacity !== '0';
+"""
+
+ELEMENT_CLICK_SCRIPT = """
+const el = arguments[0];
+el.scrollIntoView({block: 'center'});
+el.click();
+"""
+
+def _to_selector(by, value):
+    """Translate a Selenium locator into a CSS selector or XPath"""
+    if by == By.XPATH:
+        return 'xpath', value
+    if by == By.CSS_SELECTOR:
+        return 'css', value
+    if by == By.TAG_NAME:
+        return 'css', value
+    if by == By.ID:
+        return 'css', f'[id="{value}"]'
+    if by == By.NAME:
+        return 'css', f'[name="{value}"]'
+    if by == By.CLASS_NAME:
+        return 'css', f'.{value}'
+    if by == By.LINK_TEXT:
+        return 'xpath', f'.//a[normalize-space(.)="{value}"]'
+    if by == By.PARTIAL_LINK_TEXT:
+        return 'xpath', f'.//a[contains(., "{value}")]'
+    raise WebDriverException(f"Unsupported locator strategy: {by}")
+
+def evaluate(driver, expression):
+    """
+    Evaluate an expression in the page via Runtime.evaluate
+
+    Works with anything that has execute_cdp_cmd - CDPDriver as well as
+    Selenium's Chrome driver. Promises are awaited and the value is
+    returned as JSON.
+    """
+    result = driver.execute_cdp_cmd('Runtime.evaluate', {
+        'expression': expression,
+        'returnByValue': True,
+        'awaitPromise': True,
+        'userGesture': True,
+    })
+
+    if 'exceptionDetails' in result:
+        details = result['exceptionDetails']
+        description = details.get('exception', {}).get('description') or details.get('text', '')
+        if 'stale element reference' in description:
+            raise StaleElementReferenceException(description)
+        raise JavascriptException(description)
+
+    return result.get('result', {}).get('value')
+
+class ScriptElement:
+    """Element handle backed by a page-side reference"""
+
+    def __init__(self, driver, ref):
+        self._driver = driver
+        self._ref = ref
+
+    @property
+    def text(self):
+        return self._driver.execute_script(ELEMENT_TEXT_SCRIPT, self)
+
+    @property
+    def tag_name(self):
+        return self._driver.execute_script("return arguments[0].tagName.toLowerCase();", self)
+
+    def get_attribute(self, name):
+        return self._driver.execute_script(ELEMENT_ATTRIBUTE_SCRIPT, self, name)
+
+    def is_displayed(self):
+        return bool(self._driver.execute_script(ELEMENT_DISPLAYED_SCRIPT, self))
+
+    def is_enabled(self):
+        return not self._driver.execute_script("return !!arguments[0].disabled;", self)
+
+    def click(self):
+        self._driver.execute_script(ELEMENT_CLICK_SCRIPT, self)
+
+    def find_elements(self, by=By.CSS_SELECTOR, value=None):
+        return self._driver._find(by, value, root=self)
+
+    def find_element(self, by=By.CSS_SELECTOR, value=None):
+        return self._driver._find_one(by, value, root=self)
+
+    def __eq__(self, other):
+        return isinstance(other, ScriptElement) and self._ref == other._ref
+
+    def __hash__(self):
+        return hash((self._ref['__ref'], self._ref['doc']))
+
+class ScriptDriver(ABC):
+    """
+    Selenium-compatible driver surface built on a single primitive:
+    evaluating a JavaScript expression in the page
+
+    Subclasses implement _evaluate(expression) and get(url).
+    """
+
+    @abstractmethod
+    def _evaluate(self, expression):
+        """Evaluate an expression in the page and return its JSON value"""
+
+    @abstractmethod
+    def get(self, url):
+        """Navigate to url"""
+
+    def execute_script(self, script, *args):
+        """Run a Selenium-style script body (uses `arguments`, may `return`)"""
+        expression = SCRIPT_WRAPPER % (json.dumps([self._encode(a) for a in args]), script)
+        return self._decode(self._evaluate(expression))
+
+    def _encode(self, value):
+        if isinstance(value, ScriptElement):
+            return value._ref
+        if isinstance(value, (list, tuple)):
+            return [self._encode(v) for v in value]
+        return value
+
+    def _decode(self, value):
+        if isinstance(value, dict):
+            if '__ref' in value:
+                return ScriptElement(self, value)
+            return {k: self._decode(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [self._decode(v) for v in value]
+        return value
+
+    def _find(self, by, value, root=None):
+        kind, selector = _to_selector(by, value)
+        return self.execute_script(FIND_SCRIPT, kind, selector, root) or []
+
+    def _find_one(self, by, value, root=None):
+        elements = self._find(by, value, root=root)
+        if not elements:
+            raise NoSuchElementException(f"No element found for {by}={value}")
+        return elements[0]
+
+    def find_elements(self, by=By.CSS_SELECTOR, value=None):
+        return self._find(by, value)
+
+    def find_element(self, by=By.CSS_SELECTOR, value=None):
+        return self._find_one(by, value)
+
+    @property
+    def title(self):
+        return self.execute_script("return document.title;") or ''
+
+    @property
+    def page_source(self):
+        return self.execute_script("return document.documentElement.outerHTML;") or ''
+
+    @property
+    def current_url(self):
+        return self.execute_script("return location.href;")
+
+    def maximize_window(self):
+        # Window size comes from --window-size
+        pass
+
+class CDPDriver(ScriptDriver):
+    """
+    Chrome controlled directly over the DevTools Protocol websocket
+
+    Page loads complete on the navigation's own DOMContentLoaded / load
+    lifecycle events instead of polling, and wait_for_network_idle() watches the
+    Network domain for in-flight requests.
+    """
+
+    def __init__(self, arguments, binary=None, page_load_strategy='normal',
+                 page_load_timeout=30, startup_timeout=20):
+        if not WEBSOCKET_AVAILABLE:
+            raise WebDriverException("websocket-client is required for the CDP backend")
+
+        self.page_load_strategy = page_load_strategy
+        self.page_load_timeout = page_load_timeout
+        self._next_id = 0
+        self._pending = {}
+        self._responses = {}
+        self._listeners = defaultdict(list)
+        self._send_lock = threading.Lock()
+        self._state_lock = threading.Lock()
+        self._inflight = set()
+        self._last_network_activity = time.monotonic()
+        # loaderId -> lifecycle event names seen for that navigation
+        self._lifecycle = {}
+        self._lifecycle_cond = threading.Condition()
+        self._closed = False
+        self._temp_profile = None
+
+        self.process = self._launch(arguments, binary, startup_timeout)
+        self.browser_pid = self.process.pid
+
+        try:
+            self._ws = websocket.create_connection(self._page_ws_url, timeout=None,
+                                                   enable_multithread=True, suppress_origin=True)
+        except Exception:
+            self.quit()
+            raise
+
+        self._reader = threading.Thread(target=self._read_loop, daemon=True)
+        self._reader.start()
+
+        self.on('Page.lifecycleEvent', self._on_lifecycle)
+        self.on('Network.requestWillBeSent', self._on_request)
+        self.on('Network.loadingFinished', self._on_request_done)
+        self.on('Network.loadingFailed', self._on_request_done)
+        self.execute_cdp_cmd('Page.enable', {})
+        # Unlike Page.loadEventFired these carry the loaderId of their navigation
+        self.execute_cdp_cmd('Page.setLifecycleEventsEnabled', {'enabled': True})
+        self.execute_cdp_cmd('Network.enable', {})
+        self.execute_cdp_cmd('Runtime.enable', {})
+
+    # -- process / connection -------------------------------------------------
+
+    def _launch(self, arguments, binary, startup_timeout):
+        binary = binary or self._find_chrome()
+        args = [a if a.startswith('-') else f'--{a}' for a in arguments]
+
+        user_data_dir = next((a.split('=', 1)[1] for a in args if a.startswith('--user-data-dir=')), None)
+        if not user_data_dir:
+            self._temp_profile = tempfile.mkdtemp(prefix='cdp-profile-')
+            user_data_dir = self._temp_profile
+            args.append(f'--user-data-dir={user_data_dir}')
+
+        port_file = os.path.join(user_data_dir, 'DevToolsActivePort')
+        if os.path.exists(port_file):
+            os.remove(port_file)
+
+        args = [a for a in args if not a.startswith('--remote-debugging-port')]
+        args.append('--remote-debugging-port=0')
+
+        process = None
+        try:
+            process = subprocess.Popen([binary, *args, 'about:blank'],
+                                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+            deadline = time.monotonic() + startup_timeout
+            while time.monotonic() < deadline:
+                if process.poll() is not None:
+                    raise WebDriverException(f"Chrome exited during startup (code {process.returncode})")
+                if os.path.exists(port_file):
+                    with open(port_file) as f:
+                        lines = f.read().split()
+                    if lines:
+                        self._port = int(lines[0])
+                        break
+                time.sleep(0.1)
+            else:
+                raise WebDriverException("Timed out waiting for Chrome's DevTools port")
+
+            self._page_ws_url = self._find_page_target(startup_timeout)
+            return process
+        except BaseException:
+            # __init__ never returns, so quit() will not clean up after us
+            if process is not None and process.poll() is None:
+                process.kill()
+                try:
+                    process.wait(timeout=5)
+                except subprocess.TimeoutExpired:
+                    pass
+            if self._temp_profile:
+                shutil.rmtree(self._temp_profile, ignore_errors=True)
+                self._temp_profile = None
+            raise
+
+    def _find_page_target(self, timeout):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                with urllib.request.urlopen(f'http://127.0.0.1:{self._port}/json/list', timeout=5) as r:
+                    targets = json.load(r)
+                for target in targets:
+                    if target.get('type') == 'page' and target.get('webSocketDebuggerUrl'):
+                        return target['webSocketDebuggerUrl']
+            except OSError:
+                pass
+            time.sleep(0.1)
+        raise WebDriverException("No page target found in Chrome")
+
+    @staticmethod
+    def _find_chrome():
+        for name in ('google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser', 'chrome'):
+            path = shutil.which(name)
+            if path:
+                return path
+        raise WebDriverException("Chrome binary not found (set CHROME_BINARY_PATH)")
+
+    def _read_loop(self):
+        while not self._closed:
+            try:
+                message = json.loads(self._ws.recv())
+            except Exception:
+                break
+
+            if 'id' in message:
+                waiter = self._pending.pop(message['id'], None)
+                if waiter:
+                    self._responses[message['id']] = message
+                    waiter.set()
+            else:
+                for callback in list(self._listeners.get(message.get('method'), [])):
+                    try:
+                        callback(message.get('params', {}))
+                    except Exception:
+                        pass
+
+        # Wake up anybody still waiting on a response
+        for waiter in list(self._pending.values()):
+            waiter.set()
+
+    # -- protocol -------------------------------------------------------------
+
+    def execute_cdp_cmd(self, cmd, cmd_args=None, timeout=None):
+        """Send a CDP command and return its result (Selenium-compatible name)"""
+        if self._closed:
+            raise WebDriverException("Browser connection is closed")
+
+        waiter = threading.Event()
+        with self._send_lock:
+            self._next_id += 1
+            message_id = self._next_id
+            self._pending[message_id] = waiter
+            self._ws.send(json.dumps({'id': message_id, 'method': cmd, 'params': cmd_args or {}}))
+
+        if not waiter.wait(timeout or self.page_load_timeout * 2):
+            self._pending.pop(message_id, None)
+            raise TimeoutException(f"CDP command timed out: {cmd}")
+
+        response = self._responses.pop(message_id, None)
+        if response is None:
+            raise WebDriverException("Browser connection lost")
+        if 'error' in response:
+            raise WebDriverException(f"{cmd}: {response['error'].get('message')}")
+        return response.get('result', {})
+
+    def on(self, event, callback):
+        """Subscribe to a CDP event, e.g. 'Page.loadEventFired'"""
+        self._listeners[event].append(callback)
+
+    def _evaluate(self, expression):
+        return evaluate(self, expression)
+
+    # -- page load events -----------------------------------------------------
+
+    def _on_lifecycle(self, params):
+        with self._lifecycle_cond:
+            self._lifecycle.setdefault(params.get('loaderId'), set()).add(params.get('name'))
+            self._lifecycle_cond.notify_all()
+
+    def _on_request(self, params):
+        with self._state_lock:
+            self._inflight.add(params.get('requestId'))
+            self._last_network_activity = time.monotonic()
+
+    def _on_request_done(self, params):
+        with self._state_lock:
+            self._inflight.discard(params.get('requestId'))
+            self._last_network_activity = time.monotonic()
+
+    def get(self, url):
+        """
+        Navigate and block until the page-load event for the configured
+        strategy; only events from this navigation's loaderId count, so a
+        late load event of the previous page cannot end the wait
+        """
+        with self._state_lock:
+            self._inflight.clear()
+        with self._lifecycle_cond:
+            self._lifecycle.clear()
+
+        result = self.execute_cdp_cmd('Page.navigate', {'url': url})
+        if result.get('errorText'):
+            raise WebDriverException(f"Navigation to {url} failed: {result['errorText']}")
+
+        loader_id = result.get('loaderId')
+        # No loaderId: same-document navigation (e.g. a #fragment), nothing to load
+        if self.page_load_strategy == 'none' or not loader_id:
+            return
+
+        wanted = {'DOMContentLoaded', 'load'} if self.page_load_strategy == 'eager' else {'load'}
+        with self._lifecycle_cond:
+            loaded = self._lifecycle_cond.wait_for(
+                lambda: self._lifecycle.get(loader_id, set()) & wanted, self.page_load_timeout
+            )
+        if not loaded:
+            raise TimeoutException(f"Timed out loading {url}")
+
+    def wait_for_network_idle(self, idle_time=0.5, timeout=10):
+        """Wait until no request has been in flight for idle_time seconds"""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            with self._state_lock:
+                idle = not self._inflight and time.monotonic() - self._last_network_activity >= idle_time
+            if idle:
+                return True
+            time.sleep(0.05)
+        return False
+
+    def quit(self):
+        """Close the browser and clean up the temporary profile"""
+        if not self._closed:
+            try:
+                self.execute_cdp_cmd('Browser.close', {}, timeout=5)
+            except Exception:
+                pass
+            self._closed = True
+
+        try:
+            self._ws.close()
+        except Exception:
+            pass
+
+        process = getattr(self, 'process', None)
+        if process and process.poll() is None:
+            try:
+                process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+        if self._temp_profile:
+            shutil.rmtree(self._temp_profile, ignore_errors=True)
+            self._temp_profile = None
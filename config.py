@@ -6,6 +6,9 @@ load_dotenv()
 # Chrome settings
 CHROME_DRIVER_PATH = os.getenv('CHROME_DRIVER_PATH', 'auto')
 HEADLESS_MODE = os.getenv('HEADLESS_MODE', 'False').lower() == 'true'
+# 'selenium' (chromedriver) or 'cdp' (DevTools Protocol over a websocket, no chromedriver hop)
+DRIVER_BACKEND = os.getenv('DRIVER_BACKEND', 'selenium').lower()
+CHROME_BINARY_PATH = os.getenv('CHROME_BINARY_PATH', '')
 
 # Scraping settings
 TIMEOUT = int(os.getenv('TIMEOUT', 10))
@@ -13,3 +16,67 @@ RETRY_ATTEMPTS = int(os.getenv('RETRY_ATTEMPTS', 3))
 
 # Output settings
 OUTPUT_DIR = 'scraped_data'
+
+# Lean page-load profile: block heavy resources and trackers at the network level
+LEAN_MODE = os.getenv('LEAN_MODE', 'True').lower() == 'true'
+# Extra comma-separated URL patterns to block (Chrome wildcard syntax, e.g. *.mp4)
+LEAN_EXTRA_BLOCKED_URLS = [p.strip() for p in os.getenv('LEAN_EXTRA_BLOCKED_URLS', '').split(',') if p.strip()]
+
+# Persistent Chrome profile and HTTP disk cache (empty = fresh temporary profile per run)
+CHROME_PROFILE_DIR = os.getenv('CHROME_PROFILE_DIR', '')
+CHROME_CACHE_SIZE_MB = int(os.getenv('CHROME_CACHE_SIZE_MB', 200))
+CHROME_CACHE_TTL_HOURS = int(os.getenv('CHROME_CACHE_TTL_HOURS', 72))
+
+# Driver recycling: replace Chrome after this many pages or this much RSS (0 = disabled)
+DRIVER_MAX_PAGES = int(os.getenv('DRIVER_MAX_PAGES', 250))
+DRIVER_MAX_MEMORY_MB = int(os.getenv('DRIVER_MAX_MEMORY_MB', 1200))
+
+# Per-source scrape timeout in seconds (browser is killed if a scraper overruns it)
+SCRAPER_SOURCE_TIMEOUT = int(os.getenv('SCRAPER_SOURCE_TIMEOUT', 3600))
+
+# Listing discovery: stop after K consecutive already-known links (0 = never stop early)
+DISCOVERY_EARLY_STOP = int(os.getenv('DISCOVERY_EARLY_STOP', 20))
+# Run a full listing sweep at least this often (days) to catch mid-list changes
+DISCOVERY_FULL_SWEEP_DAYS = float(os.getenv('DISCOVERY_FULL_SWEEP_DAYS', 7))
+
+# Detail-page workers (each with its own browser) running alongside link discovery;
+# a scrape runs 1 + DETAIL_WORKERS browsers, so each extra worker adds a Chrome's memory
+DETAIL_WORKERS = int(os.getenv('DETAIL_WORKERS', 1))
+
+# Negative cache for pages that yield no data: skip for N days, re-check a fraction each run
+NEGATIVE_CACHE_TTL_DAYS = float(os.getenv('NEGATIVE_CACHE_TTL_DAYS', 14))
+NEGATIVE_CACHE_RECHECK = float(os.getenv('NEGATIVE_CACHE_RECHECK', 0.05))
+
+# Out-of-process render service (render_service.py). Empty URL = each process runs its own browsers
+RENDER_SERVICE_URL = os.getenv('RENDER_SERVICE_URL', '').rstrip('/')
+RENDER_SERVICE_HOST = os.getenv('RENDER_SERVICE_HOST', '127.0.0.1')
+RENDER_SERVICE_PORT = int(os.getenv('RENDER_SERVICE_PORT', 8100))
+# Browsers in the service's pool (default: one scrape's worth, discovery + DETAIL_WORKERS),
+# and how many callers may wait for one
+RENDER_POOL_SIZE = int(os.getenv('RENDER_POOL_SIZE', 1 + DETAIL_WORKERS))
+RENDER_MAX_QUEUE = int(os.getenv('RENDER_MAX_QUEUE', 32))
+# Seconds a caller waits for a free browser, and before an idle session's browser is reclaimed
+RENDER_ACQUIRE_TIMEOUT = int(os.getenv('RENDER_ACQUIRE_TIMEOUT', 600))
+RENDER_SESSION_IDLE_TIMEOUT = int(os.getenv('RENDER_SESSION_IDLE_TIMEOUT', 300))
+
+# Transform on a process pool once a run has this many events (workers 0 = all cores)
+TRANSFORM_WORKERS = int(os.getenv('TRANSFORM_WORKERS', 0))
+TRANSFORM_CHUNK_SIZE = int(os.getenv('TRANSFORM_CHUNK_SIZE', 2000))
+TRANSFORM_PARALLEL_MIN = int(os.getenv('TRANSFORM_PARALLEL_MIN', 5000))
+
+# combined_events.json companions: a JSON Lines copy, and precompressed siblings ('gz', 'br')
+COMBINED_JSONL = os.getenv('COMBINED_JSONL', 'False').lower() == 'true'
+COMBINED_COMPRESS = [c.strip() for c in os.getenv('COMBINED_COMPRESS', 'gz').split(',') if c.strip()]
+
+# Merge near-duplicate events found on several sites (title similarity within the same date and region)
+DEDUPE_ENABLED = os.getenv('DEDUPE_ENABLED', 'True').lower() == 'true'
+DEDUPE_THRESHOLD = float(os.getenv('DEDUPE_THRESHOLD', 0.8))
+
+# /stats is served from memory; how often (seconds) to check for a snapshot written by another process
+STATS_RECHECK_SECONDS = float(os.getenv('STATS_RECHECK_SECONDS', 5))
+
+# API response cache: entries kept (0 = off) and max age in seconds; a new scrape run invalidates it
+RESPONSE_CACHE_SIZE = int(os.getenv('RESPONSE_CACHE_SIZE', 512))
+RESPONSE_CACHE_TTL = float(os.getenv('RESPONSE_CACHE_TTL', 300))
+# Cached responses at least this large (bytes) are also kept gzipped for clients that accept it
+RESPONSE_GZIP_MIN_SIZE = int(os.getenv('RESPONSE_GZIP_MIN_SIZE', 1024))
@@ -4,6 +4,8 @@ Properly extracts data from event pages
 """
 
 from scraper_base import BaseScraper
+from url_index import UrlIndex
+from date_parser import find_date
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -13,165 +15,24 @@ import time
 import config
 
 class CultureFinalScraper(BaseScraper):
-    def __init__(self, headless=False):
-        super().__init__(headless)
+    def __init__(self, headless=False, **kwargs):
+        super().__init__(headless, **kwargs)
         self.base_url = "https://allofgreeceone.culture.gov.gr"
-        self.scraped_urls = set()
+        self.scraped_urls = UrlIndex()
     
     def scrape_all_events(self, max_events=968):
-        """Scrape all events"""
+        """Scrape all events, scraping detail pages while the listing still loads"""
         self.setup_driver()
         all_events = []
-        event_links = set()
         
         try:
-            # Go to On Demand page
-            url = f"{self.base_url}/en/on-demand/"
-            print(f"Navigating to {url}...")
-            self.driver.get(url)
-            time.sleep(5)
-            
-            # Scroll and click "Read more" to load all events
-            print("\nLoading all events...")
-            clicks = 0
-            for i in range(50):  # Try up to 50 times
-                # Scroll down
-                self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(2)
-                
-                # Count current links before clicking
-                current_links = len(self.driver.find_elements(By.CSS_SELECTOR, 'a[href*="/on-demand/"]'))
-                
-                # Try to click "Read more" button
-                try:
-                    # Try multiple selectors for the button
-                    button_found = False
-                    
-                    for selector in [
-                        "//button[contains(text(), 'Read more')]",
-                        "//a[contains(text(), 'Read more')]",
-                        "//button[contains(@class, 'load')]",
-                        "//button[contains(@class, 'more')]",
-                        "//*[contains(text(), 'Read more')]"
-                    ]:
-                        try:
-                            read_more = self.driver.find_element(By.XPATH, selector)
-                            
-                            if read_more.is_displayed() and read_more.is_enabled():
-                                print(f"  Click {clicks + 1}: Found button, clicking...")
-                                
-                                # Try to click
-                                try:
-                                    read_more.click()
-                                except:
-                                    # Try JavaScript click
-                                    self.driver.execute_script("arguments[0].click();", read_more)
-                                
-                                clicks += 1
-                                button_found = True
-                                time.sleep(3)
-                                
-                                # Check if new links appeared
-                                new_links = len(self.driver.find_elements(By.CSS_SELECTOR, 'a[href*="/on-demand/"]'))
-                                print(f"    Links: {current_links} -> {new_links}")
-                                
-                                break
-                        except:
-                            continue
-                    
-                    if not button_found:
-                        print(f"  No more 'Read more' button found after {clicks} clicks")
-                        break
-                        
-                except Exception as e:
-                    print(f"  Error clicking button: {e}")
-                    break
-            
-            print(f"\nTotal clicks: {clicks}")
-            
-            # Wait a bit more for final content to load
-            time.sleep(3)
-            
-            # Now collect all event links
-            print("\nCollecting event links...")
-            
-            # Try multiple ways to find links
-            event_links_found = set()
-            
-            # Method 1: Find all links with /on-demand/ in href
-            links_method1 = self.driver.find_elements(By.CSS_SELECTOR, 'a[href*="/on-demand/"]')
-            print(f"  Method 1 (CSS selector): {len(links_method1)} links")
-            
-            for link in links_method1:
-                href = link.get_attribute('href')
-                # Event pages have format: .../en/on-demand/event-name
-                # Main page is: .../en/on-demand/
-                if (href and 
-                    href != f"{self.base_url}/en/on-demand/" and
-                    href != f"{self.base_url}/on-demand/" and
-                    not href.endswith('/on-demand/')):
-                    event_links_found.add(href)
-            
-            # Method 2: Get ALL links and filter
-            all_links = self.driver.find_elements(By.TAG_NAME, 'a')
-            print(f"  Method 2 (all links): {len(all_links)} total links on page")
-            
-            for link in all_links:
-                href = link.get_attribute('href')
-                
-                if (href and 
-                    self.base_url in href and
-                    '/on-demand/' in href and
-                    href != f"{self.base_url}/en/on-demand/" and
-                    href != f"{self.base_url}/on-demand/" and
-                    not href.endswith('/on-demand/')):
-                    event_links_found.add(href)
-            
-            event_links = list(event_links_found)
-            print(f"\nTotal unique event links: {len(event_links)}")
-            
-            # If still no links, save page for debugging
-            if len(event_links) == 0:
-                print("\n⚠ No links found! Saving page HTML for debugging...")
-                with open('debug_page.html', 'w', encoding='utf-8') as f:
-                    f.write(self.driver.page_source)
-                print("Saved to: debug_page.html")
-                
-                # Print some sample links for debugging
-                print("\nSample of ALL links on page:")
-                for i, link in enumerate(all_links[:20]):
-                    href = link.get_attribute('href')
-                    text = link.text.strip()[:40]
-                    print(f"  {i+1}. {href} | {text}")
-                
-                return []
-            
-            # Limit to max_events
-            event_links = list(event_links)[:max_events]
-            
-            # Scrape each event
-            print(f"\nScraping {len(event_links)} events...\n")
-            
-            for idx, link in enumerate(event_links):
-                if link in self.scraped_urls:
-                    continue
-                
-                try:
-                    print(f"[{idx + 1}/{len(event_links)}] {link.split('/')[-1][:50]}...")
-                    event = self.scrape_event(link)
-                    
-                    if event and event.get('title'):
-                        all_events.append(event)
-                        self.scraped_urls.add(link)
-                        print(f"  ✓ {event['title'][:60]}")
-                    else:
-                        print(f"  ✗ No data extracted")
-                    
-                    time.sleep(0.5)
-                    
-                except Exception as e:
-                    print(f"  ✗ Error: {e}")
-                    continue
+            all_events = self.run_pipeline(
+                self.iter_event_links(),
+                'scrape_event',
+                max_events,
+                skip_urls=self.scraped_urls,
+                on_result=lambda event: self.scraped_urls.add(event['url'])
+            )
             
             print(f"\n{'='*60}")
             print(f"Successfully scraped {len(all_events)} events")
@@ -187,10 +48,141 @@ class CultureFinalScraper(BaseScraper):
         
         return all_events
     
+    def iter_event_links(self):
+        """
+        Walk the On Demand listing, yielding event links as they appear
+        
+        Links are yielded after every "Read more" click so detail workers
+        can start before the listing is fully expanded.
+        """
+        # Go to On Demand page
+        url = f"{self.base_url}/en/on-demand/"
+        print(f"Navigating to {url}...")
+        self.driver.get(url)
+        time.sleep(5)
+        
+        seen_links = set()
+        self.start_discovery()
+        
+        def harvest():
+            page_links = self.collect_hrefs('a[href*="/on-demand/"]')
+            new_links = [href for href in dict.fromkeys(page_links)
+                         if self.is_event_link(href) and href not in seen_links]
+            seen_links.update(new_links)
+            return page_links, new_links
+        
+        _, new_links = harvest()
+        yield from new_links
+        if self.note_discovered(new_links):
+            return
+        
+        # Scroll and click "Read more" to load all events
+        print("\nLoading all events...")
+        clicks = 0
+        for i in range(50):  # Try up to 50 times
+            if self.is_cancelled():
+                return
+            
+            # Scroll down
+            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            time.sleep(2)
+            
+            # Count current links before clicking
+            current_links = len(self.driver.find_elements(By.CSS_SELECTOR, 'a[href*="/on-demand/"]'))
+            
+            # Try to click "Read more" button
+            try:
+                # Try multiple selectors for the button
+                button_found = False
+                
+                for selector in [
+                    "//button[contains(text(), 'Read more')]",
+                    "//a[contains(text(), 'Read more')]",
+                    "//button[contains(@class, 'load')]",
+                    "//button[contains(@class, 'more')]",
+                    "//*[contains(text(), 'Read more')]"
+                ]:
+                    try:
+                        read_more = self.driver.find_element(By.XPATH, selector)
+                        
+                        if read_more.is_displayed() and read_more.is_enabled():
+                            print(f"  Click {clicks + 1}: Found button, clicking...")
+                            
+                            # Try to click
+                            try:
+                                read_more.click()
+                            except:
+                                # Try JavaScript click
+                                self.driver.execute_script("arguments[0].click();", read_more)
+                            
+                            clicks += 1
+                            button_found = True
+                            time.sleep(3)
+                            break
+                    except:
+                        continue
+                
+                if not button_found:
+                    print(f"  No more 'Read more' button found after {clicks} clicks")
+                    break
+                
+            except Exception as e:
+                print(f"  Error clicking button: {e}")
+                break
+            
+            # Check if new links appeared and hand them to the workers
+            page_links, new_links = harvest()
+            print(f"    Links: {current_links} -> {len(page_links)}")
+            yield from new_links
+            
+            if self.note_discovered(new_links):
+                return
+        
+        print(f"\nTotal clicks: {clicks}")
+        
+        # Wait a bit more for final content to load
+        time.sleep(3)
+        
+        # Now collect any event links the per-click harvest missed
+        print("\nCollecting event links...")
+        
+        # Get ALL links and filter
+        all_links = self.collect_hrefs('a')
+        print(f"  All links: {len(all_links)} total links on page")
+        
+        late_links = [href for href in dict.fromkeys(all_links)
+                      if href and self.base_url in href and self.is_event_link(href)
+                      and href not in seen_links]
+        seen_links.update(late_links)
+        yield from late_links
+        
+        print(f"\nTotal unique event links: {len(seen_links)}")
+        self.finish_discovery()
+        
+        # If still no links, save page for debugging
+        if len(seen_links) == 0:
+            print("\n⚠ No links found! Saving page HTML for debugging...")
+            with open('debug_page.html', 'w', encoding='utf-8') as f:
+                f.write(self.driver.page_source)
+            print("Saved to: debug_page.html")
+            
+            # Print some sample links for debugging
+            print("\nSample of ALL links on page:")
+            for i, href in enumerate(all_links[:20]):
+                print(f"  {i+1}. {href}")
+    
+    def is_event_link(self, href):
+        """Event pages have format .../en/on-demand/event-name"""
+        return (href and
+                '/on-demand/' in href and
+                href != f"{self.base_url}/en/on-demand/" and
+                href != f"{self.base_url}/on-demand/" and
+                not href.endswith('/on-demand/'))
+    
     def scrape_event(self, url):
         """Scrape a single event page"""
         try:
-            self.driver.get(url)
+            self.get_page(url)
             
             # Wait for page to load
             time.sleep(4)
@@ -237,10 +229,8 @@ class CultureFinalScraper(BaseScraper):
                 event['content'] = []
             
             # Try to extract date patterns from text
-            import re
-            date_pattern = r'\d{1,2}[./]\d{1,2}[./]\d{2,4}'
-            dates_found = re.findall(date_pattern, page_text)
-            event['date'] = dates_found[0] if dates_found else None
+            parsed = find_date(page_text)
+            event['date'] = parsed.text if parsed else None
             
             # Extract images
             try:
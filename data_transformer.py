@@ -2,35 +2,359 @@
 Data transformer to standardize all scraped data into unified format
 Combines data from all scrapers and formats before database storage
 """
+import gzip
 import json
+import multiprocessing
 import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Optional
+from functools import lru_cache
 import re
+import config
+from text_utils import fold_text
+from date_parser import parse_date
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+# Keyword -> standard category, in priority order (first listed wins)
+CATEGORY_MAPPING = {
+    'theater': 'Theater',
+    'theatre': 'Theater',
+    'θέατρο': 'Theater',
+    'music': 'Music',
+    'μουσική': 'Music',
+    'concert': 'Concert',
+    'συναυλία': 'Concert',
+    'cinema': 'Cinema',
+    'κινηματογράφος': 'Cinema',
+    'movie': 'Cinema',
+    'sports': 'Sports',
+    'αθλητισμός': 'Sports',
+    'dance': 'Dance',
+    'χορός': 'Dance',
+    'exhibition': 'Exhibition',
+    'έκθεση': 'Exhibition',
+    'festival': 'Festival',
+    'φεστιβάλ': 'Festival',
+    'conference': 'Conference',
+    'συνέδριο': 'Conference',
+    'cultural': 'Cultural',
+    'πολιτιστικό': 'Cultural'
+}
+
+# Place name -> Greek region, in priority order
+REGIONS = {
+    'athens': 'Αττική',
+    'attiki': 'Αττική',
+    'attica': 'Αττική',
+    'thessaloniki': 'Κεντρική Μακεδονία',
+    'macedonia': 'Κεντρική Μακεδονία',
+    'crete': 'Κρήτη',
+    'patras': 'Δυτική Ελλάδα',
+    'ioannina': 'Ήπειρος',
+    'iwannina': 'Ήπειρος',
+    'larissa': 'Θεσσαλία',
+    'volos': 'Θεσσαλία',
+    'heraklion': 'Κρήτη',
+    'rhodes': 'Νότιο Αιγαίο',
+    'corfu': 'Ιόνια Νησιά',
+    'mykonos': 'Νότιο Αιγαίο',
+    'santorini': 'Νότιο Αιγαίο'
+}
+
+DEFAULT_CATEGORY = 'Cultural'
+DEFAULT_COLOR = '#7F8C8D'
+
+CATEGORY_COLORS = {
+    'Cultural': '#F39C12',
+    'Theater': '#9B59B6',
+    'Music': '#E74C3C',
+    'Sports': '#3498DB',
+    'Cinema': '#1ABC9C',
+    'Festival': '#E67E22',
+    'Exhibition': '#95A5A6',
+    'Conference': '#34495E',
+    'Dance': '#9B59B6',
+    'Concert': '#E74C3C',
+    'Other': '#7F8C8D'
+}
+DEFAULT_REGION = 'Αττική'
+
+class KeywordMatcher:
+    """
+    Substring matcher for a priority-ordered keyword map, compiled once
+    
+    All keywords go into one regex alternation inside a lookahead, so a
+    single scan reports the highest-priority keyword starting at every
+    position (overlapping matches included). The result is the same as
+    testing `key in text` for each key in order, without one pass per key.
+    """
+    
+    def __init__(self, mapping: Dict[str, str]):
+        keys = [fold_text(key) for key in mapping]
+        self.values = list(mapping.values())
+        self.priority = {key: index for index, key in enumerate(keys)}
+        self.pattern = re.compile('(?=(' + '|'.join(re.escape(key) for key in keys) + '))')
+    
+    def match(self, text: str) -> Optional[str]:
+        """Value of the highest-priority keyword found in the text, or None"""
+        best = None
+        for found in self.pattern.finditer(fold_text(text)):
+            index = self.priority[found.group(1)]
+            if best is None or index < best:
+                best = index
+                if best == 0:
+                    break
+        return None if best is None else self.values[best]
+
+CATEGORY_MATCHER = KeywordMatcher(CATEGORY_MAPPING)
+REGION_MATCHER = KeywordMatcher(REGIONS)
+
+@lru_cache(maxsize=8192)
+def classify_region(location: str, venue: str) -> str:
+    """Region for a location/venue pair (venues repeat a lot across events)"""
+    return REGION_MATCHER.match(f"{location} {venue}") or DEFAULT_REGION
+
+@lru_cache(maxsize=1024)
+def classify_category(category: str) -> Optional[str]:
+    """Standard category for a source category label, or None"""
+    return CATEGORY_MATCHER.match(category)
+
+class StandardizedEvent:
+    """
+    One event in the unified output format
+    
+    Only the fields that vary are stored, in slots; constant and
+    duplicated keys of the output (eventUrl, imageUrl, categoryColor,
+    schedule, maxCapacity, ...) are filled in by to_dict(). Supports
+    .get() and [] with the output key names, so code written against
+    the old dicts keeps working.
+    """
+    
+    __slots__ = ('id', 'title', 'description', 'date', 'start_date', 'end_date', 'region', 'category',
+                 'location', 'venue', 'url', 'image', 'price', 'source', 'source_urls')
+    
+    # Output key -> attribute for keys that are stored under another name
+    ALIASES = {'eventUrl': 'url', 'imageUrl': 'image', 'startDate': 'start_date', 'endDate': 'end_date'}
+    
+    # Output keys with a fixed value
+    CONSTANTS = {
+        'schedule': None,  # Can be enhanced later
+        'subCategories': None,  # Can be enhanced later
+        'venueUrl': None,  # Can be enhanced later
+        'maxCapacity': 100,  # Default value
+        'targetAges': None,  # Can be enhanced later
+        'specialFeatures': None,  # Can be enhanced later
+    }
+    
+    def __init__(self, title, description='', date=None, start_date=None, end_date=None, region=DEFAULT_REGION,
+                 category=DEFAULT_CATEGORY, location='', venue='', url='', image=None,
+                 price=0, source='', id=None, source_urls=None):
+        self.id = id
+        self.title = title
+        self.description = description
+        self.date = date
+        self.start_date = start_date
+        self.end_date = end_date
+        self.region = region
+        self.category = category
+        self.location = location
+        self.venue = venue
+        self.url = url
+        self.image = image
+        self.price = price
+        self.source = source
+        # Set when cross-source duplicates were merged into this event
+        self.source_urls = source_urls
+    
+    @property
+    def all_urls(self):
+        """URLs of every source listing this event"""
+        if self.source_urls:
+            return list(self.source_urls)
+        return [self.url] if self.url else []
+    
+    @property
+    def category_color(self):
+        return CATEGORY_COLORS.get(self.category, DEFAULT_COLOR)
+    
+    def to_dict(self) -> Dict:
+        """The output dict, in the original key order"""
+        return {
+            'id': self.id,
+            'title': self.title,
+            'description': self.description,
+            'date': self.date,
+            'startDate': self.start_date,
+            'endDate': self.end_date,
+            'schedule': self.CONSTANTS['schedule'],
+            'region': self.region,
+            'category': self.category,
+            'categoryColor': self.category_color,
+            'subCategories': self.CONSTANTS['subCategories'],
+            'location': self.location,
+            'venue': self.venue,
+            'venueUrl': self.CONSTANTS['venueUrl'],
+            'url': self.url,
+            'eventUrl': self.url,
+            'image': self.image,
+            'imageUrl': self.image,
+            'price': self.price,
+            'maxCapacity': self.CONSTANTS['maxCapacity'],
+            'targetAges': self.CONSTANTS['targetAges'],
+            'specialFeatures': self.CONSTANTS['specialFeatures'],
+            'source': self.source,
+            'sourceUrls': self.all_urls
+        }
+    
+    def __getitem__(self, key):
+        if key in self.__slots__:
+            return getattr(self, key)
+        if key in self.ALIASES:
+            return getattr(self, self.ALIASES[key])
+        if key == 'categoryColor':
+            return self.category_color
+        if key == 'sourceUrls':
+            return self.all_urls
+        if key in self.CONSTANTS:
+            return self.CONSTANTS[key]
+        raise KeyError(key)
+    
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+    
+    def __eq__(self, other):
+        if isinstance(other, StandardizedEvent):
+            return all(getattr(self, f) == getattr(other, f) for f in self.__slots__)
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+    
+    # Compared by value but mutable (dedupe fills fields in place), so unhashable
+    # like the dicts it replaces; a value hash would go stale inside a set
+    __hash__ = None
+    
+    def __repr__(self):
+        return f"StandardizedEvent(id={self.id!r}, title={self.title!r}, source={self.source!r})"
+
+def dump_event(event, pretty: bool = False) -> bytes:
+    """Encode one event (dict or StandardizedEvent) as UTF-8 JSON (orjson when installed)"""
+    if isinstance(event, StandardizedEvent):
+        event = event.to_dict()
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(event, option=orjson.OPT_INDENT_2 if pretty else 0)
+    if pretty:
+        return json.dumps(event, indent=2, ensure_ascii=False).encode('utf-8')
+    return json.dumps(event, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+class _BrotliFile:
+    """Minimal streaming writer for .br output"""
+    
+    def __init__(self, path: str):
+        self.file = open(path, 'wb')
+        self.compressor = brotli.Compressor(quality=9)
+    
+    def write(self, data: bytes):
+        self.file.write(self.compressor.process(data))
+    
+    def close(self):
+        self.file.write(self.compressor.finish())
+        self.file.close()
+
+class AtomicOutput:
+    """
+    Output file plus optional precompressed siblings (.gz, .br)
+    
+    Everything is written to *.tmp files and renamed into place on
+    commit(), so readers only ever see a complete previous or new file.
+    """
+    
+    def __init__(self, path: str, compress=()):
+        self.paths = [path]
+        self.sinks = [open(path + '.tmp', 'wb')]
+        
+        for kind in compress:
+            if kind == 'gz':
+                self.paths.append(path + '.gz')
+                self.sinks.append(gzip.GzipFile(path + '.gz.tmp', 'wb', compresslevel=6, mtime=0))
+            elif kind == 'br':
+                if not BROTLI_AVAILABLE:
+                    print("⚠ brotli not installed, skipping .br output")
+                    continue
+                self.paths.append(path + '.br')
+                self.sinks.append(_BrotliFile(path + '.br.tmp'))
+    
+    def write(self, data: bytes):
+        for sink in self.sinks:
+            sink.write(data)
+    
+    def commit(self):
+        for sink in self.sinks:
+            sink.close()
+        for path in self.paths:
+            os.replace(path + '.tmp', path)
+        
+        # Siblings no longer produced would otherwise be served as if current
+        for suffix in ('.gz', '.br'):
+            stale = self.paths[0] + suffix
+            if stale not in self.paths and os.path.exists(stale):
+                os.remove(stale)
+    
+    def abort(self):
+        for sink in self.sinks:
+            try:
+                sink.close()
+            except Exception:
+                pass
+        for path in self.paths:
+            try:
+                os.remove(path + '.tmp')
+            except OSError:
+                pass
+
+def _transform_chunk(chunk: List[tuple], transformer=None) -> List[Optional['StandardizedEvent']]:
+    """Transform (source, event) pairs without ids (also the process-pool task)"""
+    transformer = transformer or DataTransformer()
+    results = []
+    for source, event in chunk:
+        try:
+            results.append(transformer.build_event(event, source))
+        except Exception as e:
+            print(f"  Error transforming event: {e}")
+            results.append(None)
+    return results
 
 class DataTransformer:
     """Transform scraped data into standardized format"""
     
     def __init__(self):
         self.next_id = 1
-        self.category_colors = {
-            'Cultural': '#F39C12',
-            'Theater': '#9B59B6',
-            'Music': '#E74C3C',
-            'Sports': '#3498DB',
-            'Cinema': '#1ABC9C',
-            'Festival': '#E67E22',
-            'Exhibition': '#95A5A6',
-            'Conference': '#34495E',
-            'Dance': '#9B59B6',
-            'Concert': '#E74C3C',
-            'Other': '#7F8C8D'
-        }
+        self.category_colors = CATEGORY_COLORS
     
-    def transform_all_events(self, events_by_source: Dict[str, List[Dict]]) -> List[Dict]:
+    def transform_all_events(self, events_by_source: Dict[str, List[Dict]],
+                             workers: Optional[int] = None, chunk_size: Optional[int] = None) -> List['StandardizedEvent']:
         """
         Transform events from all sources into unified format
         
+        Large inputs (TRANSFORM_PARALLEL_MIN events or more) are split into
+        chunks and transformed on a process pool; results and ids are the
+        same as a serial run.
+        
         Args:
             events_by_source: Dict with source name as key and list of events as value
                 Example: {
@@ -40,28 +364,68 @@ class DataTransformer:
                     'more_events': [...]
                 }
         
+            workers: Processes to use (default TRANSFORM_WORKERS, 0 = all cores)
+            chunk_size: Events per process-pool task (default TRANSFORM_CHUNK_SIZE)
+        
         Returns:
-            List of standardized event dictionaries
+            List of StandardizedEvent records (dict-like, see to_dict())
         """
-        all_transformed = []
-        
+        items = []
         for source, events in events_by_source.items():
             print(f"Transforming {len(events)} events from {source}...")
-            
-            for event in events:
-                try:
-                    transformed = self.transform_event(event, source)
-                    if transformed:
-                        all_transformed.append(transformed)
-                except Exception as e:
-                    print(f"  Error transforming event: {e}")
-                    continue
+            items.extend((source, event) for event in events)
+        
+        workers = workers if workers is not None else config.TRANSFORM_WORKERS
+        workers = workers or os.cpu_count() or 1
+        
+        if workers > 1 and len(items) >= config.TRANSFORM_PARALLEL_MIN:
+            built = self._build_parallel(items, workers, chunk_size or config.TRANSFORM_CHUNK_SIZE)
+        else:
+            built = _transform_chunk(items, self)
+        
+        # Ids are handed out here, in input order, so they match a serial run
+        all_transformed = []
+        for standardized in built:
+            if standardized:
+                standardized.id = self.next_id
+                self.next_id += 1
+                all_transformed.append(standardized)
         
         print(f"Total transformed events: {len(all_transformed)}")
         return all_transformed
     
-    def transform_event(self, event: Dict, source: str) -> Optional[Dict]:
+    def _build_parallel(self, items: List[tuple], workers: int, chunk_size: int) -> List[Optional['StandardizedEvent']]:
+        """
+        Build events across a process pool, keeping input order
+
+        Workers are spawned, not forked: the API and scheduler run scrapes on
+        threads, and a fork could copy a lock another thread holds. If the
+        pool can't start or a worker dies, the whole batch is redone serially.
+        """
+        chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+        print(f"  Using {workers} processes for {len(chunks)} chunks of up to {chunk_size} events")
+        
+        built = []
+        try:
+            with ProcessPoolExecutor(max_workers=min(workers, len(chunks)),
+                                     mp_context=multiprocessing.get_context('spawn')) as executor:
+                for results in executor.map(_transform_chunk, chunks):
+                    built.extend(results)
+        except (BrokenProcessPool, OSError) as e:
+            print(f"  ⚠ Process pool failed ({e}), transforming serially")
+            built = _transform_chunk(items, self)
+        return built
+    
+    def transform_event(self, event: Dict, source: str) -> Optional['StandardizedEvent']:
         """Transform a single event to standardized format"""
+        standardized = self.build_event(event, source)
+        if standardized:
+            standardized.id = self.next_id
+            self.next_id += 1
+        return standardized
+    
+    def build_event(self, event: Dict, source: str) -> Optional['StandardizedEvent']:
+        """Standardized event without an id (None if it has no title)"""
         
         # Extract and clean data
         title = self._clean_text(event.get('title', ''))
@@ -69,7 +433,7 @@ class DataTransformer:
             return None
         
         description = self._extract_description(event)
-        date = self._extract_date(event)
+        date, start_date, end_date = self._extract_dates(event)
         region = self._extract_region(event)
         category = self._extract_category(event)
         location = self._extract_location(event)
@@ -78,33 +442,21 @@ class DataTransformer:
         image = self._extract_image(event)
         price = self._extract_price(event)
         
-        # Build standardized event
-        standardized = {
-            'id': self.next_id,
-            'title': title,
-            'description': description,
-            'date': date,
-            'schedule': None,  # Can be enhanced later
-            'region': region,
-            'category': category,
-            'categoryColor': self.category_colors.get(category, '#7F8C8D'),
-            'subCategories': None,  # Can be enhanced later
-            'location': location,
-            'venue': venue,
-            'venueUrl': None,  # Can be enhanced later
-            'url': url,
-            'eventUrl': url,
-            'image': image,
-            'imageUrl': image,
-            'price': price,
-            'maxCapacity': 100,  # Default value
-            'targetAges': None,  # Can be enhanced later
-            'specialFeatures': None,  # Can be enhanced later
-            'source': self._format_source_name(source)
-        }
-        
-        self.next_id += 1
-        return standardized
+        return StandardizedEvent(
+            title=title,
+            description=description,
+            date=date,
+            start_date=start_date,
+            end_date=end_date,
+            region=region,
+            category=category,
+            location=location,
+            venue=venue,
+            url=url,
+            image=image,
+            price=price,
+            source=self._format_source_name(source)
+        )
     
     def _clean_text(self, text: Any) -> str:
         """Clean and normalize text"""
@@ -147,74 +499,35 @@ class DataTransformer:
         
         return self._clean_text(desc)
     
-    def _extract_date(self, event: Dict) -> Optional[str]:
-        """Extract and format date"""
+    def _extract_dates(self, event: Dict) -> tuple:
+        """
+        (date, startDate, endDate) from one date_parser.parse_date call
+
+        date keeps its original format: a numeric date is normalized to
+        YYYY-MM-DD, anything else (month names, weekdays) is kept as scraped.
+        startDate/endDate are YYYY-MM-DD or None; endDate is only set for ranges.
+        """
         date = event.get('date')
-        
         if not date:
-            return None
+            return None, None, None
         
         date = str(date).strip()
-        
-        # Try to parse and standardize date format to YYYY-MM-DD
-        try:
-            # Handle various date formats
-            date_patterns = [
-                r'(\d{4})-(\d{1,2})-(\d{1,2})',  # YYYY-MM-DD
-                r'(\d{1,2})/(\d{1,2})/(\d{4})',  # DD/MM/YYYY
-                r'(\d{1,2})\.(\d{1,2})\.(\d{4})',  # DD.MM.YYYY
-                r'(\d{1,2})-(\d{1,2})-(\d{4})',  # DD-MM-YYYY
-            ]
-            
-            for pattern in date_patterns:
-                match = re.search(pattern, date)
-                if match:
-                    groups = match.groups()
-                    if len(groups[0]) == 4:  # YYYY-MM-DD format
-                        year, month, day = groups
-                    else:  # DD/MM/YYYY format
-                        day, month, year = groups
-                    
-                    # Ensure proper formatting
-                    return f"{year}-{int(month):02d}-{int(day):02d}"
-        except:
-            pass
-        
-        # Return as-is if can't parse
-        return date
+        parsed = parse_date(date)
+        if not parsed:
+            return date, None, None
+        
+        start = parsed.start.isoformat()
+        end = parsed.end.isoformat() if parsed.end else None
+        if not any(char.isalpha() for char in parsed.text):
+            date = start
+        return date, start, end
     
     def _extract_region(self, event: Dict) -> str:
         """Extract region from location or venue"""
         location = event.get('location', '')
         venue = event.get('venue', '')
         
-        # Common Greek regions
-        regions = {
-            'athens': 'Αττική',
-            'attiki': 'Αττική',
-            'attica': 'Αττική',
-            'thessaloniki': 'Κεντρική Μακεδονία',
-            'macedonia': 'Κεντρική Μακεδονία',
-            'crete': 'Κρήτη',
-            'patras': 'Δυτική Ελλάδα',
-            'ioannina': 'Ήπειρος',
-            'iwannina': 'Ήπειρος',
-            'larissa': 'Θεσσαλία',
-            'volos': 'Θεσσαλία',
-            'heraklion': 'Κρήτη',
-            'rhodes': 'Νότιο Αιγαίο',
-            'corfu': 'Ιόνια Νησιά',
-            'mykonos': 'Νότιο Αιγαίο',
-            'santorini': 'Νότιο Αιγαίο'
-        }
-        
-        text = f"{location} {venue}".lower()
-        
-        for key, region in regions.items():
-            if key in text:
-                return region
-        
-        return 'Αττική'  # Default to Athens
+        return classify_region(str(location or ''), str(venue or ''))
     
     def _extract_category(self, event: Dict) -> str:
         """Extract and standardize category"""
@@ -225,46 +538,15 @@ class DataTransformer:
         
         category = str(category).strip().lower()
         
-        # Map to standard categories
-        category_mapping = {
-            'theater': 'Theater',
-            'theatre': 'Theater',
-            'θέατρο': 'Theater',
-            'music': 'Music',
-            'μουσική': 'Music',
-            'concert': 'Concert',
-            'συναυλία': 'Concert',
-            'cinema': 'Cinema',
-            'κινηματογράφος': 'Cinema',
-            'movie': 'Cinema',
-            'sports': 'Sports',
-            'αθλητισμός': 'Sports',
-            'dance': 'Dance',
-            'χορός': 'Dance',
-            'exhibition': 'Exhibition',
-            'έκθεση': 'Exhibition',
-            'festival': 'Festival',
-            'φεστιβάλ': 'Festival',
-            'conference': 'Conference',
-            'συνέδριο': 'Conference',
-            'cultural': 'Cultural',
-            'πολιτιστικό': 'Cultural'
-        }
-        
-        for key, value in category_mapping.items():
-            if key in category:
-                return value
+        mapped = classify_category(category)
+        if mapped:
+            return mapped
         
         # Try to infer from title or description
-        title = str(event.get('title', '')).lower()
-        desc = str(event.get('description', '')).lower()
-        text = f"{title} {desc}"
-        
-        for key, value in category_mapping.items():
-            if key in text:
-                return value
+        title = str(event.get('title', ''))
+        desc = str(event.get('description', ''))
         
-        return 'Cultural'  # Default category
+        return CATEGORY_MATCHER.match(f"{title} {desc}") or DEFAULT_CATEGORY
     
     def _extract_location(self, event: Dict) -> str:
         """Extract location"""
@@ -336,15 +618,44 @@ class DataTransformer:
         
         return source_names.get(source, source.title())
     
-    def save_combined_json(self, events: List[Dict], filename: str = 'combined_events.json'):
-        """Save combined events to JSON file"""
+    def save_combined_json(self, events: Iterable, filename: str = 'combined_events.json'):
+        """
+        Save combined events to JSON file
+        
+        Events are streamed one at a time, so any iterable works and memory
+        stays flat. The file (and its optional .jsonl/.gz/.br companions,
+        see COMBINED_JSONL and COMBINED_COMPRESS) is replaced atomically.
+        """
         os.makedirs('scraped_data', exist_ok=True)
         filepath = os.path.join('scraped_data', filename)
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(events, f, indent=2, ensure_ascii=False)
+        outputs = [AtomicOutput(filepath, config.COMBINED_COMPRESS)]
+        jsonl = None
+        if config.COMBINED_JSONL:
+            jsonl = AtomicOutput(os.path.splitext(filepath)[0] + '.jsonl', config.COMBINED_COMPRESS)
+            outputs.append(jsonl)
         
-        print(f"✓ Combined events saved to: {filepath}")
+        array = outputs[0]
+        count = 0
+        try:
+            array.write(b'[')
+            for event in events:
+                # Same layout as json.dump(indent=2): each element indented by two spaces
+                array.write(b',\n  ' if count else b'\n  ')
+                array.write(dump_event(event, pretty=True).replace(b'\n', b'\n  '))
+                if jsonl:
+                    jsonl.write(dump_event(event) + b'\n')
+                count += 1
+            array.write(b'\n]' if count else b']')
+            
+            for output in outputs:
+                output.commit()
+        except BaseException:
+            for output in outputs:
+                output.abort()
+            raise
+        
+        print(f"✓ Combined events saved to: {filepath} ({count} events)")
         return filepath
 
 # Example usage
@@ -366,4 +677,4 @@ if __name__ == "__main__":
     }
     
     transformed = transformer.transform_all_events(sample_events)
-    print(json.dumps(transformed, indent=2, ensure_ascii=False))
+    print(json.dumps([event.to_dict() for event in transformed], indent=2, ensure_ascii=False))
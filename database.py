@@ -1,9 +1,9 @@
 """
 Database models and connection for events and deals
 """
-from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, JSON, Float
+from sqlalchemy import create_engine, Column, Index, Integer, String, Text, Date, DateTime, JSON, Float
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import deferred, sessionmaker
 from datetime import datetime
 import os
 from dotenv import load_dotenv
@@ -39,8 +39,12 @@ class Event(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(500), nullable=False, index=True)
-    description = Column(Text, nullable=True)
+    # Heavy text columns are deferred: loaded on first access, not with every row
+    description = deferred(Column(Text, nullable=True))
     date = Column(String(100), nullable=True)
+    # Parsed from date at write time; end_date is only set for multi-day events
+    start_date = Column(Date, nullable=True, index=True)
+    end_date = Column(Date, nullable=True, index=True)
     location = Column(String(300), nullable=True)
     category = Column(String(100), nullable=True, index=True)
     price = Column(String(100), nullable=True)
@@ -48,10 +52,16 @@ class Event(Base):
     source = Column(String(100), nullable=False, index=True)  # Which scraper
     images = Column(JSON, nullable=True)
     contact = Column(String(300), nullable=True)
-    content = Column(JSON, nullable=True)
-    full_text = Column(Text, nullable=True)
+    content = deferred(Column(JSON, nullable=True))
+    full_text = deferred(Column(Text, nullable=True))
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # Keyset pagination indexes (see pagination.py)
+    __table_args__ = (
+        Index('ix_events_created_at_id', 'created_at', 'id'),
+        Index('ix_events_start_date_id', 'start_date', 'id'),
+    )
 
 class Deal(Base):
     """Deal model"""
@@ -59,7 +69,7 @@ class Deal(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(500), nullable=False, index=True)
-    description = Column(Text, nullable=True)
+    description = deferred(Column(Text, nullable=True))
     price = Column(String(100), nullable=True)
     original_price = Column(String(100), nullable=True)
     discount = Column(String(50), nullable=True)
@@ -70,12 +80,65 @@ class Deal(Base):
     valid_until = Column(String(100), nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    __table_args__ = (
+        Index('ix_deals_created_at_id', 'created_at', 'id'),
+    )
+
+class StatsSnapshot(Base):
+    """Precomputed /stats counts (one row), refreshed after each scrape run"""
+    __tablename__ = "stats_snapshot"
+    
+    id = Column(Integer, primary_key=True)
+    # Bumped on every refresh so API processes know to reload
+    generation = Column(Integer, nullable=False, default=0)
+    data = Column(JSON, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+# Filtered list queries sorted newest first (new tables get these from create_all,
+# existing ones from migrations.py - keep the two in step)
+for _model in (Event, Deal):
+    Index(f'ix_{_model.__tablename__}_source_created_at_id', _model.source, _model.created_at.desc(), _model.id.desc())
+    Index(f'ix_{_model.__tablename__}_category_created_at_id', _model.category, _model.created_at.desc(), _model.id.desc())
 
 def init_db():
-    """Initialize database tables"""
+    """Create missing tables, then apply pending schema migrations"""
     Base.metadata.create_all(bind=engine)
+    
+    from migrations import run_migrations
+    run_migrations()
     print("✓ Database initialized")
 
+def backfill_event_dates(batch_size=1000):
+    """Fill start_date/end_date for rows that have a parseable date"""
+    from date_parser import parse_date
+    
+    db = SessionLocal()
+    updated = 0
+    last_id = 0
+    try:
+        while True:
+            rows = (db.query(Event.id, Event.date)
+                    .filter(Event.id > last_id, Event.start_date.is_(None), Event.date.isnot(None))
+                    .order_by(Event.id).limit(batch_size).all())
+            if not rows:
+                break
+            
+            for event_id, raw_date in rows:
+                parsed = parse_date(raw_date)
+                if parsed:
+                    db.query(Event).filter(Event.id == event_id).update(
+                        {'start_date': parsed.start, 'end_date': parsed.end},
+                        synchronize_session=False
+                    )
+                    updated += 1
+            db.commit()
+            last_id = rows[-1][0]
+    finally:
+        db.close()
+    
+    print(f"✓ Backfilled dates for {updated} events")
+
 def get_db():
     """Get database session"""
     db = SessionLocal()
@@ -0,0 +1,151 @@
+"""
+Date extraction shared by the scrapers and the data transformer
+One precompiled pattern covers ISO and numeric dates, English and Greek
+month names, and ranges such as "17 Jan - 15 Feb 2026" or "3-5 Μαΐου"
+"""
+import re
+from collections import namedtuple
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Optional
+
+from text_utils import fold_text
+
+# start/end are datetime.date (end is None for a single day); text is the matched span
+ParsedDate = namedtuple('ParsedDate', ['start', 'end', 'text'])
+
+# Month names as they appear after fold_text (lowercase, no accents), incl. Greek genitive
+MONTHS = {
+    'january': 1, 'jan': 1, 'ιανουαριοσ': 1, 'ιανουαριου': 1, 'ιαν': 1,
+    'february': 2, 'feb': 2, 'φεβρουαριοσ': 2, 'φεβρουαριου': 2, 'φεβ': 2,
+    'march': 3, 'mar': 3, 'μαρτιοσ': 3, 'μαρτιου': 3, 'μαρ': 3,
+    'april': 4, 'apr': 4, 'απριλιοσ': 4, 'απριλιου': 4, 'απρ': 4,
+    'may': 5, 'μαιοσ': 5, 'μαιου': 5, 'μαι': 5,
+    'june': 6, 'jun': 6, 'ιουνιοσ': 6, 'ιουνιου': 6, 'ιουν': 6,
+    'july': 7, 'jul': 7, 'ιουλιοσ': 7, 'ιουλιου': 7, 'ιουλ': 7,
+    'august': 8, 'aug': 8, 'αυγουστοσ': 8, 'αυγουστου': 8, 'αυγ': 8,
+    'september': 9, 'sept': 9, 'sep': 9, 'σεπτεμβριοσ': 9, 'σεπτεμβριου': 9, 'σεπτ': 9, 'σεπ': 9,
+    'october': 10, 'oct': 10, 'οκτωβριοσ': 10, 'οκτωβριου': 10, 'οκτ': 10,
+    'november': 11, 'nov': 11, 'νοεμβριοσ': 11, 'νοεμβριου': 11, 'νοεμ': 11, 'νοε': 11,
+    'december': 12, 'dec': 12, 'δεκεμβριοσ': 12, 'δεκεμβριου': 12, 'δεκ': 12,
+}
+
+# Year-less dates further in the past than this are taken to be next year's
+YEAR_ROLLOVER_DAYS = 180
+
+# Longer (and uncached) text is searched directly, e.g. a whole page body
+MAX_CACHED_LENGTH = 256
+
+_MONTH = r'(?:' + '|'.join(sorted(MONTHS, key=len, reverse=True)) + r')(?![a-zα-ω])\.?'
+_DAY = r'(?<!\d)\d{1,2}(?:st|nd|rd|th)?'
+_YEAR = r'\d{4}(?!\d)'
+_SEP = r'\s*(?:-|–|—|to|until|till|εωσ|μεχρι)\s*'
+
+DATE_PATTERN = re.compile(
+    # 2026-02-15 (optionally followed by a time)
+    rf'(?P<iso>(?<!\d)(?P<iy>\d{{4}})-(?P<im>\d{{1,2}})-(?P<id>\d{{1,2}})(?!\d))'
+    # 17/01 - 15/02/2026, 25-26/10/2025, 15.02.2026, 15-02-26
+    rf'|(?P<num>(?<!\d)(?:(?P<nd1>\d{{1,2}})[./](?P<nm1>\d{{1,2}})(?:[./](?P<ny1>\d{{2,4}}))?{_SEP}'
+    rf'|(?P<ndr>\d{{1,2}})\s*[-–]\s*)?'
+    rf'(?P<nd2>\d{{1,2}})(?P<ns>[./-])(?P<nm2>\d{{1,2}})(?P=ns)(?P<ny2>\d{{4}}|\d{{2}})(?!\d))'
+    # 17 Jan - 15 Feb 2026, 3-5 Μαΐου, 17 Ιανουαρίου 2026
+    rf'|(?P<txt>(?:(?P<td1>{_DAY})(?:\s+(?P<tm1>{_MONTH})(?:,?\s+(?P<ty1>{_YEAR}))?)?{_SEP})?'
+    rf'(?P<td2>{_DAY})\s+(?P<tm2>{_MONTH})(?:,?\s+(?P<ty2>{_YEAR}))?)'
+    # January 17, 2026 / Jan 17-19, 2026 (year required)
+    rf'|(?P<mf>(?P<fm>{_MONTH})\s+(?P<fd1>{_DAY})(?:{_SEP}(?P<fd2>{_DAY}))?,?\s+(?P<fy>{_YEAR}))'
+)
+
+def _day(value):
+    return int(re.match(r'\d+', value).group())
+
+def _month(value):
+    return MONTHS[value.rstrip('.')]
+
+def _year(value):
+    year = int(value)
+    return year + 2000 if year < 100 else year
+
+def _infer_year(month, day, today):
+    """Year for a date given without one: this year, unless that is long past"""
+    candidate = date(today.year, month, day)
+    if candidate < today - timedelta(days=YEAR_ROLLOVER_DAYS):
+        return today.year + 1
+    return today.year
+
+def _build(match, today):
+    """(start, end) from a match; raises ValueError for impossible dates"""
+    g = match.groupdict()
+
+    if g['iso']:
+        return date(int(g['iy']), int(g['im']), int(g['id'])), None
+
+    if g['num']:
+        end = date(_year(g['ny2']), int(g['nm2']), int(g['nd2']))
+        if g['ndr'] is not None:
+            return end.replace(day=int(g['ndr'])), end
+        if g['nd1'] is None:
+            return end, None
+        start_year = _year(g['ny1']) if g['ny1'] else end.year
+        start = date(start_year, int(g['nm1']), int(g['nd1']))
+        if start > end and not g['ny1']:
+            start = start.replace(year=end.year - 1)
+        return start, end
+
+    if g['txt']:
+        end_month = _month(g['tm2'])
+        end_day = _day(g['td2'])
+        end_year = (_year(g['ty2']) if g['ty2'] else
+                    _year(g['ty1']) if g['ty1'] else
+                    _infer_year(end_month, end_day, today))
+        end = date(end_year, end_month, end_day)
+        if g['td1'] is None:
+            return end, None
+        start_month = _month(g['tm1']) if g['tm1'] else end_month
+        start = date(_year(g['ty1']) if g['ty1'] else end_year, start_month, _day(g['td1']))
+        if start > end and not g['ty1']:
+            start = start.replace(year=end_year - 1)
+        return start, end
+
+    month = _month(g['fm'])
+    year = _year(g['fy'])
+    start = date(year, month, _day(g['fd1']))
+    end = date(year, month, _day(g['fd2'])) if g['fd2'] else None
+    return start, end
+
+def find_date(text: Optional[str], today: Optional[date] = None) -> Optional[ParsedDate]:
+    """First valid date or date range in the text (no caching, any length)"""
+    if not text:
+        return None
+
+    today = today or date.today()
+    folded = fold_text(text)
+    # Folding keeps positions unless lower() expanded a character
+    source = text if len(folded) == len(text) else folded
+
+    for match in DATE_PATTERN.finditer(folded):
+        try:
+            start, end = _build(match, today)
+        except (ValueError, KeyError):
+            continue
+        if end is not None and end < start:
+            start, end = end, start
+        if end == start:
+            end = None
+        return ParsedDate(start, end, source[match.start():match.end()].strip())
+    return None
+
+@lru_cache(maxsize=16384)
+def _parse_cached(text, today):
+    return find_date(text, today)
+
+def parse_date(text: Optional[str]) -> Optional[ParsedDate]:
+    """
+    Parse a date field; short strings (the usual scraped date labels,
+    which repeat a lot) are memoized
+    """
+    if not text:
+        return None
+    text = str(text)
+    if len(text) > MAX_CACHED_LENGTH:
+        return find_date(text)
+    return _parse_cached(text, date.today())
@@ -0,0 +1,164 @@
+"""
+Cross-source near-duplicate detection for standardized events
+The same event often appears on several sites under different URLs;
+this merges those copies into one canonical event listing every source URL
+"""
+import re
+from collections import defaultdict
+from hashlib import blake2b
+from typing import List
+
+import config
+from data_transformer import StandardizedEvent
+from text_utils import fold_text
+
+# 16 hashes in 4 bands of 4: pairs above ~0.7 title similarity share a bucket
+NUM_PERM = 16
+BANDS = 4
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 4
+
+# Each "permutation" is the shingle hash XORed with a fixed 64-bit mask
+_MASKS = [int.from_bytes(blake2b(f'minhash-{i}'.encode(), digest_size=8).digest(), 'big')
+          for i in range(NUM_PERM)]
+
+_NON_WORD = re.compile(r'[\W_]+')
+
+# Fields filled from duplicates when the canonical event lacks them
+FILL_FIELDS = ('description', 'date', 'start_date', 'end_date', 'location', 'venue', 'image', 'price')
+
+def normalize_title(title: str) -> str:
+    """Lowercase, accent-fold and strip punctuation"""
+    return _NON_WORD.sub(' ', fold_text(title or '')).strip()
+
+def shingles(text: str) -> set:
+    """Character shingles of a normalized title (whole title if it is short)"""
+    if len(text) <= SHINGLE_SIZE:
+        return {text} if text else set()
+    return {text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+
+def minhash(shingle_set: set) -> tuple:
+    """MinHash signature of a shingle set"""
+    hashes = [int.from_bytes(blake2b(s.encode('utf-8'), digest_size=8).digest(), 'big')
+              for s in shingle_set]
+    return tuple([min(map(mask.__xor__, hashes)) for mask in _MASKS])
+
+def jaccard(a: set, b: set) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+class _UnionFind:
+    """Disjoint sets that never hold two events from the same source"""
+
+    def __init__(self, sources):
+        self.parent = list(range(len(sources)))
+        # Root -> sources of the events in its cluster
+        self.sources = [{source} for source in sources]
+
+    def find(self, x):
+        while self.parent[x] != x:
+            self.parent[x] = self.parent[self.parent[x]]
+            x = self.parent[x]
+        return x
+
+    def union(self, a, b):
+        """Join the clusters of a and b unless they share a source; True if joined"""
+        a, b = self.find(a), self.find(b)
+        if a == b:
+            return True
+        if self.sources[a] & self.sources[b]:
+            return False
+        # Keep the earliest event as the root so it becomes the canonical one
+        root, child = min(a, b), max(a, b)
+        self.parent[child] = root
+        self.sources[root] |= self.sources[child]
+        self.sources[child] = None
+        return True
+
+def find_duplicate_groups(events: List[StandardizedEvent], threshold: float = None) -> List[List[int]]:
+    """
+    Indexes of events that are near-duplicates of each other
+
+    Events are blocked by (date, region) and bucketed by LSH bands of
+    their title MinHash, so only events sharing a bucket are compared.
+    Candidates are confirmed by exact shingle Jaccard >= threshold and
+    must come from different sources. Clusters are joined most similar
+    pair first, and never so that one holds two events from one source.
+    """
+    threshold = config.DEDUPE_THRESHOLD if threshold is None else threshold
+    shingle_sets = [shingles(normalize_title(event.get('title'))) for event in events]
+
+    blocks = defaultdict(list)
+    for index, (event, shingle_set) in enumerate(zip(events, shingle_sets)):
+        if shingle_set:
+            # Parsed start date when there is one, so differently written dates still block together
+            blocks[(event.get('startDate') or event.get('date'), event.get('region'))].append(index)
+
+    buckets = defaultdict(list)
+    for block, members in blocks.items():
+        # Only blocks with events from more than one source can hold duplicates
+        if len({events[i].get('source') for i in members}) < 2:
+            continue
+        for index in members:
+            signature = minhash(shingle_sets[index])
+            for band in range(BANDS):
+                buckets[(block, band, signature[band * ROWS:(band + 1) * ROWS])].append(index)
+
+    checked = set()
+    matches = []
+    for members in buckets.values():
+        if len(members) < 2:
+            continue
+        for i, a in enumerate(members):
+            for b in members[i + 1:]:
+                if (a, b) in checked:
+                    continue
+                checked.add((a, b))
+                if events[a].get('source') == events[b].get('source'):
+                    continue
+                similarity = jaccard(shingle_sets[a], shingle_sets[b])
+                if similarity >= threshold:
+                    matches.append((similarity, a, b))
+
+    groups = _UnionFind([event.get('source') for event in events])
+    for _, a, b in sorted(matches, key=lambda match: -match[0]):
+        groups.union(a, b)
+
+    clusters = defaultdict(list)
+    for index in range(len(events)):
+        clusters[groups.find(index)].append(index)
+    return [members for members in clusters.values() if len(members) > 1]
+
+def merge_group(events: List[StandardizedEvent]) -> StandardizedEvent:
+    """Merge duplicates into the first event of the group"""
+    canonical = events[0]
+    urls = []
+    for event in events:
+        for url in event.all_urls:
+            if url not in urls:
+                urls.append(url)
+
+    for field in FILL_FIELDS:
+        if not canonical[field]:
+            for other in events[1:]:
+                if other[field]:
+                    setattr(canonical, field, other[field])
+                    break
+
+    canonical.source_urls = urls
+    return canonical
+
+def dedupe_events(events: List[StandardizedEvent], threshold: float = None) -> List[StandardizedEvent]:
+    """Events with cross-source near-duplicates merged, in original order"""
+    groups = find_duplicate_groups(events, threshold)
+    if not groups:
+        return events
+
+    dropped = set()
+    for members in groups:
+        merge_group([events[i] for i in members])
+        dropped.update(members[1:])
+
+    print(f"Merged {len(dropped)} duplicate events into {len(groups)} canonical events")
+    return [event for index, event in enumerate(events) if index not in dropped]
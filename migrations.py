@@ -0,0 +1,149 @@
+"""
+Versioned schema migrations, applied at startup by init_db()
+create_all only creates missing tables; anything added to an existing
+table (columns, indexes, triggers) goes here as a new numbered migration.
+Applied versions are recorded in the schema_version table.
+
+Run by hand with: python migrations.py
+"""
+from collections import namedtuple
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, inspect, select, text
+
+from database import engine
+
+# apply(conn) runs inside a transaction, unless transactional is False: then
+# conn is in autocommit mode, which CREATE INDEX CONCURRENTLY needs.
+# If apply returns False the migration is left pending and retried on the next start.
+Migration = namedtuple('Migration', ['version', 'name', 'apply', 'transactional'])
+
+# Arbitrary key for the PostgreSQL advisory lock that serializes concurrent starts
+ADVISORY_LOCK_ID = 72_201_045
+
+schema_version = Table(
+    'schema_version', MetaData(),
+    Column('version', Integer, primary_key=True),
+    Column('name', String(200), nullable=False),
+    Column('applied_at', DateTime, default=datetime.utcnow),
+)
+
+def create_index(conn, name, table, columns):
+    """
+    CREATE INDEX IF NOT EXISTS; on PostgreSQL it is built CONCURRENTLY so
+    writes to the table are not blocked while it builds
+    """
+    if conn.dialect.name != 'postgresql':
+        conn.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})"))
+        return
+
+    # A failed concurrent build leaves an invalid index behind; drop it and rebuild
+    valid = conn.execute(text(
+        "SELECT i.indisvalid FROM pg_class c JOIN pg_index i ON i.indexrelid = c.oid WHERE c.relname = :name"
+    ), {'name': name}).scalar()
+    if valid is False:
+        conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+    conn.execute(text(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} ({columns})"))
+
+def _event_date_columns(conn):
+    columns = {column['name'] for column in inspect(conn).get_columns('events')}
+    if 'start_date' not in columns:
+        conn.execute(text("ALTER TABLE events ADD COLUMN start_date DATE"))
+    if 'end_date' not in columns:
+        conn.execute(text("ALTER TABLE events ADD COLUMN end_date DATE"))
+
+def _backfill_event_dates(conn):
+    from database import backfill_event_dates
+    backfill_event_dates()
+
+def _keyset_indexes(conn):
+    # The single-column date indexes are built here rather than in migration 1,
+    # which adds the columns inside a transaction
+    create_index(conn, 'ix_events_start_date', 'events', 'start_date')
+    create_index(conn, 'ix_events_end_date', 'events', 'end_date')
+    create_index(conn, 'ix_events_created_at_id', 'events', 'created_at, id')
+    create_index(conn, 'ix_events_start_date_id', 'events', 'start_date, id')
+    create_index(conn, 'ix_deals_created_at_id', 'deals', 'created_at, id')
+
+def _filter_sort_indexes(conn):
+    # source/category filters sorted newest first, read straight off the index
+    for table in ('events', 'deals'):
+        create_index(conn, f'ix_{table}_source_created_at_id', table, 'source, created_at DESC, id DESC')
+        create_index(conn, f'ix_{table}_category_created_at_id', table, 'category, created_at DESC, id DESC')
+
+def _start_date_desc_index(conn):
+    # sort=-start_date puts undated events last (DESC NULLS LAST); a backward scan
+    # of ix_events_start_date_id would return them first. SQLite orders NULLs
+    # lowest, so its backward scan already fits.
+    if conn.dialect.name == 'postgresql':
+        create_index(conn, 'ix_events_start_date_desc_id', 'events', 'start_date DESC NULLS LAST, id DESC')
+
+def _full_text_search(conn):
+    from search import setup_search
+    # Optional: without FTS5 / the unaccent extension search falls back to LIKE
+    return setup_search(conn)
+
+MIGRATIONS = [
+    Migration(1, 'events start_date/end_date columns', _event_date_columns, True),
+    Migration(2, 'backfill events start_date/end_date', _backfill_event_dates, False),
+    Migration(3, 'keyset pagination indexes', _keyset_indexes, False),
+    Migration(4, 'source/category + created_at indexes', _filter_sort_indexes, False),
+    Migration(5, 'full-text search', _full_text_search, True),
+    Migration(6, 'events start_date DESC NULLS LAST index', _start_date_desc_index, False),
+]
+
+def applied_versions(conn):
+    schema_version.create(conn, checkfirst=True)
+    return set(conn.execute(select(schema_version.c.version)).scalars())
+
+def _apply(conn, migration):
+    if migration.apply(conn) is False:
+        print(f"⚠ Migration {migration.version} not applied, will retry on next start")
+        return False
+    conn.execute(schema_version.insert().values(version=migration.version, name=migration.name))
+    return True
+
+def run_migrations():
+    """Apply pending migrations in order; returns the versions applied"""
+    applied = []
+    with engine.connect() as lock_conn:
+        if engine.dialect.name == 'postgresql':
+            # Another process (API, worker) may be starting at the same time
+            lock_conn.execute(text("SELECT pg_advisory_lock(:id)"), {'id': ADVISORY_LOCK_ID})
+            lock_conn.commit()
+        try:
+            with engine.begin() as conn:
+                done = applied_versions(conn)
+
+            for migration in MIGRATIONS:
+                if migration.version in done:
+                    continue
+
+                print(f"Applying migration {migration.version}: {migration.name}...")
+                if migration.transactional:
+                    with engine.begin() as conn:
+                        ok = _apply(conn, migration)
+                else:
+                    # Each migration of this kind is idempotent, so a crash part-way is safe to re-run
+                    with engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+                        ok = _apply(conn, migration)
+                if ok:
+                    applied.append(migration.version)
+        finally:
+            if engine.dialect.name == 'postgresql':
+                lock_conn.execute(text("SELECT pg_advisory_unlock(:id)"), {'id': ADVISORY_LOCK_ID})
+                lock_conn.commit()
+
+    if applied:
+        print(f"✓ Applied {len(applied)} migration(s): {applied}")
+    return applied
+
+if __name__ == "__main__":
+    from database import Base
+    Base.metadata.create_all(bind=engine)
+    run_migrations()
+    with engine.connect() as conn:
+        done = applied_versions(conn)
+    for migration in MIGRATIONS:
+        status = "✓" if migration.version in done else "✗"
+        print(f"  {status} {migration.version}: {migration.name}")
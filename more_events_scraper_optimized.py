@@ -5,6 +5,8 @@ URL: https://www.more.com/gr-en/tickets/
 """
 
 from scraper_base import BaseScraper
+from url_index import UrlIndex
+from date_parser import find_date
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -14,24 +16,24 @@ import time
 import config
 
 class MoreEventsScraperOptimized(BaseScraper):
-    def __init__(self, headless=False):
-        super().__init__(headless)
+    def __init__(self, headless=False, **kwargs):
+        super().__init__(headless, **kwargs)
         self.base_url = "https://www.more.com"
         self.events_url = "https://www.more.com/gr-en/tickets/"
-        self.scraped_urls = set()
+        self.scraped_urls = UrlIndex()
         self.progress_file = os.path.join(config.OUTPUT_DIR, 'more_events_progress.json')
         self.output_file = os.path.join(config.OUTPUT_DIR, 'more_events_optimized.json')
     
     def load_progress(self):
         """Load previously scraped events and URLs"""
         events = []
-        scraped_urls = set()
+        scraped_urls = UrlIndex()
         
         if os.path.exists(self.output_file):
             try:
                 with open(self.output_file, 'r', encoding='utf-8') as f:
                     events = json.load(f)
-                    scraped_urls = {event['url'] for event in events}
+                    scraped_urls = UrlIndex(event['url'] for event in events)
                 print(f"✓ Loaded {len(events)} previously scraped events")
             except:
                 print("⚠ Could not load previous progress")
@@ -60,127 +62,124 @@ class MoreEventsScraperOptimized(BaseScraper):
             pass
     
     def load_links(self):
-        """Load previously collected links"""
+        """Load previously collected links (as an ordered dict)"""
         if os.path.exists(self.progress_file):
             try:
                 with open(self.progress_file, 'r', encoding='utf-8') as f:
                     links = json.load(f)
                     print(f"✓ Loaded {len(links)} event links from previous session")
-                    return set(links)
+                    return dict.fromkeys(links)
             except:
                 pass
-        return set()
+        return {}
     
     def scrape_all_events(self, max_events=5000, resume=True):
-        """Scrape all events with resume capability"""
+        """
+        Scrape all events with resume capability
+        
+        Detail workers start on the first links while the listing is still
+        being scrolled.
+        """
         # Load previous progress
-        all_events, scraped_urls = self.load_progress() if resume else ([], set())
+        all_events, scraped_urls = self.load_progress() if resume else ([], UrlIndex())
         self.scraped_urls = scraped_urls
-        
-        # Try to load previously collected links
-        event_links = self.load_links() if resume else set()
-        
-        # If no links loaded, collect them
-        if not event_links:
-            self.setup_driver()
-            
-            try:
-                print(f"Navigating to {self.events_url}...")
-                self.driver.get(self.events_url)
-                time.sleep(5)
-                
-                print("\nCollecting event links...")
-                last_count = 0
-                no_change = 0
-                
-                for scroll in range(100):
-                    self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                    time.sleep(2)
-                    
-                    current_links = self.find_event_links()
-                    event_links.update(current_links)
-                    
-                    if len(event_links) == last_count:
-                        no_change += 1
-                        if no_change >= 5:
-                            break
-                    else:
-                        no_change = 0
-                        if scroll % 5 == 0:
-                            print(f"  Scroll {scroll + 1}: {len(event_links)} events found")
-                    
-                    last_count = len(event_links)
-                    
-                    if len(event_links) >= max_events:
-                        break
-                
-                self.save_links(event_links)
-                print(f"\n{'='*60}")
-                print(f"Total event links: {len(event_links)}")
-                print(f"{'='*60}")
-                
-                self.close()
-                
-            except Exception as e:
-                print(f"Error: {e}")
-                self.close()
-                return all_events
-        
-        # Filter remaining links
-        remaining_links = [link for link in event_links if link not in scraped_urls]
-        remaining_links = remaining_links[:max_events - len(all_events)]
+        remaining = max_events - len(all_events)
         
         print(f"\nAlready scraped: {len(all_events)}")
-        print(f"Remaining: {len(remaining_links)}")
         print(f"{'='*60}")
         
-        if not remaining_links:
+        if remaining <= 0:
             print("\n✓ All events already scraped!")
             return all_events
         
-        # Scrape remaining events
-        self.setup_driver()
+        # Try to load previously collected links
+        event_links = self.load_links() if resume else {}
+        
+        if event_links:
+            links = iter(event_links)
+        else:
+            # No saved links - discover them while scraping
+            self.setup_driver()
+            links = self.iter_event_links()
+        
+        def on_result(event):
+            self.save_event(event, all_events)
+            self.scraped_urls.add(event['url'])
         
         try:
             print(f"\nScraping events...\n")
+            self.run_pipeline(links, 'scrape_event', remaining,
+                              skip_urls=self.scraped_urls, on_result=on_result)
             
-            for idx, link in enumerate(remaining_links):
-                try:
-                    current_total = len(all_events) + 1
-                    print(f"[{current_total}/{len(event_links)}] {link.split('/')[-2][:40]}...")
-                    
-                    event = self.scrape_event(link)
-                    
-                    if event and event.get('title'):
-                        self.save_event(event, all_events)
-                        self.scraped_urls.add(link)
-                        print(f"  ✓ {event['title'][:50]}")
-                    else:
-                        print(f"  ✗ No data")
-                    
-                    time.sleep(0.5)
-                    
-                except KeyboardInterrupt:
-                    print(f"\n\n⚠ Interrupted! Progress saved: {len(all_events)} events")
-                    print(f"Run again to resume from event {len(all_events) + 1}")
-                    break
-                    
-                except Exception as e:
-                    print(f"  ✗ Error: {e}")
-                    continue
+        except KeyboardInterrupt:
+            print(f"\n\n⚠ Interrupted! Progress saved: {len(all_events)} events")
+            print(f"Run again to resume from event {len(all_events) + 1}")
             
-            print(f"\n{'='*60}")
-            print(f"Total: {len(all_events)} events")
-            print(f"{'='*60}")
+        except Exception as e:
+            print(f"Error: {e}")
             
         finally:
             self.close()
         
+        print(f"\n{'='*60}")
+        print(f"Total: {len(all_events)} events")
+        print(f"{'='*60}")
+        
         return all_events
     
+    def iter_event_links(self):
+        """Scroll the tickets listing, yielding new event links after every scroll"""
+        event_links = {}  # dict keeps discovery order
+        
+        print(f"Navigating to {self.events_url}...")
+        self.driver.get(self.events_url)
+        time.sleep(5)
+        
+        print("\nCollecting event links...")
+        last_count = 0
+        no_change = 0
+        self.start_discovery()
+        
+        try:
+            for scroll in range(100):
+                if self.is_cancelled():
+                    return
+                
+                self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+                time.sleep(2)
+                
+                current_links = self.find_event_links()
+                new_links = [link for link in current_links if link not in event_links]
+                event_links.update(dict.fromkeys(new_links))
+                yield from new_links
+                
+                if self.note_discovered(new_links):
+                    return
+                
+                if len(event_links) == last_count:
+                    no_change += 1
+                    if no_change >= 5:
+                        break
+                else:
+                    no_change = 0
+                    if scroll % 5 == 0:
+                        print(f"  Scroll {scroll + 1}: {len(event_links)} events found")
+                
+                last_count = len(event_links)
+            
+            self.finish_discovery()
+            
+        finally:
+            # A cancelled discovery is incomplete - don't resume from it
+            if event_links and not self.cancel_token.cancelled:
+                self.save_links(event_links)
+            print(f"\n{'='*60}")
+            print(f"Total event links: {len(event_links)}")
+            print(f"{'='*60}")
+    
     def find_event_links(self):
-        """Find all event links"""
-        links = set()
+        """Find all event links, in page order"""
+        links = {}
         
         try:
             selectors = [
@@ -203,18 +202,18 @@ class MoreEventsScraperOptimized(BaseScraper):
                             ('/tickets/' in href or '/event' in href) and
                             href != self.events_url and
                             not href.endswith('/tickets/')):
-                            links.add(href)
+                            links[href] = None
                 except:
                     continue
         except:
             pass
         
-        return links
+        return list(links)
     
     def scrape_event(self, url):
         """Scrape ONLY essential data from event"""
         try:
-            self.driver.get(url)
+            self.get_page(url)
             time.sleep(3)
             
             event = {'url': url}
@@ -254,24 +253,11 @@ class MoreEventsScraperOptimized(BaseScraper):
             # Method 2: If no date found, search in all text for date patterns
             if not date:
                 try:
-                    import re
+                    # Ranges like "17 Jan - 15 Feb 2026", "1 June 2026", Greek month names...
                     body_text = self.driver.find_element(By.TAG_NAME, 'body').text
-                    
-                    # Look for date patterns like "17 Jan - 15 Feb 2026" or "1 June 2026"
-                    date_patterns = [
-                        r'\d{1,2}\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+(?:-\s+\d{1,2}\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+)?\d{4}',
-                        r'\d{1,2}/\d{1,2}/\d{4}',
-                        r'\d{1,2}\.\d{1,2}\.\d{4}',
-                        r'\d{1,2}-\d{1,2}-\d{4}',
-                        r'(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{1,2},?\s+\d{4}',
-                        r'\d{1,2}\s+(?:Ιαν|Φεβ|Μαρ|Απρ|Μαΐ|Ιουν|Ιουλ|Αυγ|Σεπ|Οκτ|Νοε|Δεκ)[α-ωά-ώ]*\s+\d{4}'
-                    ]
-                    
-                    for pattern in date_patterns:
-                        matches = re.findall(pattern, body_text, re.IGNORECASE)
-                        if matches:
-                            date = matches[0]
-                            break
+                    parsed = find_date(body_text)
+                    if parsed:
+                        date = parsed.text
                 except:
                     pass
             
@@ -381,16 +367,7 @@ class MoreEventsScraperOptimized(BaseScraper):
     
     def find_text_by_selectors(self, selectors):
         """Try multiple selectors to find text"""
-        for selector in selectors:
-            try:
-                elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                for element in elements:
-                    text = element.text.strip()
-                    if text and len(text) > 1:
-                        return text
-            except:
-                continue
-        return None
+        return self.find_first_text(selectors, min_length=2)
 
 if __name__ == "__main__":
     print("More.com Events Scraper (Optimized & Resumable)")
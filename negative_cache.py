@@ -0,0 +1,122 @@
+"""
+Negative cache for pages that yield no data
+Category hubs, tag pages and blog indexes caught by the link selectors are
+remembered by canonical URL so discovery stops loading them on every run
+"""
+import json
+import os
+import random
+import threading
+import time
+from typing import Optional
+
+import config
+from url_index import canonicalize_url
+
+class NegativeCache:
+    """Canonical URLs that produced no data, with failure reason and TTL"""
+    
+    # A single failure may be a timeout; only skip pages that failed repeatedly
+    MIN_FAILURES = 2
+    
+    def __init__(self, path: Optional[str] = None, ttl_days: float = config.NEGATIVE_CACHE_TTL_DAYS,
+                 recheck_fraction: float = config.NEGATIVE_CACHE_RECHECK):
+        self.path = path or os.path.join(config.OUTPUT_DIR, 'negative_cache.json')
+        self.ttl = ttl_days * 86400
+        self.recheck_fraction = recheck_fraction
+        self.entries = {}
+        self.skipped = 0
+        self.rechecked = 0
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.load()
+    
+    def load(self):
+        """Load entries from disk, dropping expired ones"""
+        if not os.path.exists(self.path):
+            return
+        
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            print("⚠ Could not load negative cache")
+            return
+        
+        now = time.time()
+        self.entries = {
+            url: entry for url, entry in entries.items()
+            if now - entry.get('last_checked', 0) < self.ttl
+        }
+        self._dirty = len(self.entries) != len(entries)
+    
+    def should_skip(self, url: str) -> bool:
+        """
+        True if the URL recently produced no data
+        
+        A random recheck_fraction of cached URLs is let through so pages
+        that start producing data are picked up again.
+        """
+        url = canonicalize_url(url)
+        with self._lock:
+            entry = self.entries.get(url)
+            if not entry or entry['failures'] < self.MIN_FAILURES:
+                return False
+            
+            if time.time() - entry['last_checked'] >= self.ttl:
+                del self.entries[url]
+                self._dirty = True
+                return False
+            
+            if random.random() < self.recheck_fraction:
+                self.rechecked += 1
+                return False
+            
+            self.skipped += 1
+            return True
+    
+    def record(self, url: str, reason: str):
+        """Remember that a URL produced no data"""
+        url = canonicalize_url(url)
+        now = time.time()
+        with self._lock:
+            entry = self.entries.get(url)
+            if entry:
+                entry['failures'] += 1
+                entry['last_checked'] = now
+                entry['reason'] = reason
+            else:
+                self.entries[url] = {
+                    'reason': reason,
+                    'failures': 1,
+                    'first_seen': now,
+                    'last_checked': now
+                }
+            self._dirty = True
+    
+    def clear(self, url: str):
+        """Forget a URL that produced data again"""
+        url = canonicalize_url(url)
+        with self._lock:
+            if self.entries.pop(url, None) is not None:
+                self._dirty = True
+    
+    def save(self):
+        """Write entries atomically if anything changed"""
+        with self._lock:
+            if not self._dirty:
+                return
+            entries = dict(self.entries)
+            self._dirty = False
+        
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entries, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"⚠ Could not save negative cache: {e}")
+    
+    def __len__(self):
+        return len(self.entries)
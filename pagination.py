@@ -0,0 +1,78 @@
+"""
+Keyset (cursor) pagination for the list endpoints
+A cursor is the sort key of the last row on a page; the next page starts
+strictly after it, so every page is one index range scan however deep it is
+Rows whose leading key is NULL (undated events) sort last in both
+directions, ordered by id among themselves.
+"""
+import base64
+import json
+from datetime import date, datetime
+
+from sqlalchemy import and_, or_, tuple_
+
+# Sort name -> (attribute names, value type of the leading column, descending,
+#               whether the leading column may be NULL)
+KEYSETS = {
+    'newest': (('created_at', 'id'), datetime, True, False),
+    'start_date': (('start_date', 'id'), date, False, True),
+    '-start_date': (('start_date', 'id'), date, True, True),
+}
+
+class InvalidCursor(ValueError):
+    """Cursor is malformed or belongs to a different sort order"""
+
+def encode_cursor(sort, item):
+    """Opaque token for the row after which the next page starts"""
+    names = KEYSETS[sort][0]
+    values = [getattr(item, name) for name in names]
+    payload = [sort, values[0].isoformat() if values[0] is not None else None] + values[1:]
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode()).decode().rstrip('=')
+
+def decode_cursor(sort, token):
+    """Token -> sort key values; raises InvalidCursor"""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        cursor_sort, leading, *rest = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError):
+        raise InvalidCursor("Malformed cursor")
+
+    if cursor_sort != sort:
+        raise InvalidCursor(f"Cursor was issued for sort={cursor_sort}, not sort={sort}")
+
+    names, value_type, _, nullable = KEYSETS[sort]
+    if (leading is None and not nullable) or len(rest) != len(names) - 1:
+        raise InvalidCursor("Malformed cursor")
+    if leading is None:
+        return [None] + rest
+    try:
+        return [value_type.fromisoformat(leading)] + rest
+    except (ValueError, TypeError):
+        raise InvalidCursor("Malformed cursor")
+
+def order_by_keyset(query, model, sort):
+    """Order a query by the sort's key columns (matching their composite index)"""
+    names, _, descending, nullable = KEYSETS[sort]
+    columns = [getattr(model, name) for name in names]
+    order = [c.desc() if descending else c.asc() for c in columns]
+    if nullable:
+        order[0] = order[0].nulls_last()
+    return query.order_by(*order)
+
+def after_cursor(query, model, sort, token):
+    """Restrict a keyset-ordered query to rows after the cursor"""
+    names, _, descending, nullable = KEYSETS[sort]
+    columns = [getattr(model, name) for name in names]
+    values = decode_cursor(sort, token)
+
+    if values[0] is None:
+        # Already in the NULL tail: only undated rows further along remain
+        rest = tuple_(*columns[1:]) < tuple_(*values[1:]) if descending else tuple_(*columns[1:]) > tuple_(*values[1:])
+        return query.filter(and_(columns[0].is_(None), rest))
+
+    key, after = tuple_(*columns), tuple_(*values)
+    condition = key < after if descending else key > after
+    if nullable:
+        # The tuple comparison is NULL for undated rows, which all come later
+        condition = or_(condition, columns[0].is_(None))
+    return query.filter(condition)
@@ -4,6 +4,7 @@ URL: https://pigolampides.gr/blog/
 """
 
 from scraper_base import BaseScraper
+from url_index import UrlIndex
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -13,95 +14,30 @@ import time
 import config
 
 class PigolampidesScraper(BaseScraper):
-    def __init__(self, headless=False):
-        super().__init__(headless)
+    def __init__(self, headless=False, **kwargs):
+        super().__init__(headless, **kwargs)
         self.base_url = "https://pigolampides.gr"
         self.blog_url = "https://pigolampides.gr/blog/"
-        self.scraped_urls = set()
+        self.scraped_urls = UrlIndex()
     
     def scrape_all_posts(self, max_posts=200):
         """
         Scrape all blog posts from Pigolampides
+        
+        Posts are scraped by detail workers while the blog listing is still
+        being scrolled.
         """
         self.setup_driver()
         all_posts = []
-        post_links = set()
         
         try:
-            print(f"Navigating to {self.blog_url}...")
-            self.driver.get(self.blog_url)
-            time.sleep(4)
-            
-            # Scroll and load all posts
-            print("\nLoading all blog posts...")
-            last_count = 0
-            no_change = 0
-            
-            for scroll in range(50):
-                # Scroll down
-                self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(2)
-                
-                # Collect post links
-                current_links = self.find_post_links()
-                post_links.update(current_links)
-                
-                if len(post_links) == last_count:
-                    no_change += 1
-                    if no_change >= 3:
-                        print(f"  No new posts after {no_change} scrolls")
-                        break
-                else:
-                    no_change = 0
-                    print(f"  Scroll {scroll + 1}: {len(post_links)} posts found")
-                
-                last_count = len(post_links)
-                
-                if len(post_links) >= max_posts:
-                    break
-                
-                # Try to click "Load More" or pagination
-                try:
-                    load_more = self.driver.find_element(By.CSS_SELECTOR, 
-                        'button, a[class*="load"], [class*="more"], .pagination a')
-                    
-                    if load_more.is_displayed():
-                        print(f"  Clicking: {load_more.text}")
-                        load_more.click()
-                        time.sleep(2)
-                except:
-                    pass
-            
-            print(f"\n{'='*60}")
-            print(f"Total post links collected: {len(post_links)}")
-            print(f"{'='*60}")
-            
-            # Limit to max_posts
-            post_links = list(post_links)[:max_posts]
-            
-            # Scrape each post
-            print(f"\nScraping {len(post_links)} blog posts...\n")
-            
-            for idx, link in enumerate(post_links):
-                if link in self.scraped_urls:
-                    continue
-                
-                try:
-                    print(f"[{idx + 1}/{len(post_links)}] {link.split('/')[-2][:50]}...")
-                    post = self.scrape_post(link)
-                    
-                    if post and post.get('title'):
-                        all_posts.append(post)
-                        self.scraped_urls.add(link)
-                        print(f"  ✓ {post['title'][:60]}")
-                    else:
-                        print(f"  ✗ No data extracted")
-                    
-                    time.sleep(0.5)
-                    
-                except Exception as e:
-                    print(f"  ✗ Error: {e}")
-                    continue
+            all_posts = self.run_pipeline(
+                self.iter_post_links(),
+                'scrape_post',
+                max_posts,
+                skip_urls=self.scraped_urls,
+                on_result=lambda post: self.scraped_urls.add(post['url'])
+            )
             
             print(f"\n{'='*60}")
             print(f"Successfully scraped {len(all_posts)} posts")
@@ -117,9 +53,69 @@ class PigolampidesScraper(BaseScraper):
         
         return all_posts
     
+    def iter_post_links(self):
+        """Scroll the blog listing, yielding new post links after every scroll"""
+        post_links = {}  # dict keeps discovery order
+        
+        print(f"Navigating to {self.blog_url}...")
+        self.driver.get(self.blog_url)
+        time.sleep(4)
+        
+        # Scroll and load all posts
+        print("\nLoading all blog posts...")
+        last_count = 0
+        no_change = 0
+        self.start_discovery()
+        
+        for scroll in range(50):
+            if self.is_cancelled():
+                return
+            
+            # Scroll down
+            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            time.sleep(2)
+            
+            # Collect post links
+            current_links = self.find_post_links()
+            new_links = [link for link in current_links if link not in post_links]
+            post_links.update(dict.fromkeys(new_links))
+            yield from new_links
+            
+            if self.note_discovered(new_links):
+                return
+            
+            if len(post_links) == last_count:
+                no_change += 1
+                if no_change >= 3:
+                    print(f"  No new posts after {no_change} scrolls")
+                    break
+            else:
+                no_change = 0
+                print(f"  Scroll {scroll + 1}: {len(post_links)} posts found")
+            
+            last_count = len(post_links)
+            
+            # Try to click "Load More" or pagination
+            try:
+                load_more = self.driver.find_element(By.CSS_SELECTOR, 
+                    'button, a[class*="load"], [class*="more"], .pagination a')
+                
+                if load_more.is_displayed():
+                    print(f"  Clicking: {load_more.text}")
+                    load_more.click()
+                    time.sleep(2)
+            except:
+                pass
+        
+        self.finish_discovery()
+        
+        print(f"\n{'='*60}")
+        print(f"Total post links collected: {len(post_links)}")
+        print(f"{'='*60}")
+    
     def find_post_links(self):
-        """Find all blog post links on current page"""
-        links = set()
+        """Find all blog post links on current page, in page order"""
+        links = {}
         
         try:
             # Try multiple selectors for blog posts
@@ -145,19 +141,19 @@ class PigolampidesScraper(BaseScraper):
                             '/blog/' in href and
                             href != self.blog_url and
                             not href.endswith('/blog/')):
-                            links.add(href)
+                            links[href] = None
                 except:
                     continue
         
         except Exception as e:
             print(f"Error finding links: {e}")
         
-        return links
+        return list(links)
     
     def scrape_post(self, url):
         """Scrape a single blog post"""
         try:
-            self.driver.get(url)
+            self.get_page(url)
             time.sleep(3)
             
             post = {'url': url}
@@ -260,16 +256,7 @@ class PigolampidesScraper(BaseScraper):
     
     def find_text_by_selectors(self, selectors):
         """Try multiple selectors to find text"""
-        for selector in selectors:
-            try:
-                elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                for element in elements:
-                    text = element.text.strip()
-                    if text and len(text) > 1:
-                        return text
-            except:
-                continue
-        return None
+        return self.find_first_text(selectors, min_length=2)
     
     def save_posts(self, posts, filename='pigolampides_blog_posts.json'):
         """Save posts to JSON"""
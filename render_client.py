@@ -0,0 +1,118 @@
+"""
+Client for the render service
+RemoteDriver leases a browser session from render_service.py and exposes
+the same Selenium-compatible surface as the local drivers
+"""
+import requests
+from selenium.common.exceptions import (
+    JavascriptException,
+    StaleElementReferenceException,
+    TimeoutException,
+    WebDriverException,
+)
+
+import config
+from cdp_driver import ScriptDriver
+
+# Priority lanes, highest first
+LANES = ('interactive', 'scheduled', 'bulk')
+
+ERROR_TYPES = {
+    'stale': StaleElementReferenceException,
+    'javascript': JavascriptException,
+    'timeout': TimeoutException,
+}
+
+class RenderServiceError(WebDriverException):
+    """The render service was unreachable, busy or lost the session"""
+
+def _check(response):
+    """Raise for transport-level and command errors, return the JSON body"""
+    if response.status_code == 503:
+        raise RenderServiceError(f"Render service busy: {response.json().get('detail')}")
+    if response.status_code == 404:
+        raise RenderServiceError("Render session expired")
+    if response.status_code >= 400:
+        raise RenderServiceError(f"Render service error {response.status_code}: {response.text[:200]}")
+
+    data = response.json()
+    if data.get('error'):
+        raise ERROR_TYPES.get(data.get('error_type'), WebDriverException)(data['error'])
+    return data
+
+def render(url, lane='interactive', script=None, args=(), wait_selector=None,
+           base_url=None, timeout=120):
+    """
+    One-shot render: load a URL on a pooled browser and return
+    {'url', 'title', 'html'} or, when a script is given, {'url', 'title', 'result'}
+    """
+    base_url = base_url or config.RENDER_SERVICE_URL
+    try:
+        response = requests.post(f"{base_url}/render", json={
+            'url': url,
+            'lane': lane,
+            'script': script,
+            'args': list(args),
+            'wait_selector': wait_selector,
+        }, timeout=config.RENDER_ACQUIRE_TIMEOUT + timeout)
+    except requests.RequestException as e:
+        raise RenderServiceError(f"Render service unreachable: {e}")
+    return _check(response)
+
+def pool_size(base_url=None):
+    """Number of browsers in the service's pool, or None if it can't be asked"""
+    base_url = (base_url or config.RENDER_SERVICE_URL).rstrip('/')
+    try:
+        response = requests.get(f"{base_url}/health", timeout=10)
+        return int(response.json()['pool']['size'])
+    except (requests.RequestException, ValueError, KeyError, TypeError):
+        return None
+
+class RemoteDriver(ScriptDriver):
+    """A browser session held on the render service for the driver's lifetime"""
+
+    def __init__(self, base_url=None, lane='scheduled', timeout=120):
+        self.base_url = (base_url or config.RENDER_SERVICE_URL).rstrip('/')
+        self.lane = lane
+        self.timeout = timeout
+        self.browser_pid = None
+        self.session_id = None
+        self._http = requests.Session()
+
+        # Blocks until the service hands us a browser (or gives up)
+        data = self._call('post', '/sessions', {'lane': lane},
+                          timeout=config.RENDER_ACQUIRE_TIMEOUT + 30)
+        self.session_id = data['session_id']
+
+    def _call(self, method, path, payload=None, timeout=None):
+        try:
+            response = self._http.request(method, f"{self.base_url}{path}", json=payload,
+                                          timeout=timeout or self.timeout)
+        except requests.RequestException as e:
+            raise RenderServiceError(f"Render service unreachable: {e}")
+        return _check(response)
+
+    def _session_call(self, action, payload=None):
+        return self._call('post', f'/sessions/{self.session_id}/{action}', payload)
+
+    def get(self, url):
+        self._session_call('navigate', {'url': url})
+
+    def _evaluate(self, expression):
+        return self._session_call('evaluate', {'expression': expression}).get('value')
+
+    def execute_cdp_cmd(self, cmd, cmd_args=None):
+        return self._session_call('cdp', {'cmd': cmd, 'params': cmd_args or {}}).get('result', {})
+
+    def wait_for_network_idle(self, idle_time=0.5, timeout=10):
+        return self._session_call('idle', {'idle_time': idle_time, 'timeout': timeout}).get('idle', True)
+
+    def quit(self):
+        """Hand the browser back to the pool (safe to call from another thread)"""
+        if self.session_id:
+            try:
+                requests.delete(f"{self.base_url}/sessions/{self.session_id}", timeout=10)
+            except requests.RequestException:
+                pass
+            self.session_id = None
+        self._http.close()
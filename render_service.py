@@ -0,0 +1,354 @@
+"""
+Render service
+Standalone process that owns the browser pool. The API, scheduler and
+CLI point RENDER_SERVICE_URL at it instead of launching their own
+browsers, so browser memory and CPU are capped in one place and kept
+away from API latency.
+
+Run with: python render_service.py
+"""
+import heapq
+import itertools
+import threading
+import time
+import uuid
+from typing import Any, List, Optional
+
+import uvicorn
+from fastapi import FastAPI, HTTPException
+from pydantic import BaseModel
+from selenium.common.exceptions import (
+    JavascriptException,
+    StaleElementReferenceException,
+    TimeoutException,
+)
+from selenium.webdriver.common.by import By
+
+import config
+from cdp_driver import evaluate
+from render_client import LANES
+from scraper_base import BaseScraper, browser_tracker
+
+class PoolBusy(Exception):
+    """No browser became free in time, or too many callers are waiting"""
+
+class BrowserPool:
+    """
+    Fixed set of browsers handed out by priority lane, FIFO within a lane
+
+    Browsers are BaseScraper instances, so they get the same lean flags,
+    profiles and page/memory-based recycling as in-process scrapers.
+    """
+
+    def __init__(self, size=config.RENDER_POOL_SIZE, max_queue=config.RENDER_MAX_QUEUE):
+        self.size = size
+        self.max_queue = max_queue
+        self.browsers = [
+            BaseScraper(headless=True, profile_slot=slot, render_service_url='')
+            for slot in range(size)
+        ]
+        self._idle = list(self.browsers)
+        self._waiting = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self.served = {lane: 0 for lane in LANES}
+
+    def acquire(self, lane, timeout=config.RENDER_ACQUIRE_TIMEOUT):
+        """Block until a browser is free and this caller is first in line"""
+        if lane not in LANES:
+            raise ValueError(f"Unknown lane: {lane}")
+
+        with self._cond:
+            if len(self._waiting) >= self.max_queue:
+                raise PoolBusy(f"{len(self._waiting)} requests already queued")
+
+            ticket = (LANES.index(lane), next(self._seq))
+            heapq.heappush(self._waiting, ticket)
+            deadline = time.monotonic() + timeout
+            try:
+                while not (self._idle and self._waiting[0] == ticket):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise PoolBusy(f"No browser free after {timeout}s")
+                    self._cond.wait(remaining)
+                heapq.heappop(self._waiting)
+                self.served[lane] += 1
+                return self._idle.pop()
+            finally:
+                if ticket in self._waiting:
+                    self._waiting.remove(ticket)
+                    heapq.heapify(self._waiting)
+                self._cond.notify_all()
+
+    def release(self, browser, broken=False):
+        """
+        Return a browser with its tabs, cookies and storage reset; broken
+        ones are closed and restart on next use
+        """
+        if not broken:
+            try:
+                browser.reset_browser_state()
+            except Exception as e:
+                print(f"⚠ Error resetting browser, restarting it: {e}")
+                broken = True
+        if broken:
+            try:
+                browser.close()
+            except Exception as e:
+                print(f"⚠ Error closing browser: {e}")
+        with self._cond:
+            self._idle.append(browser)
+            self._cond.notify_all()
+
+    def status(self):
+        with self._cond:
+            waiting = {lane: 0 for lane in LANES}
+            for rank, _ in self._waiting:
+                waiting[LANES[rank]] += 1
+            return {
+                'size': self.size,
+                'idle': len(self._idle),
+                'waiting': waiting,
+                'served': dict(self.served),
+                'memory_mb': {
+                    b.profile_slot: round(b.driver_memory_mb() or 0) for b in self.browsers if b.driver
+                },
+            }
+
+    def close(self):
+        for browser in self.browsers:
+            try:
+                browser.close()
+            except Exception:
+                pass
+
+class Session:
+    """A browser leased to one remote driver"""
+
+    def __init__(self, browser, lane):
+        self.id = uuid.uuid4().hex
+        self.browser = browser
+        self.lane = lane
+        self.lock = threading.Lock()
+        self.last_used = time.monotonic()
+
+class SessionManager:
+    """Leased sessions, reclaimed when their client stops using them"""
+
+    def __init__(self, pool, idle_timeout=config.RENDER_SESSION_IDLE_TIMEOUT):
+        self.pool = pool
+        self.idle_timeout = idle_timeout
+        self.sessions = {}
+        self._lock = threading.Lock()
+        self._reaper = threading.Thread(target=self._reap_loop, daemon=True)
+        self._reaper.start()
+
+    def open(self, lane):
+        browser = self.pool.acquire(lane)
+        session = Session(browser, lane)
+        with self._lock:
+            self.sessions[session.id] = session
+        return session
+
+    def get(self, session_id):
+        with self._lock:
+            session = self.sessions.get(session_id)
+        if session is None:
+            raise HTTPException(status_code=404, detail="Unknown or expired session")
+        return session
+
+    def close(self, session_id):
+        """End a session, hard-killing its browser if a command is still running"""
+        with self._lock:
+            session = self.sessions.pop(session_id, None)
+        if session is None:
+            return False
+
+        broken = False
+        if not session.lock.acquire(timeout=1):
+            # Unblock the in-flight command, then wait for it to fail out
+            session.browser.kill_browser()
+            session.lock.acquire()
+            broken = True
+        try:
+            self.pool.release(session.browser, broken=broken)
+        finally:
+            session.lock.release()
+        return True
+
+    def _reap_loop(self):
+        while True:
+            time.sleep(30)
+            now = time.monotonic()
+            with self._lock:
+                expired = [s.id for s in self.sessions.values()
+                           if not s.lock.locked() and now - s.last_used > self.idle_timeout]
+            for session_id in expired:
+                print(f"Reclaiming idle render session {session_id}")
+                self.close(session_id)
+
+    def run(self, session_id, command):
+        """Run a command against a session's browser, one at a time"""
+        session = self.get(session_id)
+        with session.lock:
+            if session.id not in self.sessions:
+                raise HTTPException(status_code=404, detail="Session closed")
+            try:
+                return command(session.browser)
+            finally:
+                session.last_used = time.monotonic()
+
+def run_command(command):
+    """Turn browser errors into a JSON error body the client re-raises"""
+    try:
+        return command()
+    except StaleElementReferenceException as e:
+        return {'error': str(e), 'error_type': 'stale'}
+    except JavascriptException as e:
+        return {'error': str(e), 'error_type': 'javascript'}
+    except TimeoutException as e:
+        return {'error': str(e), 'error_type': 'timeout'}
+    except Exception as e:
+        return {'error': str(e), 'error_type': 'webdriver'}
+
+# Request models
+class RenderRequest(BaseModel):
+    url: str
+    lane: str = 'interactive'
+    wait_selector: Optional[str] = None
+    script: Optional[str] = None
+    args: List[Any] = []
+
+class SessionRequest(BaseModel):
+    lane: str = 'scheduled'
+
+class NavigateRequest(BaseModel):
+    url: str
+
+class EvaluateRequest(BaseModel):
+    expression: str
+
+class CdpRequest(BaseModel):
+    cmd: str
+    params: dict = {}
+
+class IdleRequest(BaseModel):
+    idle_time: float = 0.5
+    timeout: float = 10
+
+app = FastAPI(title="Render Service", version="1.0.0")
+pool = None
+sessions = None
+
+@app.on_event("startup")
+def startup_event():
+    global pool, sessions
+    browser_tracker.reap_orphans()
+    pool = BrowserPool()
+    sessions = SessionManager(pool)
+    print(f"✓ Render service ready with {pool.size} browsers")
+    if pool.size < 1 + config.DETAIL_WORKERS:
+        print(f"⚠ RENDER_POOL_SIZE={pool.size} is below one scrape's {1 + config.DETAIL_WORKERS} "
+              f"browsers (1 + DETAIL_WORKERS); clients will use fewer detail workers")
+
+@app.on_event("shutdown")
+def shutdown_event():
+    pool.close()
+    browser_tracker.kill_all()
+
+def _acquire(lane):
+    try:
+        return pool.acquire(lane)
+    except PoolBusy as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.post("/render")
+def render(request: RenderRequest):
+    """Load a URL on a pooled browser and return its HTML or a script result"""
+    browser = _acquire(request.lane)
+    broken = False
+    try:
+        def load():
+            browser.get_page(request.url)
+            if request.wait_selector:
+                browser.wait_for_element(By.CSS_SELECTOR, request.wait_selector)
+            browser.wait_for_network_idle()
+            data = {'url': browser.driver.current_url, 'title': browser.driver.title}
+            if request.script:
+                data['result'] = browser.driver.execute_script(request.script, *request.args)
+            else:
+                data['html'] = browser.driver.page_source
+            return data
+
+        data = run_command(load)
+        broken = data.get('error_type') == 'webdriver'
+        return data
+    finally:
+        pool.release(browser, broken=broken)
+
+@app.post("/sessions")
+def open_session(request: SessionRequest):
+    """Lease a browser for a stateful scrape (clicks, scrolling, several pages)"""
+    if request.lane not in LANES:
+        raise HTTPException(status_code=400, detail=f"Unknown lane: {request.lane}")
+    try:
+        session = sessions.open(request.lane)
+    except PoolBusy as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    return {'session_id': session.id}
+
+@app.delete("/sessions/{session_id}")
+def close_session(session_id: str):
+    return {'closed': sessions.close(session_id)}
+
+@app.post("/sessions/{session_id}/navigate")
+def navigate(session_id: str, request: NavigateRequest):
+    def command(browser):
+        def load():
+            browser.get_page(request.url)
+            return {'url': request.url}
+        return run_command(load)
+    return sessions.run(session_id, command)
+
+@app.post("/sessions/{session_id}/evaluate")
+def evaluate_script(session_id: str, request: EvaluateRequest):
+    def command(browser):
+        if browser.driver is None:
+            browser.setup_driver()
+        return run_command(lambda: {'value': evaluate(browser.driver, request.expression)})
+    return sessions.run(session_id, command)
+
+@app.post("/sessions/{session_id}/cdp")
+def cdp_command(session_id: str, request: CdpRequest):
+    def command(browser):
+        if browser.driver is None:
+            browser.setup_driver()
+        return run_command(lambda: {'result': browser.driver.execute_cdp_cmd(request.cmd, request.params)})
+    return sessions.run(session_id, command)
+
+@app.post("/sessions/{session_id}/idle")
+def network_idle(session_id: str, request: IdleRequest):
+    def command(browser):
+        return run_command(lambda: {'idle': browser.wait_for_network_idle(request.idle_time, request.timeout)})
+    return sessions.run(session_id, command)
+
+@app.get("/health")
+def health():
+    return {
+        'status': 'ok',
+        'pool': pool.status(),
+        'sessions': len(sessions.sessions),
+    }
+
+if __name__ == "__main__":
+    print("="*60)
+    print("Starting Render Service")
+    print("="*60)
+    print(f"Host: {config.RENDER_SERVICE_HOST}")
+    print(f"Port: {config.RENDER_SERVICE_PORT}")
+    print(f"Browsers: {config.RENDER_POOL_SIZE}")
+    print("="*60)
+
+    uvicorn.run(app, host=config.RENDER_SERVICE_HOST, port=config.RENDER_SERVICE_PORT, log_level="info")
@@ -0,0 +1,101 @@
+"""
+In-process cache of serialized API responses
+Data only changes when a scrape run commits, so entries are keyed by the
+endpoint's normalized parameters and tagged with the data generation
+(stats.current_generation); a new generation makes every entry stale.
+Each entry carries a strong ETag so polling clients get 304s.
+"""
+import gzip
+import json
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from datetime import date, datetime
+from hashlib import blake2b
+
+import config
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# gzipped is the precompressed body, or None for bodies under RESPONSE_GZIP_MIN_SIZE
+CachedResponse = namedtuple('CachedResponse', ['body', 'gzipped', 'etag', 'headers', 'generation', 'expires'])
+
+def _json_default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+def to_json(value) -> bytes:
+    """Compact UTF-8 JSON (orjson when installed; dates as ISO 8601 either way)"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(value)
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'), default=_json_default).encode('utf-8')
+
+def make_etag(body: bytes) -> str:
+    """Strong ETag: a hash of the exact response bytes"""
+    return '"' + blake2b(body, digest_size=16).hexdigest() + '"'
+
+def etag_matches(if_none_match, etag):
+    """If-None-Match check (weak comparison, as RFC 9110 specifies for it)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+class ResponseCache:
+    """LRU of serialized responses with a TTL and generation check"""
+
+    def __init__(self, max_entries=config.RESPONSE_CACHE_SIZE, ttl=config.RESPONSE_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, generation):
+        """Entry for key if it is from this generation and not expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.generation != generation or entry.expires < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, generation, body, headers=None):
+        gzipped = None
+        if len(body) >= config.RESPONSE_GZIP_MIN_SIZE:
+            gzipped = gzip.compress(body, compresslevel=6, mtime=0)
+        entry = CachedResponse(body, gzipped, make_etag(body), dict(headers or {}), generation,
+                               time.monotonic() + self.ttl)
+        if self.max_entries <= 0:
+            return entry
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def status(self):
+        with self._lock:
+            return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses}
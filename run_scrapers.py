@@ -3,6 +3,7 @@ Script to manually run all scrapers and save to database
 """
 from scraper_manager import ScraperManager
 from database import SessionLocal, init_db
+from scraper_base import browser_tracker
 import argparse
 
 def main():
@@ -21,12 +22,16 @@ def main():
     # Initialize database
     init_db()
     
+    # Kill browsers left behind by a previous run
+    browser_tracker.reap_orphans()
+    
     # Create database session
     db = SessionLocal()
     
+    manager = ScraperManager(db, render_lane='bulk')
+    
     try:
         # Run scrapers
-        manager = ScraperManager(db)
         results = manager.run_all_scrapers(
             headless=args.headless,
             max_events_per_source=args.max_events
@@ -42,7 +47,12 @@ def main():
             print(f"  {source}: {count}")
         print("="*60)
         
+    except KeyboardInterrupt:
+        print("\n⚠ Interrupted, stopping scrapers...")
+        manager.cancel_token.cancel('interrupted')
+        
     finally:
+        browser_tracker.kill_all()
         db.close()
 
 if __name__ == "__main__":
@@ -7,6 +7,7 @@ from apscheduler.triggers.cron import CronTrigger
 from datetime import datetime
 import logging
 from scraper_manager import ScraperManager
+from scraper_base import CancellationToken, browser_tracker
 from database import SessionLocal, init_db
 import os
 
@@ -23,6 +24,7 @@ class ScraperScheduler:
     def __init__(self):
         self.scheduler = BackgroundScheduler()
         self.is_running = False
+        self.current_token = None
         
     def scrape_job(self):
         """Job that runs the scrapers"""
@@ -31,9 +33,10 @@ class ScraperScheduler:
         logger.info("="*60)
         
         db = SessionLocal()
+        self.current_token = CancellationToken()
         
         try:
-            manager = ScraperManager(db)
+            manager = ScraperManager(db, cancel_token=self.current_token, render_lane='scheduled')
             
             # Get max events from environment or default
             max_events = int(os.getenv('SCRAPER_MAX_EVENTS', 100))
@@ -52,6 +55,7 @@ class ScraperScheduler:
             logger.error(f"Error in scraping job: {e}", exc_info=True)
         
         finally:
+            self.current_token = None
             db.close()
     
     def start(self):
@@ -63,6 +67,9 @@ class ScraperScheduler:
         # Initialize database
         init_db()
         
+        # Kill browsers left behind by a previous process
+        browser_tracker.reap_orphans()
+        
         # Get schedule from environment or use defaults
         schedule_type = os.getenv('SCRAPER_SCHEDULE', 'daily')
         
@@ -132,11 +139,17 @@ class ScraperScheduler:
         logger.info("Scheduler started successfully")
     
     def stop(self):
-        """Stop the scheduler"""
+        """Stop the scheduler and any scrape it is running"""
+        if self.current_token:
+            logger.info("Cancelling running scrape job")
+            self.current_token.cancel('scheduler stopped')
+        
         if self.scheduler.running:
-            self.scheduler.shutdown()
+            self.scheduler.shutdown(wait=False)
             self.is_running = False
             logger.info("Scheduler stopped")
+        
+        browser_tracker.kill_all()
     
     def get_jobs(self):
         """Get list of scheduled jobs"""
@@ -4,8 +4,19 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+import atexit
+import json
+import os
+import queue
+import shutil
+import threading
 import time
+from urllib.parse import urlsplit
 import config
+from url_index import UrlIndex, canonicalize_url
+from negative_cache import NegativeCache
+from cdp_driver import CDPDriver
+from render_client import RemoteDriver, pool_size
 
 try:
     from webdriver_manager.chrome import ChromeDriverManager
@@ -13,15 +24,459 @@ try:
 except:
     WEBDRIVER_MANAGER_AVAILABLE = False
 
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+# URL patterns (Network.setBlockedURLs wildcard syntax) per blockable resource type
+RESOURCE_TYPE_PATTERNS = {
+    'image': ['*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.avif', '*.svg', '*.ico', '*.bmp'],
+    'font': ['*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot'],
+    'media': ['*.mp4', '*.webm', '*.mp3', '*.ogg', '*.wav', '*.m3u8', '*.mov'],
+    'stylesheet': ['*.css'],
+}
+
+# Third-party analytics, ads and widgets that never carry event data
+TRACKER_PATTERNS = [
+    '*google-analytics.com*',
+    '*googletagmanager.com*',
+    '*googlesyndication.com*',
+    '*googleadservices.com*',
+    '*doubleclick.net*',
+    '*adservice.google.*',
+    '*connect.facebook.net*',
+    '*facebook.com/tr*',
+    '*hotjar.com*',
+    '*clarity.ms*',
+    '*analytics.tiktok.com*',
+    '*snap.licdn.com*',
+    '*cookiebot.com*',
+    '*onesignal.com*',
+    '*youtube.com/embed*',
+    '*player.vimeo.com*',
+]
+
+# First non-empty visible text among several selectors, in selector order
+FIRST_TEXT_SCRIPT = """
+const [selectors, minLength] = arguments;
+for (const selector of selectors) {
+  let elements;
+  try { elements = document.querySelectorAll(selector); } catch (e) { continue; }
+  for (const el of elements) {
+    if (!el.getClientRects().length) continue;
+    const text = (el.innerText || '').trim();
+    if (text.length >= minLength) return text;
+  }
+}
+return null;
+"""
+
+def _pid_alive(pid):
+    """Check whether a process with this pid is still running"""
+    if PSUTIL_AVAILABLE:
+        return psutil.pid_exists(pid)
+    if os.name == 'nt':
+        # os.kill() terminates processes on Windows; assume the owner is alive
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except OSError:
+        return False
+    return True
+
+class CancellationToken:
+    """
+    Cooperative cancellation flag checked by scrapers between pages
+    
+    A token is cancelled explicitly, when its optional timeout passes, or
+    when its parent token is cancelled.
+    """
+    
+    def __init__(self, timeout=None, parent=None):
+        self._event = threading.Event()
+        self.deadline = time.monotonic() + timeout if timeout else None
+        self.parent = parent
+        self.reason = None
+    
+    def cancel(self, reason='cancelled'):
+        """Ask every scraper holding this token to stop"""
+        if not self._event.is_set():
+            self.reason = reason
+            self._event.set()
+    
+    @property
+    def cancelled(self):
+        if self._event.is_set():
+            return True
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            self.cancel('timeout')
+            return True
+        if self.parent is not None and self.parent.cancelled:
+            self.cancel(self.parent.reason)
+            return True
+        return False
+    
+    def child(self, timeout=None):
+        """Token that is also cancelled whenever this one is"""
+        return CancellationToken(timeout=timeout, parent=self)
+
+class BrowserProcessTracker:
+    """
+    Tracks chromedriver/Chrome process trees started by this process
+    
+    Root pids are mirrored to a per-process registry file so that a later
+    process can reap browsers left behind when this one dies.
+    """
+    
+    BROWSER_NAMES = ('chrome', 'chromedriver', 'chromium', 'google-chrome', 'chrome_crashpad_handler')
+    
+    def __init__(self, registry_dir):
+        self.registry_dir = registry_dir
+        self._roots = set()
+        self._lock = threading.Lock()
+    
+    @property
+    def registry_file(self):
+        return os.path.join(self.registry_dir, f'{os.getpid()}.json')
+    
+    def register(self, pid):
+        with self._lock:
+            self._roots.add(pid)
+            self._save()
+    
+    def unregister(self, pid):
+        with self._lock:
+            self._roots.discard(pid)
+            self._save()
+    
+    def _save(self):
+        try:
+            if self._roots:
+                os.makedirs(self.registry_dir, exist_ok=True)
+                with open(self.registry_file, 'w') as f:
+                    json.dump(sorted(self._roots), f)
+            elif os.path.exists(self.registry_file):
+                os.remove(self.registry_file)
+        except OSError:
+            pass
+    
+    def kill_tree(self, pid):
+        """Kill a process and all of its descendants"""
+        if not PSUTIL_AVAILABLE:
+            if os.name != 'nt' and _pid_alive(pid):
+                try:
+                    os.kill(pid, 9)
+                except OSError:
+                    pass
+            return
+        
+        try:
+            root = psutil.Process(pid)
+            processes = root.children(recursive=True) + [root]
+        except psutil.NoSuchProcess:
+            return
+        
+        for process in processes:
+            try:
+                process.kill()
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        psutil.wait_procs(processes, timeout=5)
+    
+    def kill_all(self):
+        """Kill every browser tree this process still owns"""
+        with self._lock:
+            roots = list(self._roots)
+        
+        for pid in roots:
+            self.kill_tree(pid)
+            self.unregister(pid)
+        
+        if roots:
+            print(f"✓ Killed {len(roots)} browser process tree(s)")
+    
+    def reap_orphans(self):
+        """
+        Kill browsers left behind by dead processes
+        
+        Covers trees recorded in registry files of processes that no longer
+        exist, and untracked browsers re-parented to init (or to us when we
+        run as PID 1 in a container) whose --user-data-dir is under our
+        CHROME_PROFILE_DIR. Other browsers on the host are never touched.
+        """
+        reaped = 0
+        
+        if os.path.isdir(self.registry_dir):
+            for filename in os.listdir(self.registry_dir):
+                owner = filename.split('.')[0]
+                if not owner.isdigit() or int(owner) == os.getpid() or _pid_alive(int(owner)):
+                    continue
+                
+                path = os.path.join(self.registry_dir, filename)
+                try:
+                    with open(path) as f:
+                        pids = json.load(f)
+                except (OSError, ValueError):
+                    pids = []
+                
+                for pid in pids:
+                    if self._is_browser(pid):
+                        self.kill_tree(pid)
+                        reaped += 1
+                
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+        
+        if PSUTIL_AVAILABLE and config.CHROME_PROFILE_DIR:
+            with self._lock:
+                tracked = set(self._roots)
+            orphan_parents = {1, os.getpid()} if os.getpid() == 1 else {1}
+            profile_flag = f"--user-data-dir={os.path.join(os.path.abspath(config.CHROME_PROFILE_DIR), '')}"
+            
+            for process in psutil.process_iter(['pid', 'ppid', 'name', 'cmdline']):
+                try:
+                    name = (process.info['name'] or '').lower()
+                    if (process.info['ppid'] in orphan_parents and
+                            process.info['pid'] not in tracked and
+                            name.startswith(self.BROWSER_NAMES) and
+                            any(arg.startswith(profile_flag) for arg in process.info['cmdline'] or ())):
+                        self.kill_tree(process.info['pid'])
+                        reaped += 1
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    continue
+        
+        # As PID 1 nobody else collects our exited children
+        if os.name != 'nt' and os.getpid() == 1:
+            try:
+                while os.waitpid(-1, os.WNOHANG)[0] > 0:
+                    pass
+            except ChildProcessError:
+                pass
+        
+        if reaped:
+            print(f"✓ Reaped {reaped} orphaned browser process tree(s)")
+        return reaped
+    
+    def _is_browser(self, pid):
+        if not PSUTIL_AVAILABLE:
+            return _pid_alive(pid)
+        try:
+            return psutil.Process(pid).name().lower().startswith(self.BROWSER_NAMES)
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            return False
+
+browser_tracker = BrowserProcessTracker(os.path.join(config.OUTPUT_DIR, 'browser_pids'))
+atexit.register(browser_tracker.kill_all)
+
 class BaseScraper:
-    def __init__(self, headless=config.HEADLESS_MODE):
+    # Lean mode settings - subclasses override these per site
+    blocked_resource_types = ('image', 'font', 'media')
+    blocked_url_patterns = []
+    
+    # Upper bound on profile slots searched when the preferred one is busy
+    MAX_PROFILE_SLOTS = 16
+    # Seconds an empty profile lock is assumed to be mid-write rather than stale
+    LOCK_WRITE_GRACE = 10
+    # Sample browser memory every N pages - walking the process tree isn't free
+    MEMORY_CHECK_INTERVAL = 10
+    
+    def __init__(self, headless=config.HEADLESS_MODE, lean_mode=config.LEAN_MODE, profile_slot=0,
+                 cancel_token=None, known_urls=None, negative_cache=None,
+                 render_service_url=config.RENDER_SERVICE_URL, render_lane='scheduled'):
         self.driver = None
+        self.driver_pid = None
+        self.cancel_token = cancel_token or CancellationToken()
         self.headless = headless
+        self.lean_mode = lean_mode
+        self.render_service_url = render_service_url
+        self.render_lane = render_lane
         self.wait_timeout = config.TIMEOUT
+        self.profile_slot = profile_slot
+        self.profile_dir = None
+        self._profile_lock = None
+        self.pages_served = 0
+        self.max_pages_per_driver = config.DRIVER_MAX_PAGES
+        self.max_driver_memory_mb = config.DRIVER_MAX_MEMORY_MB
+        self.known_urls = known_urls if known_urls is not None else UrlIndex()
+        self.negative_cache = negative_cache
+        self.early_stop_after = config.DISCOVERY_EARLY_STOP
+        self.discovery_state_file = os.path.join(config.OUTPUT_DIR, 'discovery_state.json')
+        self._known_streak = 0
+        self._early_stop_enabled = False
+        self._stopped_early = False
+        self._workers = []
+        self.discovered_count = 0
+        # URL of the last page get_page() actually loaded
+        self.loaded_url = None
+        # Origins loaded since the last reset_browser_state()
+        self.visited_origins = set()
+    
+    def get_blocked_urls(self):
+        """URL patterns blocked at the network level in lean mode"""
+        patterns = []
+        for resource_type in self.blocked_resource_types:
+            patterns.extend(RESOURCE_TYPE_PATTERNS.get(resource_type, []))
+        patterns.extend(TRACKER_PATTERNS)
+        patterns.extend(self.blocked_url_patterns)
+        patterns.extend(config.LEAN_EXTRA_BLOCKED_URLS)
+        return patterns
+    
+    def apply_lean_options(self, chrome_options):
+        """Add flags and prefs that keep Chrome from doing work the scrapers never use"""
+        for flag in [
+            '--disable-background-networking',
+            '--disable-extensions',
+            '--disable-component-update',
+            '--disable-default-apps',
+            '--disable-sync',
+            '--disable-translate',
+            '--disable-client-side-phishing-detection',
+            '--disable-domain-reliability',
+            '--disable-features=Translate,MediaRouter,OptimizationHints,AutofillServerCommunication',
+            '--metrics-recording-only',
+            '--no-first-run',
+            '--no-default-browser-check',
+            '--mute-audio',
+            '--autoplay-policy=user-gesture-required',
+        ]:
+            chrome_options.add_argument(flag)
+        
+        # Images still keep their src attributes, they just never get downloaded
+        prefs = {'profile.default_content_setting_values.notifications': 2}
+        if 'image' in self.blocked_resource_types:
+            prefs['profile.managed_default_content_settings.images'] = 2
+        chrome_options.add_experimental_option('prefs', prefs)
+        
+        # Return from driver.get() at DOMContentLoaded - scrapers wait explicitly anyway
+        chrome_options.page_load_strategy = 'eager'
+    
+    def apply_network_blocking(self):
+        """Block heavy resources and trackers via CDP"""
+        patterns = self.get_blocked_urls()
+        try:
+            self.driver.execute_cdp_cmd('Network.enable', {})
+            self.driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns})
+            print(f"✓ Lean mode: blocking {len(patterns)} URL patterns")
+        except Exception as e:
+            print(f"⚠ Could not enable network blocking: {e}")
+        
+    def acquire_profile(self):
+        """
+        Lock a persistent profile slot and return its directory
+        
+        Starts at self.profile_slot and moves to the next slot while the
+        current one is held by another live process, so concurrent drivers
+        never share a user-data-dir.
+        """
+        base_dir = config.CHROME_PROFILE_DIR
+        os.makedirs(base_dir, exist_ok=True)
+        
+        for slot in range(self.profile_slot, self.profile_slot + self.MAX_PROFILE_SLOTS):
+            slot_dir = os.path.join(base_dir, f'slot-{slot}')
+            lock_path = os.path.join(base_dir, f'slot-{slot}.lock')
+            
+            if self._try_lock(lock_path):
+                os.makedirs(slot_dir, exist_ok=True)
+                self._profile_lock = lock_path
+                self.profile_dir = slot_dir
+                self._clear_singleton_locks(slot_dir)
+                self.purge_expired_cache(slot_dir)
+                return slot_dir
         
+        raise RuntimeError(f"No free Chrome profile slot in {base_dir}")
+    
+    def _try_lock(self, lock_path):
+        """Create a pid lock file, taking over locks left by dead processes"""
+        for _ in range(2):
+            try:
+                fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                with os.fdopen(fd, 'w') as f:
+                    f.write(str(os.getpid()))
+                return True
+            except FileExistsError:
+                try:
+                    with open(lock_path) as f:
+                        owner = int(f.read().strip() or 0)
+                except (OSError, ValueError):
+                    owner = 0
+                
+                if not owner:
+                    # Empty: the owner may have created it and not written its pid yet
+                    try:
+                        age = time.time() - os.path.getmtime(lock_path)
+                    except OSError:
+                        continue
+                    if age < self.LOCK_WRITE_GRACE:
+                        return False
+                elif owner != os.getpid() and _pid_alive(owner):
+                    return False
+                if owner == os.getpid() and self._profile_lock != lock_path:
+                    # Held by another scraper in this process
+                    return False
+                
+                try:
+                    os.remove(lock_path)
+                except OSError:
+                    return False
+        return False
+    
+    def _clear_singleton_locks(self, slot_dir):
+        """Remove Chrome's own singleton locks; a new container has a new hostname"""
+        profile_dir = os.path.join(slot_dir, 'profile')
+        for name in ('SingletonLock', 'SingletonCookie', 'SingletonSocket'):
+            path = os.path.join(profile_dir, name)
+            if os.path.lexists(path):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+    
+    def purge_expired_cache(self, slot_dir):
+        """Drop the slot's disk cache once it is older than CHROME_CACHE_TTL_HOURS"""
+        cache_dir = os.path.join(slot_dir, 'cache')
+        stamp = os.path.join(cache_dir, '.created')
+        
+        if os.path.exists(stamp):
+            age_hours = (time.time() - os.path.getmtime(stamp)) / 3600
+            if age_hours < config.CHROME_CACHE_TTL_HOURS:
+                return
+            shutil.rmtree(cache_dir, ignore_errors=True)
+            print(f"✓ Purged Chrome cache older than {config.CHROME_CACHE_TTL_HOURS}h: {cache_dir}")
+        
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(stamp, 'w') as f:
+            f.write(str(time.time()))
+    
+    def release_profile(self):
+        """Release the profile slot lock"""
+        if self._profile_lock:
+            try:
+                os.remove(self._profile_lock)
+            except OSError:
+                pass
+            self._profile_lock = None
+    
+    def apply_profile_options(self, chrome_options):
+        """Point Chrome at the persistent profile and size-capped disk cache"""
+        slot_dir = self.acquire_profile()
+        chrome_options.add_argument(f"--user-data-dir={os.path.abspath(os.path.join(slot_dir, 'profile'))}")
+        chrome_options.add_argument(f"--disk-cache-dir={os.path.abspath(os.path.join(slot_dir, 'cache'))}")
+        chrome_options.add_argument(f'--disk-cache-size={config.CHROME_CACHE_SIZE_MB * 1024 * 1024}')
+        print(f"✓ Using persistent Chrome profile: {slot_dir}")
+    
     def setup_driver(self):
         """Initialize Chrome driver with options"""
-        import os
+        if self.render_service_url:
+            self.start_remote_driver()
+            return
         
         chrome_options = Options()
         
@@ -39,6 +494,36 @@ class BaseScraper:
         chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
         chrome_options.add_experimental_option('useAutomationExtension', False)
         
+        if self.lean_mode:
+            self.apply_lean_options(chrome_options)
+        
+        if config.CHROME_PROFILE_DIR:
+            self.apply_profile_options(chrome_options)
+        
+        if config.DRIVER_BACKEND == 'cdp':
+            self.start_cdp_driver(chrome_options)
+        else:
+            self.start_selenium_driver(chrome_options)
+        
+        try:
+            self.driver_pid = getattr(self.driver, 'browser_pid', None) or self.driver.service.process.pid
+            browser_tracker.register(self.driver_pid)
+        except Exception:
+            self.driver_pid = None
+        
+        if self.lean_mode:
+            self.apply_network_blocking()
+        
+        self.pages_served = 0
+        
+        # Try to maximize window, but don't fail if it doesn't work
+        try:
+            self.driver.maximize_window()
+        except:
+            pass
+        
+    def start_selenium_driver(self, chrome_options):
+        """Start Chrome through chromedriver"""
         print("Setting up Chrome driver...")
         
         # Try to find ChromeDriver in common locations
@@ -72,14 +557,330 @@ class BaseScraper:
         except Exception as e:
             print(f"✗ Failed to initialize Chrome: {e}")
             print(f"  Tried path: {driver_path}")
+            self.release_profile()
+            raise
+    
+    def start_remote_driver(self):
+        """Lease a browser from the render service (it applies its own lean options)"""
+        print(f"Requesting browser from render service ({self.render_lane} lane)...")
+        try:
+            self.driver = RemoteDriver(self.render_service_url, lane=self.render_lane)
+            print(f"✓ Using render service session {self.driver.session_id}")
+        except Exception as e:
+            print(f"✗ Failed to get a browser from the render service: {e}")
             raise
+        self.driver_pid = None
+        self.pages_served = 0
+    
+    def start_cdp_driver(self, chrome_options):
+        """Start Chrome and drive it directly over the DevTools Protocol"""
+        print("Setting up Chrome (CDP backend)...")
+        try:
+            self.driver = CDPDriver(
+                chrome_options.arguments,
+                binary=config.CHROME_BINARY_PATH or None,
+                page_load_strategy=chrome_options.page_load_strategy,
+            )
+            print(f"✓ Connected to Chrome over CDP (pid {self.driver.browser_pid})")
+        except Exception as e:
+            print(f"✗ Failed to start Chrome over CDP: {e}")
+            self.release_profile()
+            raise
+    
+    def wait_for_network_idle(self, idle_time=0.5, timeout=10):
+        """Wait for the network to go quiet (CDP backend only, no-op otherwise)"""
+        if hasattr(self.driver, 'wait_for_network_idle'):
+            return self.driver.wait_for_network_idle(idle_time, timeout)
+        return True
+    
+    def find_first_text(self, selectors, min_length=1):
+        """
+        Visible text of the first element matching any of the selectors
         
-        # Try to maximize window, but don't fail if it doesn't work
+        Runs as one script instead of a find_elements + .text round trip
+        per element.
+        """
         try:
-            self.driver.maximize_window()
-        except:
+            return self.driver.execute_script(FIRST_TEXT_SCRIPT, list(selectors), min_length)
+        except Exception:
+            return None
+    
+    def start_discovery(self):
+        """
+        Reset early-stop tracking before walking a listing
+        
+        Early stop is only used when there is a known-URL index to compare
+        against and no full sweep is due.
+        """
+        self._known_streak = 0
+        self._stopped_early = False
+        self._early_stop_enabled = bool(self.known_urls) and self.early_stop_after > 0
+        
+        if self._early_stop_enabled and self._full_sweep_due():
+            print("Full discovery sweep due - early stop disabled for this run")
+            self._early_stop_enabled = False
+    
+    def note_discovered(self, links):
+        """
+        Feed newly harvested links in page order
+        
+        Returns True once early_stop_after consecutive links are already
+        known, meaning the rest of a recency-ordered listing was seen before.
+        """
+        if not self._early_stop_enabled:
+            return False
+        
+        for link in links:
+            if link in self.known_urls:
+                self._known_streak += 1
+            else:
+                self._known_streak = 0
+            
+            if self._known_streak >= self.early_stop_after:
+                print(f"  Reached {self._known_streak} consecutive known links - stopping discovery")
+                self._stopped_early = True
+                return True
+        
+        return False
+    
+    def finish_discovery(self):
+        """Record a completed full sweep so the next ones can stop early"""
+        if self._stopped_early or self.cancel_token.cancelled:
+            return
+        
+        state = self._load_discovery_state()
+        state[self.__class__.__name__] = {'last_full_sweep': time.time()}
+        try:
+            os.makedirs(config.OUTPUT_DIR, exist_ok=True)
+            with open(self.discovery_state_file, 'w', encoding='utf-8') as f:
+                json.dump(state, f, indent=2)
+        except OSError:
             pass
+    
+    def _full_sweep_due(self):
+        entry = self._load_discovery_state().get(self.__class__.__name__, {})
+        last_sweep = entry.get('last_full_sweep', 0)
+        return time.time() - last_sweep >= config.DISCOVERY_FULL_SWEEP_DAYS * 86400
+    
+    def _load_discovery_state(self):
+        if os.path.exists(self.discovery_state_file):
+            try:
+                with open(self.discovery_state_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except (OSError, ValueError):
+                pass
+        return {}
+    
+    def collect_hrefs(self, selector):
+        """All link hrefs matching a CSS selector, in page order, in one round trip"""
+        return self.driver.execute_script(
+            "return Array.from(document.querySelectorAll(arguments[0]), a => a.href);",
+            selector
+        ) or []
+    
+    def spawn_worker(self, slot):
+        """A scraper of the same kind, with its own driver, for detail pages"""
+        return self.__class__(
+            headless=self.headless,
+            lean_mode=self.lean_mode,
+            profile_slot=self.profile_slot + slot,
+            cancel_token=self.cancel_token,
+            known_urls=self.known_urls,
+            negative_cache=self.negative_cache,
+            render_service_url=self.render_service_url,
+            render_lane=self.render_lane
+        )
+    
+    def run_pipeline(self, links, scrape_one, max_items, skip_urls=(), on_result=None,
+                     accept=None, delay=0.5, workers=None):
+        """
+        Scrape detail pages while discovery is still producing links
+        
+        Args:
+            links: iterable of links, usually a generator walking the listing
+                with self.driver; it is consumed in the calling thread
+            scrape_one: name of the detail method, e.g. 'scrape_event'
+            max_items: maximum number of links handed to the workers
+            skip_urls: extra URLs not to scrape (e.g. done in an earlier session);
+                links are canonicalized before this check. Links already in the
+                database are still scraped (they only count toward early stop),
+                so each run's export covers every event it reaches
+            on_result: called with each accepted item, one at a time
+            accept: predicate for results (default: has a title)
+            delay: pause after each detail page, per worker
+            workers: number of detail workers (default config.DETAIL_WORKERS)
+        
+        Returns:
+            Accepted items in completion order
+        """
+        workers = max(1, workers or config.DETAIL_WORKERS)
+        if self.render_service_url:
+            # Discovery holds one session for the whole run; more workers than the
+            # rest of the pool would wait on each other until the acquire timeout
+            size = pool_size(self.render_service_url)
+            if size and workers > size - 1:
+                workers = max(1, size - 1)
+                print(f"⚠ Render pool has {size} browsers, using {workers} detail worker(s)")
+        accept = accept or (lambda item: bool(item and item.get('title')))
+        if self.negative_cache is None:
+            self.negative_cache = NegativeCache()
+        negative_cache = self.negative_cache
+        work = queue.Queue()
+        results = []
+        lock = threading.Lock()
+        
+        def consume(worker):
+            try:
+                while True:
+                    link = work.get()
+                    if link is None:
+                        break
+                    if worker.cancel_token.cancelled:
+                        continue
+                    
+                    worker.loaded_url = None
+                    try:
+                        item = getattr(worker, scrape_one)(link)
+                    except Exception as e:
+                        print(f"  ✗ Error: {e}")
+                        continue
+                    
+                    if accept(item):
+                        with lock:
+                            results.append(item)
+                            count = len(results)
+                            if on_result:
+                                on_result(item)
+                        negative_cache.clear(link)
+                        title = item.get('title') or link
+                        print(f"  ✓ [{count}] {title[:60]}")
+                    else:
+                        # Only a page that loaded and came back empty is evidence; None
+                        # means the scrape method hit an error (timeout, dead browser,
+                        # render service busy) and says nothing about the page
+                        if (item is not None and worker.loaded_url == link
+                                and not worker.cancel_token.cancelled):
+                            negative_cache.record(link, 'no_title' if item else 'no_data')
+                        print(f"  ✗ No data: {link}")
+                    
+                    time.sleep(delay)
+            finally:
+                worker.close()
+        
+        self._workers = [self.spawn_worker(i + 1) for i in range(workers)]
+        threads = [threading.Thread(target=consume, args=(worker,), daemon=True)
+                   for worker in self._workers]
+        for thread in threads:
+            thread.start()
+        
+        seen = set()
+        enqueued = 0
+        self.discovered_count = 0
+        
+        try:
+            for link in links:
+                if self.is_cancelled():
+                    break
+                # Fetch and dedupe on the canonical form
+                link = canonicalize_url(link)
+                if not link or link in seen:
+                    continue
+                
+                seen.add(link)
+                self.discovered_count += 1
+                if link in skip_urls:
+                    continue
+                if negative_cache.should_skip(link):
+                    continue
+                
+                work.put(link)
+                enqueued += 1
+                if enqueued >= max_items:
+                    # Not a full sweep: the listing generator records that itself
+                    # (finish_discovery) only when it runs out on its own
+                    print(f"  Reached limit of {max_items} links")
+                    break
+        except KeyboardInterrupt:
+            # Don't let the workers drain the whole queue first
+            self.cancel_token.cancel('interrupted')
+            raise
+        finally:
+            for _ in threads:
+                work.put(None)
+            for thread in threads:
+                thread.join()
+            self._workers = []
+            negative_cache.save()
+        
+        print(f"\nDiscovered {self.discovered_count} links, queued {enqueued}, scraped {len(results)}")
+        if negative_cache.skipped or negative_cache.rechecked:
+            print(f"Negative cache: skipped {negative_cache.skipped}, re-checked {negative_cache.rechecked}")
+        return results
+    
+    def get_page(self, url):
+        """
+        Navigate to a detail page, recycling the driver first when it has
+        served too many pages or grown too large
+        
+        Callers keep their own position in the link list, so a recycle is
+        invisible to them apart from the fresh session.
+        """
+        if self.driver is None:
+            self.setup_driver()
+        elif self.should_recycle_driver():
+            self.recycle_driver()
+        
+        self.driver.get(url)
+        self.pages_served += 1
+        self.loaded_url = url
+        parts = urlsplit(url)
+        if parts.scheme in ('http', 'https'):
+            self.visited_origins.add(f"{parts.scheme}://{parts.netloc}")
+    
+    def should_recycle_driver(self):
+        """Check page count and memory thresholds"""
+        if self.max_pages_per_driver and self.pages_served >= self.max_pages_per_driver:
+            print(f"  ↻ Driver served {self.pages_served} pages")
+            return True
+        
+        if (self.max_driver_memory_mb and self.pages_served and
+                self.pages_served % self.MEMORY_CHECK_INTERVAL == 0):
+            memory_mb = self.driver_memory_mb()
+            if memory_mb and memory_mb >= self.max_driver_memory_mb:
+                print(f"  ↻ Driver memory at {memory_mb:.0f} MB")
+                return True
         
+        return False
+    
+    def recycle_driver(self):
+        """Replace the current driver with a fresh one"""
+        print("  ↻ Recycling Chrome driver...")
+        try:
+            self.close()
+        except Exception as e:
+            print(f"  ⚠ Error closing old driver: {e}")
+            self.driver = None
+        self.setup_driver()
+    
+    def driver_memory_mb(self):
+        """Total RSS of chromedriver, the browser and its renderers in MB (None if unknown)"""
+        if not PSUTIL_AVAILABLE or not self.driver_pid:
+            return None
+        
+        try:
+            root = psutil.Process(self.driver_pid)
+            processes = [root] + root.children(recursive=True)
+        except Exception:
+            return None
+        
+        total = 0
+        for process in processes:
+            try:
+                total += process.memory_info().rss
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        return total / (1024 * 1024)
+    
     def wait_for_element(self, by, value, timeout=None):
         """Wait for element to be present"""
         timeout = timeout or self.wait_timeout
@@ -107,7 +908,59 @@ class BaseScraper:
                 break
             last_height = new_height
     
+    def reset_browser_state(self):
+        """
+        Drop what the last user of this browser left behind (extra tabs,
+        cookies, site storage) and park it on about:blank. The HTTP cache is
+        kept. Used by the render service before a browser goes back to the pool.
+        """
+        self.loaded_url = None
+        if self.driver is None:
+            self.visited_origins.clear()
+            return
+        
+        driver = self.driver
+        current = driver.execute_cdp_cmd('Target.getTargetInfo', {}).get('targetInfo', {}).get('targetId')
+        for target in driver.execute_cdp_cmd('Target.getTargets', {}).get('targetInfos', []):
+            if target.get('type') == 'page' and target.get('targetId') != current:
+                driver.execute_cdp_cmd('Target.closeTarget', {'targetId': target['targetId']})
+        
+        driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+        for origin in self.visited_origins:
+            driver.execute_cdp_cmd('Storage.clearDataForOrigin', {'origin': origin, 'storageTypes': 'all'})
+        self.visited_origins.clear()
+        driver.get('about:blank')
+    
+    def is_cancelled(self):
+        """True once the scrape has been cancelled or has timed out"""
+        if self.cancel_token.cancelled:
+            print(f"\n⚠ Scrape stopped ({self.cancel_token.reason})")
+            return True
+        return False
+    
+    def kill_browser(self):
+        """Hard-kill this scraper's browser tree (safe to call from another thread)"""
+        for worker in list(self._workers):
+            worker.kill_browser()
+        if self.driver_pid:
+            browser_tracker.kill_tree(self.driver_pid)
+        elif isinstance(self.driver, RemoteDriver):
+            # The render service kills the browser when the session is dropped
+            self.driver.quit()
+    
     def close(self):
         """Close the browser"""
         if self.driver:
-            self.driver.quit()
+            try:
+                self.driver.quit()
+            except Exception as e:
+                print(f"⚠ Error quitting driver: {e}")
+            self.driver = None
+        
+        # Make sure no renderer or crashpad process outlives the session
+        if self.driver_pid:
+            browser_tracker.kill_tree(self.driver_pid)
+            browser_tracker.unregister(self.driver_pid)
+            self.driver_pid = None
+        
+        self.release_profile()
@@ -6,6 +6,9 @@ from database import Event, Deal
 from datetime import datetime
 import json
 import os
+import threading
+import weakref
+import config
 
 # Import all scrapers
 from culture_final_scraper import CultureFinalScraper
@@ -13,14 +16,35 @@ from visitgreece_detailed_scraper import VisitGreeceDetailedScraper
 from pigolampides_scraper import PigolampidesScraper
 from more_events_scraper_optimized import MoreEventsScraperOptimized
 
+from scraper_base import CancellationToken
+from url_index import UrlIndex, canonicalize_url
+from date_parser import parse_date
+
 # Import data transformer
 from data_transformer import DataTransformer
+from dedupe import dedupe_events
+from stats import refresh_stats
+
+# Cancellation tokens of runs in progress, so shutdown hooks can stop them
+_active_tokens = weakref.WeakSet()
+
+def cancel_all_scrapes(reason='shutdown'):
+    """Cancel every scrape run in progress in this process"""
+    tokens = list(_active_tokens)
+    for token in tokens:
+        token.cancel(reason)
+    return len(tokens)
 
 class ScraperManager:
     """Manages all scrapers and database operations"""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, cancel_token=None, render_lane='scheduled'):
         self.db = db
+        # Priority lane used when browsers come from the render service
+        self.render_lane = render_lane
+        self.cancel_token = cancel_token or CancellationToken()
+        _active_tokens.add(self.cancel_token)
+        self.url_index = None
         self.scrapers = {
             'culture_gov': CultureFinalScraper,
             'visitgreece': VisitGreeceDetailedScraper,
@@ -44,49 +68,41 @@ class ScraperManager:
         # Dictionary to store raw events from each source
         events_by_source = {}
         
-        # Run Culture.gov scraper
-        try:
-            print("\n[1/4] Running Culture.gov scraper...")
-            scraper = CultureFinalScraper(headless=headless)
-            events = scraper.scrape_all_events(max_events=max_events_per_source)
-            events_by_source['culture_gov'] = events
-            print(f"✓ Scraped {len(events)} events from Culture.gov")
-        except Exception as e:
-            print(f"✗ Error with Culture.gov scraper: {e}")
-            events_by_source['culture_gov'] = []
+        # URLs already in the database let discovery stop at the known part of listings
+        known_urls = self.load_known_urls()
+        print(f"Known URLs in database: {len(known_urls)}")
         
-        # Run VisitGreece scraper
-        try:
-            print("\n[2/4] Running VisitGreece scraper...")
-            scraper = VisitGreeceDetailedScraper(headless=headless)
-            events = scraper.scrape_events_with_details(max_events=max_events_per_source)
-            events_by_source['visitgreece'] = events
-            print(f"✓ Scraped {len(events)} events from VisitGreece")
-        except Exception as e:
-            print(f"✗ Error with VisitGreece scraper: {e}")
-            events_by_source['visitgreece'] = []
+        sources = [
+            ('culture_gov', 'Culture.gov', CultureFinalScraper,
+             lambda scraper: scraper.scrape_all_events(max_events=max_events_per_source)),
+            ('visitgreece', 'VisitGreece', VisitGreeceDetailedScraper,
+             lambda scraper: scraper.scrape_events_with_details(max_events=max_events_per_source)),
+            ('pigolampides', 'Pigolampides', PigolampidesScraper,
+             lambda scraper: scraper.scrape_all_posts(max_posts=max_events_per_source)),
+            ('more_events', 'More Events', MoreEventsScraperOptimized,
+             lambda scraper: scraper.scrape_all_events(max_events=max_events_per_source, resume=False)),
+        ]
         
-        # Run Pigolampides scraper
-        try:
-            print("\n[3/4] Running Pigolampides scraper...")
-            scraper = PigolampidesScraper(headless=headless)
-            posts = scraper.scrape_all_posts(max_posts=max_events_per_source)
-            events_by_source['pigolampides'] = posts
-            print(f"✓ Scraped {len(posts)} posts from Pigolampides")
-        except Exception as e:
-            print(f"✗ Error with Pigolampides scraper: {e}")
-            events_by_source['pigolampides'] = []
-        
-        # Run More Events scraper
-        try:
-            print("\n[4/4] Running More Events scraper...")
-            scraper = MoreEventsScraperOptimized(headless=headless)
-            events = scraper.scrape_all_events(max_events=max_events_per_source, resume=False)
-            events_by_source['more_events'] = events
-            print(f"✓ Scraped {len(events)} events from More Events")
-        except Exception as e:
-            print(f"✗ Error with More Events scraper: {e}")
-            events_by_source['more_events'] = []
+        for idx, (source, label, scraper_class, run) in enumerate(sources):
+            if self.cancel_token.cancelled:
+                print(f"\n⚠ Run cancelled ({self.cancel_token.reason}), skipping {label}")
+                events_by_source[source] = []
+                continue
+            
+            try:
+                print(f"\n[{idx + 1}/{len(sources)}] Running {label} scraper...")
+                scraper = scraper_class(
+                    headless=headless,
+                    cancel_token=self.cancel_token.child(timeout=config.SCRAPER_SOURCE_TIMEOUT),
+                    known_urls=known_urls,
+                    render_lane=self.render_lane
+                )
+                events = self._run_with_watchdog(scraper, run)
+                events_by_source[source] = events
+                print(f"✓ Scraped {len(events)} items from {label}")
+            except Exception as e:
+                print(f"✗ Error with {label} scraper: {e}")
+                events_by_source[source] = []
         
         # Transform all events to standardized format
         print("\n" + "="*60)
@@ -96,6 +112,10 @@ class ScraperManager:
         transformer = DataTransformer()
         standardized_events = transformer.transform_all_events(events_by_source)
         
+        # Merge the same event listed on several sites
+        if config.DEDUPE_ENABLED:
+            standardized_events = dedupe_events(standardized_events)
+        
         # Save combined JSON file
         combined_json_path = transformer.save_combined_json(standardized_events)
         results['combined_json_path'] = combined_json_path
@@ -108,6 +128,12 @@ class ScraperManager:
         saved_count = self.save_standardized_events(standardized_events)
         results['total_events'] = saved_count
         
+        try:
+            refresh_stats(self.db)
+        except Exception as e:
+            print(f"⚠ Could not refresh stats: {e}")
+            self.db.rollback()
+        
         # Count by source
         for source in events_by_source.keys():
             source_count = sum(1 for e in standardized_events if e.get('source', '').lower().replace('.', '').replace('gr', '').strip() in source)
@@ -122,24 +148,62 @@ class ScraperManager:
         
         return results
     
+    def load_known_urls(self):
+        """
+        Canonical index of all event URLs already stored in the database
+        
+        The same index is used by discovery and by the database writer.
+        """
+        self.url_index = UrlIndex()
+        try:
+            query = self.db.query(Event.url).filter(Event.url.isnot(None))
+            self.url_index.update(url for (url,) in query.yield_per(5000))
+        except Exception as e:
+            print(f"⚠ Could not load known URLs: {e}")
+        return self.url_index
+    
+    def _run_with_watchdog(self, scraper, run):
+        """
+        Run a scraper, hard-killing its browser if it is still busy after
+        its timeout (e.g. stuck inside a page load where it can't check
+        the cancellation token)
+        """
+        def expire():
+            print(f"⚠ {scraper.__class__.__name__} overran its timeout, killing browser")
+            scraper.cancel_token.cancel('timeout')
+            scraper.kill_browser()
+        
+        watchdog = threading.Timer(config.SCRAPER_SOURCE_TIMEOUT + 60, expire)
+        watchdog.daemon = True
+        watchdog.start()
+        try:
+            return run(scraper)
+        finally:
+            watchdog.cancel()
+            scraper.close()
+    
     def save_standardized_events(self, events):
         """Save standardized events to database"""
         saved_count = 0
+        if self.url_index is None:
+            self.load_known_urls()
         
         for event_data in events:
             try:
-                # Check if event already exists by URL
-                url = event_data.get('url') or event_data.get('eventUrl')
-                if url:
-                    existing = self.db.query(Event).filter(Event.url == url).first()
-                    if existing:
-                        continue
+                # Check if event already exists by canonical URL (the index mirrors
+                # the table; the unique constraint still guards concurrent writers)
+                url = canonicalize_url(event_data.get('url') or event_data.get('eventUrl'))
+                source_urls = [canonicalize_url(u) for u in event_data.get('sourceUrls') or [url] if u]
+                if any(u in self.url_index for u in source_urls):
+                    continue
                 
                 # Create new event from standardized format
                 event = Event(
                     title=event_data.get('title', 'Untitled'),
                     description=event_data.get('description'),
                     date=event_data.get('date'),
+                    start_date=self._parse_day(event_data.get('startDate') or event_data.get('date')),
+                    end_date=self._parse_day(event_data.get('endDate')),
                     location=event_data.get('location') or event_data.get('venue'),
                     category=event_data.get('category'),
                     price=str(event_data.get('price', 0)),
@@ -147,12 +211,18 @@ class ScraperManager:
                     source=event_data.get('source', 'Unknown'),
                     images=[event_data.get('image')] if event_data.get('image') else [],
                     contact=None,
-                    content={'region': event_data.get('region'), 'venue': event_data.get('venue')},
+                    content={
+                        'region': event_data.get('region'),
+                        'venue': event_data.get('venue'),
+                        'source_urls': source_urls
+                    },
                     full_text=None
                 )
                 
                 self.db.add(event)
                 self.db.commit()
+                # Later copies from other sites are skipped via any of the merged URLs
+                self.url_index.update(source_urls)
                 saved_count += 1
                 
             except Exception as e:
@@ -162,6 +232,12 @@ class ScraperManager:
         
         return saved_count
     
+    @staticmethod
+    def _parse_day(value):
+        """datetime.date for a standardized YYYY-MM-DD (or any parseable) date, else None"""
+        parsed = parse_date(value)
+        return parsed.start if parsed else None
+    
     def save_events(self, events, source):
         """Legacy method - kept for backward compatibility"""
         saved_count = 0
@@ -176,10 +252,13 @@ class ScraperManager:
                         continue
                 
                 # Create new event
+                parsed = parse_date(event_data.get('date'))
                 event = Event(
                     title=event_data.get('title', 'Untitled'),
                     description=self._get_description(event_data),
                     date=event_data.get('date'),
+                    start_date=parsed.start if parsed else None,
+                    end_date=parsed.end if parsed else None,
                     location=event_data.get('location'),
                     category=event_data.get('category') or self._extract_category(event_data),
                     price=event_data.get('price'),
@@ -0,0 +1,227 @@
+"""
+Full-text search for events and deals
+PostgreSQL: tsvector column kept up to date by a trigger, GIN index, and
+an accent-insensitive text search configuration (unaccent).
+SQLite: FTS5 table of title/description with Greek accents stripped, kept
+in sync by triggers that use only built-in SQL functions. Falls back to LIKE matching when neither is available.
+"""
+import re
+
+from sqlalchemy import column, false, func, inspect, literal, literal_column, table, text
+
+from database import engine
+from text_utils import fold_text
+
+# Tables with full-text search, and the text columns they index (title weighted highest)
+SEARCH_TABLES = ('events', 'deals')
+
+TS_CONFIG = 'app_search'
+HEADLINE_OPTIONS = 'StartSel=<mark>, StopSel=</mark>, MaxWords=30, MinWords=10, MaxFragments=2'
+
+_WORD = re.compile(r'\w+')
+
+# Dialect -> whether setup found full-text search usable (filled lazily)
+_available = {}
+
+POSTGRES_SETUP = [
+    "CREATE EXTENSION IF NOT EXISTS unaccent",
+    f"""
+    DO $$ BEGIN
+        IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = '{TS_CONFIG}') THEN
+            CREATE TEXT SEARCH CONFIGURATION {TS_CONFIG} (COPY = simple);
+            ALTER TEXT SEARCH CONFIGURATION {TS_CONFIG}
+                ALTER MAPPING FOR hword, hword_part, word WITH unaccent, simple;
+        END IF;
+    END $$
+    """,
+]
+
+POSTGRES_TABLE_SETUP = [
+    "ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector",
+    "CREATE INDEX IF NOT EXISTS ix_{table}_search_vector ON {table} USING GIN (search_vector)",
+    f"""
+    CREATE OR REPLACE FUNCTION {{table}}_search_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('{TS_CONFIG}', coalesce(NEW.title, '')), 'A') ||
+            setweight(to_tsvector('{TS_CONFIG}', coalesce(NEW.description, '')), 'B');
+        RETURN NEW;
+    END $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS {table}_search_trigger ON {table}",
+    """
+    CREATE TRIGGER {table}_search_trigger
+        BEFORE INSERT OR UPDATE OF title, description ON {table}
+        FOR EACH ROW EXECUTE FUNCTION {table}_search_update()
+    """,
+    # Backfill; the trigger fires on the no-op update
+    "UPDATE {table} SET title = title WHERE search_vector IS NULL",
+]
+
+# unicode61 folds case (final sigma included) and Latin diacritics, but not
+# Greek tonos/dialytika; those are replaced in SQL, so any connection can write
+_GREEK_ACCENTS = ('άέήίόύώϊϋΐΰΆΈΉΊΌΎΏΪΫ', 'αεηιουωιυιυΑΕΗΙΟΥΩΙΥ')
+
+def _strip_accents_sql(expression):
+    for accented, plain in zip(*_GREEK_ACCENTS):
+        expression = f"replace({expression}, '{accented}', '{plain}')"
+    return expression
+
+_FTS_TITLE = _strip_accents_sql('{row}title')
+_FTS_DESCRIPTION = _strip_accents_sql("coalesce({row}description, '')")
+
+SQLITE_TABLE_SETUP = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS {table}_fts
+        USING fts5(title, description, tokenize = 'unicode61 remove_diacritics 2')
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {{table}}_fts_insert AFTER INSERT ON {{table}} BEGIN
+        INSERT INTO {{table}}_fts (rowid, title, description)
+        VALUES (new.id, {_FTS_TITLE.format(row='new.')}, {_FTS_DESCRIPTION.format(row='new.')});
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS {table}_fts_delete AFTER DELETE ON {table} BEGIN
+        DELETE FROM {table}_fts WHERE rowid = old.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {{table}}_fts_update AFTER UPDATE OF title, description ON {{table}} BEGIN
+        DELETE FROM {{table}}_fts WHERE rowid = old.id;
+        INSERT INTO {{table}}_fts (rowid, title, description)
+        VALUES (new.id, {_FTS_TITLE.format(row='new.')}, {_FTS_DESCRIPTION.format(row='new.')});
+    END
+    """,
+    f"""
+    INSERT INTO {{table}}_fts (rowid, title, description)
+    SELECT id, {_FTS_TITLE.format(row='')}, {_FTS_DESCRIPTION.format(row='')} FROM {{table}}
+    WHERE id NOT IN (SELECT rowid FROM {{table}}_fts)
+    """,
+]
+
+def setup_search(conn):
+    """
+    Create full-text indexes and triggers (idempotent); run from migrations.py
+    inside the migration's transaction. Returns False if full-text search
+    could not be set up, leaving nothing half-created behind.
+    """
+    dialect = conn.dialect.name
+    if dialect == 'postgresql':
+        setup, per_table = POSTGRES_SETUP, POSTGRES_TABLE_SETUP
+    elif dialect == 'sqlite':
+        setup, per_table = [], SQLITE_TABLE_SETUP
+    else:
+        setup, per_table = [], []
+    statements = setup + [statement.format(table=name) for name in SEARCH_TABLES for statement in per_table]
+
+    # A failed statement aborts the whole PostgreSQL transaction; the savepoint
+    # undoes just this setup. (SQLite's first statement is the one that fails.)
+    savepoint = conn.begin_nested() if dialect == 'postgresql' else None
+    try:
+        for statement in statements:
+            conn.execute(text(statement))
+        if savepoint is not None:
+            savepoint.commit()
+        _available[dialect] = bool(statements)
+        if statements:
+            print("✓ Full-text search ready")
+    except Exception as e:
+        # e.g. SQLite built without FTS5, or no permission to create the unaccent extension
+        if savepoint is not None:
+            savepoint.rollback()
+        _available[dialect] = False
+        print(f"⚠ Full-text search unavailable, falling back to LIKE: {e}")
+
+    return _available[dialect]
+
+def fts_available():
+    """Whether the full-text index exists for every table in SEARCH_TABLES"""
+    dialect = engine.dialect.name
+    if dialect not in _available:
+        inspector = inspect(engine)
+        if dialect == 'postgresql':
+            _available[dialect] = all(
+                'search_vector' in {c['name'] for c in inspector.get_columns(name)} for name in SEARCH_TABLES
+            )
+        elif dialect == 'sqlite':
+            existing = set(inspector.get_table_names())
+            _available[dialect] = all(f'{name}_fts' in existing for name in SEARCH_TABLES)
+        else:
+            _available[dialect] = False
+    return _available[dialect]
+
+def fts5_query(term):
+    """
+    User input -> FTS5 query: every word as a prefix, all required. Folded
+    the same way as the index (lowercase, no Greek accents)
+    """
+    return ' '.join(f'"{word}"*' for word in _WORD.findall(fold_text(term)))
+
+def apply_search(query, model, term, snippet=True):
+    """
+    Filter a query on model (Event or Deal) to rows matching term
+
+    Adds two columns to each result row: rank (higher is better, None
+    for the LIKE fallback) and snippet (pass it through finish_snippet;
+    always None when snippet=False, which skips building it).
+    Returns (query, rank expression or None).
+    """
+    table_name = model.__tablename__
+    dialect = engine.dialect.name
+
+    if not fts_available():
+        query = query.filter(model.title.contains(term) | model.description.contains(term))
+        return query.add_columns(literal(None).label('rank'), literal(None).label('snippet')), None
+
+    if dialect == 'postgresql':
+        tsquery = func.websearch_to_tsquery(TS_CONFIG, term)
+        vector = literal_column(f'{table_name}.search_vector')
+        rank = func.ts_rank_cd(vector, tsquery)
+        headline = (func.ts_headline(TS_CONFIG, func.coalesce(model.description, model.title),
+                                     tsquery, HEADLINE_OPTIONS) if snippet else literal(None))
+        query = query.filter(vector.op('@@')(tsquery))
+        return query.add_columns(rank.label('rank'), headline.label('snippet')), rank
+
+    match = fts5_query(term)
+    if not match:
+        return query.filter(false()).add_columns(literal(None).label('rank'), literal(None).label('snippet')), None
+
+    fts = table(f'{table_name}_fts', column('rowid'))
+    # bm25() is lower-is-better; negate so rank means the same on both databases
+    rank = literal_column(f'-bm25({table_name}_fts, 10.0, 1.0)')
+    # The FTS table holds folded text, so the snippet is cut from the original (see finish_snippet)
+    source_text = func.coalesce(model.description, model.title) if snippet else literal(None)
+    query = (query.join(fts, fts.c.rowid == model.id)
+             .filter(text(f'{table_name}_fts MATCH :fts_match').bindparams(fts_match=match)))
+    return query.add_columns(rank.label('rank'), source_text.label('snippet')), rank
+
+def finish_snippet(value, term, width=160):
+    """
+    Highlighted excerpt for a search result
+
+    PostgreSQL already returns ts_headline output; on SQLite the raw text
+    comes back and the matched words are marked here, accent-insensitively.
+    """
+    if not value or engine.dialect.name != 'sqlite' or not fts_available():
+        return value
+
+    words = _WORD.findall(fold_text(term))
+    folded = fold_text(value)
+    if not words or len(folded) != len(value):
+        return value[:width]
+
+    pattern = re.compile(r'(?<!\w)(?:' + '|'.join(re.escape(w) for w in words) + r')\w*')
+    first = pattern.search(folded)
+    start = max(0, first.start() - width // 3) if first else 0
+    end = min(len(value), start + width)
+
+    parts = []
+    position = start
+    for found in pattern.finditer(folded, start, end):
+        parts.append(value[position:found.start()])
+        parts.append(f'<mark>{value[found.start():found.end()]}</mark>')
+        position = found.end()
+    parts.append(value[position:end])
+
+    return ('…' if start > 0 else '') + ''.join(parts) + ('…' if end < len(value) else '')
@@ -0,0 +1,141 @@
+"""
+Conditional, range-capable responses for files on disk
+Used for the combined events export: the bytes are streamed as written
+by DataTransformer (including its precompressed .gz/.br siblings), never
+parsed or re-encoded
+"""
+import os
+import re
+from email.utils import formatdate, parsedate_to_datetime
+
+from fastapi import HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+
+from response_cache import etag_matches
+
+CHUNK_SIZE = 64 * 1024
+
+# Content-Encoding -> file suffix, in order of preference
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+_RANGE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+def accepted_encodings(accept_encoding):
+    """Content codings the client accepts (q > 0)"""
+    accepted = set()
+    for item in (accept_encoding or '').split(','):
+        name, _, params = item.strip().partition(';')
+        name = name.strip().lower()
+        q = 1.0
+        match = re.search(r'q=([\d.]+)', params)
+        if match:
+            try:
+                q = float(match.group(1))
+            except ValueError:
+                q = 0.0
+        if name and q > 0:
+            accepted.add(name)
+    if '*' in accepted:
+        accepted.update(name for name, _ in ENCODINGS)
+    return accepted
+
+def parse_range(header, size):
+    """
+    (start, end) inclusive for a single "bytes=" range, None to send the
+    whole file (no/multi/unparseable range), or raises 416 if unsatisfiable
+    """
+    match = _RANGE.match((header or '').strip())
+    if not match or match.group(1) == match.group(2) == '':
+        return None
+
+    first, last = match.groups()
+    if first == '':
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            raise HTTPException(status_code=416, headers={'Content-Range': f'bytes */{size}'})
+        return max(0, size - length), size - 1
+
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or end < start:
+        raise HTTPException(status_code=416, headers={'Content-Range': f'bytes */{size}'})
+    return start, end
+
+def _read(f, start, length):
+    try:
+        f.seek(start)
+        while length > 0:
+            chunk = f.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+    finally:
+        f.close()
+
+def _not_modified_since(request, mtime):
+    value = request.headers.get('if-modified-since')
+    if not value or request.headers.get('if-none-match'):
+        return False
+    try:
+        return int(mtime) <= parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return False
+
+def serve_file(request: Request, path: str, media_type: str):
+    """
+    Stream a file, picking a precompressed sibling (path.br / path.gz)
+    when the client accepts it. Handles If-None-Match, If-Modified-Since,
+    Range and If-Range.
+    """
+    accepted = accepted_encodings(request.headers.get('accept-encoding'))
+    candidates = [(encoding, path + suffix) for encoding, suffix in ENCODINGS if encoding in accepted]
+    candidates.append((None, path))
+
+    f = None
+    for encoding, candidate in candidates:
+        try:
+            f = open(candidate, 'rb')
+            break
+        except FileNotFoundError:
+            continue
+    if f is None:
+        raise HTTPException(status_code=404, detail="File not found")
+
+    try:
+        # Stat the open file, so the validators describe exactly the bytes we send
+        stat = os.fstat(f.fileno())
+        size = stat.st_size
+        etag = f'"{stat.st_mtime_ns:x}-{size:x}{"-" + encoding if encoding else ""}"'
+        headers = {
+            'ETag': etag,
+            'Last-Modified': formatdate(stat.st_mtime, usegmt=True),
+            'Cache-Control': 'no-cache',
+            'Accept-Ranges': 'bytes',
+            'Vary': 'Accept-Encoding',
+        }
+        if encoding:
+            headers['Content-Encoding'] = encoding
+
+        if etag_matches(request.headers.get('if-none-match'), etag) or _not_modified_since(request, stat.st_mtime):
+            f.close()
+            return Response(status_code=304, headers=headers)
+
+        byte_range = None
+        if_range = request.headers.get('if-range')
+        if if_range is None or if_range.strip() in (etag, headers['Last-Modified']):
+            byte_range = parse_range(request.headers.get('range'), size)
+    except BaseException:
+        f.close()
+        raise
+
+    if byte_range is None:
+        headers['Content-Length'] = str(size)
+        return StreamingResponse(_read(f, 0, size), media_type=media_type, headers=headers)
+
+    start, end = byte_range
+    headers['Content-Range'] = f'bytes {start}-{end}/{size}'
+    headers['Content-Length'] = str(end - start + 1)
+    return StreamingResponse(_read(f, start, end - start + 1), status_code=206,
+                             media_type=media_type, headers=headers)
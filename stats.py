@@ -0,0 +1,103 @@
+"""
+Event/deal statistics for /stats
+Counts are computed in one grouped query when a scrape run finishes, stored
+in the stats_snapshot table, and served from memory until the snapshot's
+generation changes. The generation doubles as the data version used by the
+API response cache.
+"""
+import threading
+import time
+
+from sqlalchemy import String, func, literal, select, union_all
+from sqlalchemy.exc import IntegrityError
+
+import config
+from database import Deal, Event, StatsSnapshot
+
+# The single stats_snapshot row
+SNAPSHOT_ID = 1
+
+_lock = threading.Lock()
+_cache = {'generation': None, 'data': None, 'checked_at': 0.0}
+
+def compute_stats(db):
+    """All counts in a single round trip (one UNION ALL of GROUP BY aggregates)"""
+    query = union_all(
+        select(literal('source'), Event.source, func.count()).group_by(Event.source),
+        select(literal('category'), Event.category, func.count()).group_by(Event.category),
+        select(literal('deals'), literal(None, String), func.count()).select_from(Deal),
+    )
+
+    events_by_source = {}
+    events_by_category = {}
+    total_deals = 0
+    for kind, key, count in db.execute(query):
+        if kind == 'source':
+            events_by_source[key] = count
+        elif kind == 'category':
+            if key:
+                events_by_category[key] = count
+        else:
+            total_deals = count
+
+    return {
+        "total_events": sum(events_by_source.values()),
+        "total_deals": total_deals,
+        "events_by_source": events_by_source,
+        "events_by_category": events_by_category
+    }
+
+def _remember(generation, data):
+    with _lock:
+        _cache.update(generation=generation, data=data, checked_at=time.monotonic())
+
+def refresh_stats(db):
+    """Recompute the snapshot (call after a scrape run commits); returns it"""
+    data = compute_stats(db)
+    snapshot = db.get(StatsSnapshot, SNAPSHOT_ID)
+    if snapshot is None:
+        snapshot = StatsSnapshot(id=SNAPSHOT_ID, generation=1, data=data)
+        db.add(snapshot)
+    else:
+        # In SQL, so concurrent refreshes from two processes both count
+        snapshot.generation = StatsSnapshot.generation + 1
+        snapshot.data = data
+    try:
+        db.commit()
+    except IntegrityError:
+        # Another request created the first snapshot at the same time
+        db.rollback()
+        snapshot = db.get(StatsSnapshot, SNAPSHOT_ID)
+        data = snapshot.data
+
+    _remember(snapshot.generation, data)
+    return data
+
+def current_generation(db):
+    """
+    Generation of the data in the database, bumped by every refresh_stats()
+
+    Kept in memory; the stored generation is re-read at most every
+    STATS_RECHECK_SECONDS so runs in other processes show up too.
+    """
+    with _lock:
+        fresh = time.monotonic() - _cache['checked_at'] < config.STATS_RECHECK_SECONDS
+        if _cache['generation'] is not None and fresh:
+            return _cache['generation']
+
+    generation = db.query(StatsSnapshot.generation).filter(StatsSnapshot.id == SNAPSHOT_ID).scalar()
+    if generation is None:
+        # Nothing scraped since the snapshot table was added
+        refresh_stats(db)
+    elif generation == _cache['generation']:
+        with _lock:
+            _cache['checked_at'] = time.monotonic()
+    else:
+        snapshot = db.get(StatsSnapshot, SNAPSHOT_ID)
+        _remember(snapshot.generation, snapshot.data)
+    return _cache['generation']
+
+def get_stats(db):
+    """Current stats, from memory"""
+    current_generation(db)
+    return _cache['data']
@@ -20,7 +20,16 @@ def test_imports():
         'culture_final_scraper',
         'visitgreece_detailed_scraper',
         'pigolampides_scraper',
-        'more_events_scraper_optimized'
+        'more_events_scraper_optimized',
+        'url_index',
+        'dedupe',
+        'date_parser',
+        'search',
+        'pagination',
+        'migrations',
+        'stats',
+        'response_cache',
+        'static_file'
     ]
     
     failed = []
@@ -104,6 +113,12 @@ def test_transformer():
         
         transformed = transformer.transform_event(sample_event, 'test_source')
         
+        # Keyword matching ignores case and Greek accents
+        folded = transformer.transform_event({'title': 'ΘΕΑΤΡΟ ΣΤΟ ΗΡΑΚΛΕΙΟ', 'location': 'Heraklion'}, 'test_source')
+        if folded.get('category') != 'Theater' or folded.get('region') != 'Κρήτη':
+            print(f"  ✗ Classification failed: {folded.get('category')} / {folded.get('region')}")
+            return False
+        
         if transformed and transformed.get('title') == 'Test Event':
             print("  ✓ Data transformer working")
             print(f"  ✓ Detected region: {transformed.get('region')}")
@@ -117,6 +132,172 @@ def test_transformer():
         print(f"  ✗ Transformer error: {e}")
         return False
 
+def test_url_index():
+    """Test URL canonicalization and the canonical URL index"""
+    print("\n" + "=" * 60)
+    print("TESTING URL INDEX")
+    print("=" * 60)
+    
+    try:
+        from url_index import canonicalize_url, UrlIndex
+        
+        variants = [
+            'https://www.more.com/gr-en/tickets/music/some-event/',
+            'https://more.com/en/tickets/music/some-event',
+            'https://www.more.com/gr-en/tickets/music/some-event/?utm_source=fb#info',
+        ]
+        canonical = {canonicalize_url(url) for url in variants}
+        
+        if len(canonical) != 1:
+            print(f"  ✗ Variants not merged: {canonical}")
+            return False
+        print(f"  ✓ Canonical URL: {canonical.pop()}")
+        
+        index = UrlIndex(variants[:1])
+        if variants[1] in index and 'https://www.more.com/gr-en/tickets/other/' not in index:
+            print("  ✓ URL index membership working")
+            return True
+        
+        print("  ✗ URL index membership failed")
+        return False
+        
+    except Exception as e:
+        print(f"  ✗ URL index error: {e}")
+        return False
+
+def test_dedupe():
+    """Test cross-source duplicate merging"""
+    print("\n" + "=" * 60)
+    print("TESTING DEDUPE")
+    print("=" * 60)
+    
+    try:
+        from data_transformer import StandardizedEvent
+        from dedupe import dedupe_events
+        
+        events = [
+            StandardizedEvent('Έκθεση: Ο κόσμος του Πικάσο', date='2026-02-01',
+                              url='https://a.gr/1', source='Culture.gov.gr'),
+            StandardizedEvent('Εκθεση - Ο Κοσμος του Πικασο', date='2026-02-01',
+                              url='https://b.gr/1', source='More.com', image='https://b.gr/1.jpg'),
+            StandardizedEvent('Εκθεση - Ο Κοσμος του Πικασο', date='2026-03-01',
+                              url='https://b.gr/2', source='More.com'),
+        ]
+        merged = dedupe_events(events)
+        
+        if len(merged) != 2 or merged[0].get('sourceUrls') != ['https://a.gr/1', 'https://b.gr/1']:
+            print(f"  ✗ Unexpected merge result: {[e.get('sourceUrls') for e in merged]}")
+            return False
+        print("  ✓ Duplicates merged with all source URLs")
+        print(f"  ✓ Missing image filled in: {merged[0].get('image')}")
+        
+        # A ~ B and B ~ C must not pull A and C (same source) into one cluster
+        chain = [
+            StandardizedEvent('Συναυλία Φοίβος Δεληβοριάς', date='2026-04-01', url='https://a.gr/2', source='A'),
+            StandardizedEvent('Συναυλία Φοίβου Δεληβοριά', date='2026-04-01', url='https://b.gr/3', source='B'),
+            StandardizedEvent('Συναυλία Φοίβος Δεληβοριάς', date='2026-04-01', url='https://a.gr/3', source='A'),
+        ]
+        if len(dedupe_events(chain, threshold=0.5)) != 2:
+            print("  ✗ Two events from one source were merged")
+            return False
+        print("  ✓ Events from the same source are never merged")
+        return True
+        
+    except Exception as e:
+        print(f"  ✗ Dedupe error: {e}")
+        return False
+
+def test_date_parser():
+    """Test English/Greek date and range extraction"""
+    print("\n" + "=" * 60)
+    print("TESTING DATE PARSER")
+    print("=" * 60)
+    
+    try:
+        from datetime import date
+        from date_parser import find_date
+        
+        cases = {
+            '17 Jan - 15 Feb 2026': (date(2026, 1, 17), date(2026, 2, 15)),
+            'Σάββατο 17 Ιανουαρίου 2026, 21:00': (date(2026, 1, 17), None),
+            '25-26/10/2025': (date(2025, 10, 25), date(2025, 10, 26)),
+            'January 17, 2026': (date(2026, 1, 17), None),
+        }
+        for text, expected in cases.items():
+            parsed = find_date(text)
+            if not parsed or (parsed.start, parsed.end) != expected:
+                print(f"  ✗ {text!r} parsed as {parsed}")
+                return False
+            print(f"  ✓ {text!r} -> {parsed.start} .. {parsed.end}")
+        return True
+        
+    except Exception as e:
+        print(f"  ✗ Date parser error: {e}")
+        return False
+
+def test_pagination():
+    """Test that keyset cursors round-trip and reject other sort orders"""
+    print("\n" + "=" * 60)
+    print("TESTING PAGINATION CURSORS")
+    print("=" * 60)
+    
+    try:
+        from datetime import datetime
+        from types import SimpleNamespace
+        from pagination import InvalidCursor, decode_cursor, encode_cursor
+        
+        row = SimpleNamespace(id=42, created_at=datetime(2026, 1, 17, 21, 0, 5))
+        token = encode_cursor('newest', row)
+        if decode_cursor('newest', token) != [row.created_at, 42]:
+            print(f"  ✗ Cursor did not round-trip: {token}")
+            return False
+        print(f"  ✓ Cursor round-trips: {token}")
+        
+        try:
+            decode_cursor('start_date', token)
+            print("  ✗ Cursor accepted for a different sort")
+            return False
+        except InvalidCursor:
+            print("  ✓ Cursor rejected for a different sort")
+        
+        # Undated events sort last, so their cursors carry a null start_date
+        undated = SimpleNamespace(id=7, start_date=None)
+        if decode_cursor('-start_date', encode_cursor('-start_date', undated)) != [None, 7]:
+            print("  ✗ Cursor for an undated event did not round-trip")
+            return False
+        print("  ✓ Cursor for an undated event round-trips")
+        return True
+        
+    except Exception as e:
+        print(f"  ✗ Pagination error: {e}")
+        return False
+
+def test_response_cache():
+    """Test generation invalidation and ETag matching of the response cache"""
+    print("\n" + "=" * 60)
+    print("TESTING RESPONSE CACHE")
+    print("=" * 60)
+    
+    try:
+        from response_cache import ResponseCache, etag_matches
+        
+        cache = ResponseCache(max_entries=2, ttl=60)
+        entry = cache.put(('events', 50), 1, b'[]')
+        if cache.get(('events', 50), 1) != entry or cache.get(('events', 50), 2) is not None:
+            print("  ✗ Entry not invalidated by a new generation")
+            return False
+        print("  ✓ New generation invalidates cached responses")
+        
+        if not etag_matches(f'W/{entry.etag}, "other"', entry.etag) or etag_matches('"other"', entry.etag):
+            print(f"  ✗ If-None-Match comparison wrong for {entry.etag}")
+            return False
+        print("  ✓ If-None-Match matches the ETag")
+        return True
+        
+    except Exception as e:
+        print(f"  ✗ Response cache error: {e}")
+        return False
+
 def main():
     """Run all tests"""
     print("\n" + "=" * 60)
@@ -127,7 +308,12 @@ def main():
         'Imports': test_imports(),
         'Database': test_database(),
         'API': test_api_creation(),
-        'Transformer': test_transformer()
+        'Transformer': test_transformer(),
+        'URL index': test_url_index(),
+        'Dedupe': test_dedupe(),
+        'Date parser': test_date_parser(),
+        'Pagination': test_pagination(),
+        'Response cache': test_response_cache()
     }
     
     print("\n" + "=" * 60)
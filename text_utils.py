@@ -0,0 +1,10 @@
+"""
+Text normalization shared by classification, dedupe and date parsing
+"""
+
+# Lowercase Greek with tonos/dialytika -> plain letter, final sigma -> sigma
+_ACCENT_FOLD = str.maketrans('άέήίόύώϊϋΐΰς', 'αεηιουωιυιυσ')
+
+def fold_text(text: str) -> str:
+    """Lowercase and strip Greek accents so 'Θέατρο' matches 'θεατρο'"""
+    return text.lower().translate(_ACCENT_FOLD)
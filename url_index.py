@@ -0,0 +1,187 @@
+"""
+URL canonicalization and a compact index of canonical URLs
+Shared by link discovery (frontier dedupe) and the database writer
+"""
+import heapq
+import threading
+from array import array
+from bisect import bisect_left
+from functools import lru_cache
+from hashlib import blake2b
+from typing import Iterable, Optional
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# Query parameters that never change page content
+TRACKING_PARAMS = {
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'mc_cid', 'mc_eid', 'igshid',
+    'ref', 'ref_src', 'replytocom', '_ga', '_gl'
+}
+
+# Per-site rules, keyed by host (without "www.")
+#   host: canonical host name
+#   drop_query: drop the whole query string (event pages don't use one)
+#   trailing_slash: True = always end paths with "/", False = never, None = leave as is
+#   path_aliases: path prefixes rewritten to the canonical language variant
+SITE_RULES = {
+    'more.com': {
+        'host': 'www.more.com',
+        'drop_query': True,
+        'trailing_slash': True,
+        'path_aliases': {'/en/': '/gr-en/'},
+    },
+    'allofgreeceone.culture.gov.gr': {
+        'host': 'allofgreeceone.culture.gov.gr',
+        'drop_query': True,
+        'trailing_slash': False,
+        'path_aliases': {'/on-demand/': '/en/on-demand/'},
+    },
+    'pigolampides.gr': {
+        'host': 'pigolampides.gr',
+        'drop_query': True,
+        'trailing_slash': True,
+        'path_aliases': {},
+    },
+    'visitgreece.gr': {
+        'host': 'www.visitgreece.gr',
+        'drop_query': False,
+        'trailing_slash': None,
+        'path_aliases': {},
+    },
+}
+
+DEFAULT_RULES = {
+    'host': None,
+    'drop_query': False,
+    'trailing_slash': None,
+    'path_aliases': {},
+}
+
+def site_rules(host: str) -> dict:
+    """Rules for a host, falling back to the generic ones"""
+    host = host.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    return SITE_RULES.get(host, DEFAULT_RULES)
+
+# Listing pages repeat the same links within a run; a small cache covers that
+@lru_cache(maxsize=4096)
+def canonicalize_url(url: Optional[str]) -> Optional[str]:
+    """
+    Canonical form of a URL
+
+    Lowercases scheme and host, drops fragments, default ports and
+    tracking parameters, sorts the remaining query and applies the
+    site's host, language-prefix and trailing-slash rules. The result is
+    still a fetchable URL.
+    """
+    if not url:
+        return url
+
+    url = url.strip()
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return url
+
+    if parts.scheme not in ('http', 'https') or not parts.hostname:
+        return url
+
+    host = parts.hostname.lower()
+    rules = site_rules(host)
+    host = rules['host'] or host
+
+    port = parts.port
+    if port and not ((parts.scheme == 'http' and port == 80) or (parts.scheme == 'https' and port == 443)):
+        host = f"{host}:{port}"
+
+    path = parts.path or '/'
+    for alias, canonical in rules['path_aliases'].items():
+        if path.startswith(alias):
+            path = canonical + path[len(alias):]
+            break
+
+    # Collapse duplicate slashes
+    while '//' in path:
+        path = path.replace('//', '/')
+
+    if path != '/':
+        if rules['trailing_slash'] is True and not path.endswith('/'):
+            last_segment = path.rsplit('/', 1)[-1]
+            # Leave file-like paths (image.jpg, feed.xml) alone
+            if '.' not in last_segment:
+                path += '/'
+        elif rules['trailing_slash'] is False:
+            path = path.rstrip('/')
+
+    query = ''
+    if parts.query and not rules['drop_query']:
+        params = [
+            (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+            if key.lower() not in TRACKING_PARAMS and not key.lower().startswith('utm_')
+        ]
+        query = urlencode(sorted(params))
+
+    return urlunsplit(('https' if parts.scheme == 'https' else 'http', host, path, query, ''))
+
+class UrlIndex:
+    """
+    Exact-membership index of canonical URLs
+
+    Stores a 64-bit BLAKE2b digest per URL in a sorted array('Q'), 8 bytes
+    each, so 300k URLs take about 2.4 MB. New digests go to a small set that
+    is merged into the array once it grows past an eighth of it. Collisions
+    are negligible at this scale, and unlike a Bloom filter a miss is never
+    reported as a hit, so new events are never skipped.
+    """
+
+    __slots__ = ('_sorted', '_pending', '_lock')
+
+    # Pending digests kept in the set before a merge, at least
+    MIN_PENDING = 4096
+
+    def __init__(self, urls: Iterable[str] = ()):
+        self._sorted = array('Q')
+        self._pending = set()
+        self._lock = threading.Lock()
+        self.update(urls)
+
+    @staticmethod
+    def _digest(url: str) -> int:
+        canonical = canonicalize_url(url)
+        return int.from_bytes(blake2b(canonical.encode('utf-8'), digest_size=8).digest(), 'big')
+
+    def _in_sorted(self, digest: int) -> bool:
+        position = bisect_left(self._sorted, digest)
+        return position < len(self._sorted) and self._sorted[position] == digest
+
+    def _merge(self):
+        self._sorted = array('Q', heapq.merge(self._sorted, sorted(self._pending)))
+        self._pending = set()
+
+    def add(self, url: Optional[str]):
+        if not url:
+            return
+        digest = self._digest(url)
+        with self._lock:
+            if digest in self._pending or self._in_sorted(digest):
+                return
+            self._pending.add(digest)
+            if len(self._pending) > max(self.MIN_PENDING, len(self._sorted) // 8):
+                self._merge()
+
+    def update(self, urls: Iterable[str]):
+        for url in urls:
+            self.add(url)
+
+    def __contains__(self, url) -> bool:
+        if not url:
+            return False
+        digest = self._digest(url)
+        with self._lock:
+            return digest in self._pending or self._in_sorted(digest)
+
+    def __len__(self) -> int:
+        return len(self._sorted) + len(self._pending)
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
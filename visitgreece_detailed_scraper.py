@@ -13,8 +13,8 @@ import time
 import config
 
 class VisitGreeceDetailedScraper(BaseScraper):
-    def __init__(self, headless=False):
-        super().__init__(headless)
+    def __init__(self, headless=False, **kwargs):
+        super().__init__(headless, **kwargs)
         self.base_url = "https://www.visitgreece.gr/events"
     
     def scrape_events_with_details(self, max_events=20):
@@ -28,42 +28,19 @@ class VisitGreeceDetailedScraper(BaseScraper):
         all_events = []
         
         try:
-            print(f"Navigating to {self.base_url}...")
-            self.driver.get(self.base_url)
-            time.sleep(4)
-            
-            # Scroll to load content
-            print("Loading events...")
-            self.scroll_to_bottom(pause_time=2)
-            
-            # Get all event links
-            event_links = self.get_event_links()
-            
-            if not event_links:
+            # Visit each event page for details
+            all_events = self.run_pipeline(
+                self.iter_event_links(),
+                'scrape_event_detail_page',
+                max_events,
+                accept=bool,
+                delay=1  # Be polite to the server
+            )
+            
+            if not self.discovered_count and not self.cancel_token.cancelled:
                 print("No event links found. Trying alternative approach...")
                 return self.scrape_events_simple()
             
-            print(f"Found {len(event_links)} event links")
-            
-            # Limit to max_events
-            event_links = event_links[:max_events]
-            
-            # Visit each event page for details
-            for idx, link in enumerate(event_links):
-                try:
-                    print(f"\nScraping event {idx + 1}/{len(event_links)}: {link}")
-                    event_details = self.scrape_event_detail_page(link)
-                    
-                    if event_details:
-                        all_events.append(event_details)
-                        print(f"✓ Scraped: {event_details.get('title', 'N/A')[:60]}")
-                    
-                    time.sleep(1)  # Be polite to the server
-                    
-                except Exception as e:
-                    print(f"✗ Error scraping event {idx + 1}: {e}")
-                    continue
-            
             print(f"\n{'='*60}")
             print(f"Total events scraped: {len(all_events)}")
             
@@ -77,6 +54,21 @@ class VisitGreeceDetailedScraper(BaseScraper):
         
         return all_events
     
+    def iter_event_links(self):
+        """Load the events page and yield its event links"""
+        print(f"Navigating to {self.base_url}...")
+        self.driver.get(self.base_url)
+        time.sleep(4)
+        
+        # Scroll to load content
+        print("Loading events...")
+        self.scroll_to_bottom(pause_time=2)
+        
+        # Get all event links
+        event_links = self.get_event_links()
+        print(f"Found {len(event_links)} event links")
+        yield from event_links
+    
     def get_event_links(self):
         """Extract all event links from the main page"""
         links = []
@@ -99,7 +91,7 @@ class VisitGreeceDetailedScraper(BaseScraper):
     def scrape_event_detail_page(self, url):
         """Scrape detailed information from an individual event page"""
         try:
-            self.driver.get(url)
+            self.get_page(url)
             time.sleep(2)
             
             event = {'url': url}
@@ -154,16 +146,7 @@ class VisitGreeceDetailedScraper(BaseScraper):
     
     def find_text_by_selectors(self, selectors):
         """Try multiple selectors to find text"""
-        for selector in selectors:
-            try:
-                elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                for element in elements:
-                    text = element.text.strip()
-                    if text:
-                        return text
-            except:
-                continue
-        return None
+        return self.find_first_text(selectors, min_length=1)
     
     def scrape_events_simple(self):
         """Fallback: Simple scraping without clicking into details"""